@@ -0,0 +1,93 @@
+"""
+Fikstür ayrıştırıcıları için mikro kıyaslama.
+
+Önbellekteki (html_cache/) sayfaları hem BeautifulSoup referans ayrıştırıcısıyla
+hem de lxml hızlı yoluyla işler, çıktıların birebir aynı olduğunu doğrular ve
+sayfa başına süreleri yazdırır. Önbellek boşsa yapay sayfalar üretilir.
+
+    python bench_parser.py --repeat 20
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+
+from fixture_parser import parse_fixture_rows, parse_fixture_rows_soup
+from snapshot_cache import SnapshotCache
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def synthetic_pages(count=50, matches_per_week=10, seed=42):
+    """Gerçek tabloya benzeyen (başlık, MS dışı ve oynanmamış satırlar içeren) sayfalar üret."""
+    rng = random.Random(seed)
+    pages = []
+    for week in range(1, count + 1):
+        rows = ['<tr><td colspan="20"><b>Fikstür</b></td></tr>']
+        for match in range(matches_per_week):
+            kod = "MS" if match % 7 else "ERT"
+            score = f"{rng.randint(0, 4)} - {rng.randint(0, 4)}" if match % 5 else "-"
+            odds = "".join(f"<td>{rng.uniform(1.05, 9.0):.2f}</td>" for _ in range(8))
+            rows.append(
+                f"<tr><td>{(week % 28) + 1:02d}/09</td><td>{kod}</td><td>&nbsp;</td>"
+                f"<td><a href='#'>Takım {match}A</a></td><td></td><td><b>{score}</b></td><td></td>"
+                f"<td><a href='#'>Takım {match}B</a></td><td>0 – 0</td><td></td><td></td><td></td>{odds}</tr>"
+            )
+        html = f"<table class='list-table'>{''.join(rows)}</table>"
+        pages.append(("Yapay Lig", "2025/2026", f"{week} (1.09.2025 - 28.09.2025)", html))
+    return pages
+
+
+def cached_pages(cache_dir):
+    cache = SnapshotCache(cache_dir)
+    return [
+        (league, season, week, cache.read_object(digest))
+        for league, season, week, digest in cache.entries()
+    ]
+
+
+def time_parser(parser, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for league, season, week, html in pages:
+            parser(html, season, league, week)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BeautifulSoup ve lxml fikstür ayrıştırıcılarını karşılaştır.")
+    parser.add_argument("--cache-dir", default=str(SCRIPT_DIR / "html_cache"), help="Önbellek klasörü (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=10, help="Tekrar sayısı; en iyi süre raporlanır (default: %(default)s)")
+    parser.add_argument("--synthetic", action="store_true", help="Önbellek yerine yapay sayfalar kullan")
+    args = parser.parse_args()
+
+    pages = [] if args.synthetic else cached_pages(args.cache_dir)
+    source = args.cache_dir
+    if not pages:
+        pages = synthetic_pages()
+        source = "yapay sayfalar"
+
+    mismatches = 0
+    total_rows = 0
+    for league, season, week, html in pages:
+        expected = parse_fixture_rows_soup(html, season, league, week)
+        actual = parse_fixture_rows(html, season, league, week)
+        total_rows += len(expected)
+        if expected != actual:
+            mismatches += 1
+            print(f"! Farklı çıktı: {league} {season} {week}")
+
+    soup_time = time_parser(parse_fixture_rows_soup, pages, args.repeat)
+    fast_time = time_parser(parse_fixture_rows, pages, args.repeat)
+
+    print(f"Kaynak: {source} ({len(pages)} sayfa, {total_rows} satır)")
+    print(f"BeautifulSoup: {soup_time * 1000 / len(pages):.3f} ms/sayfa")
+    print(f"lxml:          {fast_time * 1000 / len(pages):.3f} ms/sayfa")
+    print(f"Hızlanma:      {soup_time / fast_time:.1f}x")
+    print("✓ Çıktılar birebir aynı" if not mismatches else f"✗ {mismatches} sayfada fark var")
+
+
+if __name__ == "__main__":
+    main()
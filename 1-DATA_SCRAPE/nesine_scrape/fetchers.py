@@ -0,0 +1,300 @@
+"""
+Fikstür sayfalarını getiren arka uçlar.
+
+İki arka uç aynı arayüzü sunar:
+    open_league(url)          -> sezon adları (en yeni sezon ilk sırada)
+    select_season(season)     -> hafta adları ya da sezon bulunamazsa None
+    fetch_week(week_name)     -> "#dvFixtureInner > table" elemanının HTML'i
+                                 (tablo o haftaya ait değilse StaleWeekError)
+    is_alive() / close()
+
+SeleniumFetcher sayfayı gerçek bir Firefox ile tıklayarak gezer.
+HttpFetcher ise #dvFixtureInner'ı dolduran uç noktayı doğrudan, bağlantıları
+açık tutan tek bir requests oturumuyla çağırır; tarayıcı çalıştırmaz.
+"""
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from urllib3.util.retry import Retry
+
+from normalization import DATE_FORMAT, extract_year_from_week, week_date_range
+from readiness import WaitStats, fixture_changed, options_loaded, page_fingerprint
+
+START_URL = "https://arsiv.mackolik.com/Standings/Default.aspx"
+
+# Fikstür sekmesindeki #dvFixtureInner bu uç noktadan doldurulur.
+# {week} boş bırakılırsa sayfa varsayılan haftayla birlikte #cboWeek listesini döndürür.
+FIXTURE_ENDPOINT = "/AjaxHandlers/FixtureHandler.aspx?command=getMatches&id={season_id}&week={week}"
+READY_POLL_INTERVAL = 0.1
+HTTP_TIMEOUT = 15
+HTTP_POOL_SIZE = 4
+HTTP_RETRIES = 3
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+FIXTURE_TABLE_SELECTOR = "#dvFixtureInner > table:nth-child(1)"
+_SELECTED_WEEK_SCRIPT = (
+    "var el = document.querySelector('#cboWeek');"
+    "return el && el.selectedIndex >= 0 ? el.options[el.selectedIndex].text.trim() : null;"
+)
+
+
+class StaleWeekError(Exception):
+    """Ekrandaki fikstür tablosu istenen haftaya ait değil (AJAX yenilemesi gelmedi)."""
+
+
+def rebase_url(url, base_url):
+    """URL'nin şema ve sunucu kısmını base_url ile değiştir (yerel test sunucusu için)."""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+def extract_fixture_table(html):
+    """Yanıttan fikstür tablosunu ayıkla; Selenium'daki outerHTML ile aynı biçimi döndür."""
+    soup = BeautifulSoup(html, "html.parser")
+    inner = soup.find(id="dvFixtureInner")
+    table = inner.find("table") if inner is not None else soup.find("table")
+    return str(table) if table is not None else ""
+
+
+def table_fits_week(html, week_name):
+    """
+    Tablodaki maç tarihleri ('GG/AA') hafta etiketindeki aralığın içinde mi?
+    Etikette aralık ya da tabloda tarih yoksa içerikten karar verilemez; True döner.
+    """
+    date_range = week_date_range(week_name)
+    if date_range is None:
+        return True
+    start, end = date_range
+    for row in BeautifulSoup(html, "html.parser").find_all("tr"):
+        cell = row.find("td")
+        dated = extract_year_from_week(week_name, cell.get_text(strip=True) if cell else "")
+        try:
+            date = datetime.strptime(dated, DATE_FORMAT)
+        except (TypeError, ValueError):
+            continue
+        if not start <= date <= end:
+            return False
+    return True
+
+
+class SeleniumFetcher:
+    """Firefox üzerinden #cboSeason/#cboWeek seçimlerini tıklayarak sayfa getirir."""
+
+    def __init__(self, headless=True, wait_time=10, addon_path=None):
+        options = Options()
+        options.headless = headless
+        self.driver = webdriver.Firefox(options=options)
+        if addon_path:
+            self.driver.install_addon(addon_path, temporary=True)
+        self.driver.get(START_URL)
+        self.wait = WebDriverWait(self.driver, wait_time, poll_frequency=READY_POLL_INTERVAL)
+        self.wait_stats = WaitStats()
+        self._week_indices = {}
+
+    def open_league(self, url):
+        self.driver.get(url)
+        season_names = self.wait_stats.timed(
+            "sezon listesi", self.wait, options_loaded("#cboSeason"), replaced_sleep=1.5
+        )
+        return [name for name in season_names if name]
+
+    def select_season(self, season_name):
+        season_select = self.driver.find_element(By.CSS_SELECTOR, "#cboSeason")
+        season_options = season_select.find_elements(By.TAG_NAME, "option")
+        target_option = None
+        for option in season_options:
+            if option.text.strip() == season_name:
+                target_option = option
+                break
+
+        if not target_option:
+            return None
+
+        already_selected = target_option.is_selected()
+        target_option.click()
+        if not already_selected:
+            # Sezon değişimi sayfayı yeniden yükler; eski <select> bayatlayana kadar bekle
+            try:
+                self.wait_stats.timed("sezon değişimi", self.wait, EC.staleness_of(season_select), replaced_sleep=1.5)
+            except TimeoutException:
+                pass
+
+        self.wait_stats.timed(
+            "sekme listesi",
+            self.wait,
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "#tab-list li.ui-state-default:nth-child(3) a")),
+            replaced_sleep=1.0,
+        )
+
+        navbar = self.driver.find_element(By.CSS_SELECTOR, "#tab-list")
+        fikstur_btn = navbar.find_element(By.CSS_SELECTOR, "li.ui-state-default:nth-child(3) a")
+        fikstur_btn.click()
+
+        week_texts = self.wait_stats.timed("hafta listesi", self.wait, options_loaded("#cboWeek"), replaced_sleep=1.0)
+        self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, FIXTURE_TABLE_SELECTOR)))
+
+        indexed_weeks = [(i, text) for i, text in enumerate(week_texts) if text]
+        self._week_indices = {week_name: i for i, week_name in indexed_weeks}
+        return [week_name for _, week_name in indexed_weeks]
+
+    def fetch_week(self, week_name):
+        option_index = self._week_indices[week_name]
+        previous = page_fingerprint(self.driver, "#dvFixtureInner")
+
+        date_filter = self.driver.find_element(By.CSS_SELECTOR, "#cboWeek")
+        week_options = date_filter.find_elements(By.TAG_NAME, "option")
+        try:
+            already_selected = week_options[option_index].is_selected()
+            week_options[option_index].click()
+        except Exception:
+            date_filter = self.driver.find_element(By.CSS_SELECTOR, "#cboWeek")
+            week_options = date_filter.find_elements(By.TAG_NAME, "option")
+            already_selected = week_options[option_index].is_selected()
+            week_options[option_index].click()
+
+        if already_selected and previous is not None:
+            # Seçili haftaya tıklamak içeriği değiştirmez; tablo zaten hazır
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, FIXTURE_TABLE_SELECTOR)))
+        else:
+            try:
+                self.wait_stats.timed(
+                    "hafta tablosu", self.wait, fixture_changed("#dvFixtureInner", previous), replaced_sleep=1.2
+                )
+            except TimeoutException:
+                # İki hafta aynı içeriği gösteriyorsa değişim hiç gelmez; ama yenileme yalnızca
+                # yavaşsa ekrandaki tablo önceki haftanındır. Tabloyu ancak seçili hafta ve
+                # tablodaki tarihler istenen haftayla uyuşuyorsa kabul et.
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, FIXTURE_TABLE_SELECTOR)))
+                html = self.driver.find_element(By.CSS_SELECTOR, FIXTURE_TABLE_SELECTOR).get_attribute("outerHTML")
+                selected = self.driver.execute_script(_SELECTED_WEEK_SCRIPT)
+                if selected != week_name or not table_fits_week(html, week_name):
+                    raise StaleWeekError(f"{week_name}: fikstür tablosu yenilenmedi (seçili hafta: {selected})")
+                return html
+
+        table = self.driver.find_element(By.CSS_SELECTOR, FIXTURE_TABLE_SELECTOR)
+        return table.get_attribute("outerHTML")
+
+    def is_alive(self):
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class HttpFetcher:
+    """Fikstür uç noktasını tarayıcısız, keep-alive bir HTTP oturumuyla çağırır."""
+
+    def __init__(self, base_url=None, timeout=HTTP_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+        retry = Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._league_url = None
+        self._season_ids = {}
+        self._season_id = None
+        self._week_values = {}
+        self._closed = False
+        self.wait_stats = WaitStats()
+
+    def _get(self, url, label="http isteği", replaced_sleep=0.0):
+        start = time.perf_counter()
+        response = self.session.get(rebase_url(url, self.base_url), timeout=self.timeout)
+        self.wait_stats.record(label, time.perf_counter() - start, replaced_sleep)
+        response.raise_for_status()
+        return response.text
+
+    def _fixture_url(self, week=""):
+        parts = urlsplit(self._league_url)
+        return urlunsplit((parts.scheme, parts.netloc, "", "", "")) + FIXTURE_ENDPOINT.format(
+            season_id=self._season_id,
+            week=week,
+        )
+
+    def open_league(self, url):
+        self._league_url = url
+        soup = BeautifulSoup(self._get(url), "html.parser")
+        select = soup.find("select", id="cboSeason")
+        self._season_ids = {}
+        season_names = []
+        if select is not None:
+            for option in select.find_all("option"):
+                name = option.get_text(strip=True)
+                if name:
+                    self._season_ids[name] = option.get("value", "")
+                    season_names.append(name)
+        return season_names
+
+    def select_season(self, season_name):
+        if season_name not in self._season_ids:
+            return None
+        season_id = self._season_ids[season_name]
+        if not season_id:
+            # Seçenek değeri yoksa lig URL'sindeki sId en yeni sezonu gösterir
+            season_id = parse_qs(urlsplit(self._league_url).query).get("sId", [""])[0]
+        if not season_id:
+            return None
+        self._season_id = season_id
+
+        soup = BeautifulSoup(self._get(self._fixture_url()), "html.parser")
+        select = soup.find("select", id="cboWeek")
+        self._week_values = {}
+        week_names = []
+        if select is not None:
+            for option in select.find_all("option"):
+                name = option.get_text(strip=True)
+                if name:
+                    self._week_values[name] = option.get("value", "")
+                    week_names.append(name)
+        return week_names
+
+    def fetch_week(self, week_name):
+        html = self._get(self._fixture_url(self._week_values[week_name]), label="hafta tablosu", replaced_sleep=1.2)
+        return extract_fixture_table(html)
+
+    def is_alive(self):
+        return not self._closed
+
+    def close(self):
+        self._closed = True
+        self.session.close()
+
+
+def create_fetcher(backend, headless=True, wait_time=10, addon_path=None, base_url=None):
+    if backend == "http":
+        return HttpFetcher(base_url=base_url)
+    if backend == "selenium":
+        return SeleniumFetcher(headless=headless, wait_time=wait_time, addon_path=addon_path)
+    raise ValueError(f"Bilinmeyen arka uç: {backend}")
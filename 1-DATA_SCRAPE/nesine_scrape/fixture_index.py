@@ -0,0 +1,136 @@
+"""
+Birleşik veri seti için hafta dilimlerine bölünmüş, hash anahtarlı indeks.
+
+Eski merge_existing_and_new her çağrıda tüm tabloyu merge(indicator=True),
+sekiz sütunlu drop_duplicates ve tam sort_values'tan geçiriyordu. Burada tablo
+(Season, Lig, Hafta) dilimlerine ayrılmış olarak tutulur:
+
+    dilim anahtarı -> o haftanın satırları (MatchKey'e göre tekil, Tarih'e göre sıralı)
+
+MatchKey doğal anahtarın (Season, Lig, Hafta, Kod, Tarih, EvSahibi, Deplasman,
+Skor) kararlı 64 bitlik özetidir (pd.util.hash_pandas_object); aynı satır her
+çalışmada aynı değeri alır ve tekilleştirme yalnızca dilim içinde bu özetle
+yapılır. Tam sıralama yalnızca ilk yüklemede bir kez yapılır; sonraki upsert'ler
+yalnızca dokundukları dilimleri değiştirir ve tablo, dilim anahtarlarının
+sırasıyla parça parça yeniden birleştirilir.
+"""
+import pandas as pd
+
+SLICE_COLUMNS = ["Season", "Lig", "Hafta"]
+MATCH_KEY_COLUMNS = ["Season", "Lig", "Hafta", "Kod", "Tarih", "EvSahibi", "Deplasman", "Skor"]
+
+
+def match_keys(df):
+    """Doğal anahtarın kararlı uint64 özeti (satır başına bir değer)."""
+    keys = df[MATCH_KEY_COLUMNS].astype(object).where(df[MATCH_KEY_COLUMNS].notna(), "")
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class FixtureIndex:
+    def __init__(self, columns, df=None, week_number=None):
+        self.columns = list(columns)
+        self.week_number = week_number or (lambda week_name: -1)
+        self._frame = pd.DataFrame(columns=self.columns + ["_key"])
+        self._keys = []  # _frame içindeki dilim anahtarları, tablo sırasıyla
+        self._lengths = {}  # dilim anahtarı -> satır sayısı
+        self._pending = {}  # henüz _frame'e işlenmemiş dilimler (None = silinecek)
+        self._weeks = {}  # (Lig, Season) -> o bölümde kayıtlı hafta etiketleri
+        if df is not None and not df.empty:
+            self._build(df)
+
+    def _prepare(self, df):
+        df = df.reindex(columns=self.columns)
+        for column in SLICE_COLUMNS:
+            df[column] = df[column].fillna("").astype(str).str.strip()
+        return df.assign(_key=match_keys(df))
+
+    def _build(self, df):
+        """İlk yükleme: tek seferlik sıralama ve tekilleştirme."""
+        df = self._prepare(df).drop_duplicates(subset="_key", keep="last")
+        self._frame = df.sort_values(SLICE_COLUMNS + ["Tarih"], kind="stable", ignore_index=True)
+        sizes = self._frame.groupby(SLICE_COLUMNS, sort=True).size()
+        self._keys = list(sizes.index)
+        self._lengths = dict(zip(sizes.index, sizes.to_numpy().tolist()))
+        for season, league, week in self._keys:
+            self._weeks.setdefault((league, season), set()).add(week)
+
+    def __len__(self):
+        return len(self.frame())
+
+    @property
+    def empty(self):
+        return not self._keys and not any(part is not None for part in self._pending.values())
+
+    def upsert(self, new_df):
+        """
+        Yeni satırların (Season, Lig, Hafta) dilimlerini tümüyle değiştir.
+        Maliyet yalnızca yeni satır sayısıyla orantılıdır; tablo frame() çağrılana kadar birleştirilmez.
+        """
+        if new_df.empty:
+            return 0
+        if not self._keys and not self._pending:
+            self._build(new_df)
+            return len(new_df)
+        new_df = self._prepare(new_df)
+        for slice_key, part in new_df.groupby(SLICE_COLUMNS, sort=False):
+            part = part.drop_duplicates(subset="_key", keep="last")
+            self._pending[slice_key] = part.sort_values("Tarih", kind="stable")
+            season, league, week = slice_key
+            self._weeks.setdefault((league, season), set()).add(week)
+        return len(new_df)
+
+    def delete(self, season, league, week=None):
+        """Bir haftayı ya da (week verilmezse) bir lig-sezonun tüm haftalarını sil."""
+        weeks = [week] if week is not None else list(self._weeks.get((league, season), ()))
+        for week_name in weeks:
+            self._pending[(season, league, week_name)] = None
+            self._weeks.get((league, season), set()).discard(week_name)
+
+    def last_week(self, league_name, season_name):
+        """Lig-sezon için kayıtlı en son hafta etiketi; yoksa None."""
+        weeks = self._weeks.get((league_name, season_name))
+        if not weeks:
+            return None
+        return max(weeks, key=lambda week_name: (self.week_number(week_name), week_name))
+
+    def frame(self):
+        """
+        (Season, Lig, Hafta, Tarih) sırasındaki birleşik tablo.
+        Bekleyen dilimler araya yerleştirilir; aradaki değişmemiş dilim dizileri
+        tek bir iloc parçası olarak alındığı için satırlar yeniden sıralanmaz.
+        """
+        if self._pending:
+            offsets = {}
+            position = 0
+            for slice_key in self._keys:
+                offsets[slice_key] = position
+                position += self._lengths[slice_key]
+
+            pieces = []
+            run = None  # değişmemiş ardışık dilimlerin [başlangıç, bitiş) aralığı
+            keys, lengths = [], {}
+            for slice_key in sorted(set(self._keys) | set(self._pending)):
+                if slice_key in self._pending:
+                    if run is not None:
+                        pieces.append(self._frame.iloc[run[0]:run[1]])
+                        run = None
+                    part = self._pending[slice_key]
+                    if part is None or part.empty:
+                        continue
+                    pieces.append(part)
+                    length = len(part)
+                else:
+                    start = offsets[slice_key]
+                    length = self._lengths[slice_key]
+                    run = [start, start + length] if run is None else [run[0], start + length]
+                keys.append(slice_key)
+                lengths[slice_key] = length
+            if run is not None:
+                pieces.append(self._frame.iloc[run[0]:run[1]])
+
+            self._frame = (
+                pd.concat(pieces, ignore_index=True) if pieces
+                else pd.DataFrame(columns=self.columns + ["_key"])
+            )
+            self._keys, self._lengths, self._pending = keys, lengths, {}
+        return self._frame[self.columns]
@@ -0,0 +1,174 @@
+"""
+Fikstür tablosu satır ayrıştırıcıları.
+
+parse_fixture_rows_soup BeautifulSoup/html.parser ile çalışan ilk sürümdür ve
+referans olarak korunur. parse_fixture_rows ise lxml ile tek geçişte yalnızca
+gereken hücreleri okur: MS olmayan satırları diğer hücrelerin metnine
+dokunmadan eler, önceden derlenmiş regex'leri kullanır ve haftaya bağlı
+tarih/yıl hesabını sayfa başına bir kez yapar. Çıktısı referansla birebir aynıdır
+(bkz. bench_parser.py).
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+from normalization import extract_week_number_only, extract_year_from_week
+
+try:
+    from lxml import etree
+except ImportError:  # lxml yoksa referans ayrıştırıcı kullanılır
+    etree = None
+
+
+def normalize_text(value):
+    if not value:
+        return ""
+    cleaned = value.strip().replace("\xa0", " ")
+    cleaned = cleaned.replace("–", "-").replace("—", "-").replace("−", "-")
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = re.sub(r"\s*-\s*", "-", cleaned)
+    return cleaned
+
+
+def is_played_score(value):
+    cleaned = normalize_text(value).lower()
+    if cleaned in {"", "-", "vs", "v", "ert", "tbd"}:
+        return False
+    if re.search(r"\d+\s*-\s*\d+", cleaned):
+        return True
+    return False
+
+def parse_fixture_rows_soup(html, normalized_season, league_name, week_name):
+    """Fikstür tablosu HTML'inden oynanmış MS maçlarının satırlarını çıkar (BeautifulSoup, referans sürüm)."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    rows = []
+    for tr in soup.find_all("tr"):
+        tds = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
+        if not tds or "Fikstür" in "".join(tds):
+            continue
+        if len(tds) < 10:
+            continue
+
+        tarih = normalize_text(tds[0]) if len(tds) > 0 else ""
+        kod = normalize_text(tds[1]) if len(tds) > 1 else ""
+        if kod.upper() != "MS":
+            continue
+        ev_sahibi = normalize_text(tds[3]) if len(tds) > 3 else ""
+        skor = normalize_text(tds[5]) if len(tds) > 5 else ""
+        deplasman = normalize_text(tds[7]) if len(tds) > 7 else ""
+        iy_skor_raw = normalize_text(tds[8]) if len(tds) > 8 else ""
+
+        if not is_played_score(skor):
+            continue
+
+        iy_skor = iy_skor_raw if is_played_score(iy_skor_raw) else (iy_skor_raw if iy_skor_raw else None)
+
+        # Add year to the date using week_name information
+        tarih_with_year = extract_year_from_week(week_name, tarih)
+
+        # Extract only the week number for storage
+        week_number_only = extract_week_number_only(week_name)
+
+        oran_index = 12 if len(tds) > 12 else 11
+        oranlar = [normalize_text(val) or None for val in tds[oran_index:]]
+        while len(oranlar) < 8:
+            oranlar.append(None)
+
+        row = [
+            normalized_season,
+            league_name,
+            week_number_only,
+            tarih_with_year or None,
+            kod or None,
+            ev_sahibi or None,
+            deplasman or None,
+            skor,
+            iy_skor,
+        ] + oranlar[:8]
+        rows.append(row)
+
+    return rows
+
+
+# ----------------------------- #
+# LXML HIZLI YOL
+# ----------------------------- #
+
+_TEXT_TRANSLATION = str.maketrans({"\xa0": " ", "–": "-", "—": "-", "−": "-"})
+_DASH_SPACING_RE = re.compile(r" ?- ?")
+_PLAYED_SCORE_RE = re.compile(r"\d+\s*-\s*\d+")
+_UNPLAYED_SCORES = frozenset({"", "-", "vs", "v", "ert", "tbd"})
+_HTML_PARSER = etree.HTMLParser(remove_comments=True) if etree is not None else None
+
+
+def _cell_text(td):
+    """get_text(" ", strip=True) + normalize_text ile aynı sonucu tek adımda üret."""
+    cleaned = " ".join(" ".join(td.itertext()).translate(_TEXT_TRANSLATION).split())
+    if "-" in cleaned:
+        cleaned = _DASH_SPACING_RE.sub("-", cleaned)
+    return cleaned
+
+
+def _is_played(cleaned):
+    lowered = cleaned.lower()
+    if lowered in _UNPLAYED_SCORES:
+        return False
+    return _PLAYED_SCORE_RE.search(lowered) is not None
+
+
+def parse_fixture_rows(html, normalized_season, league_name, week_name):
+    """parse_fixture_rows_soup ile aynı satırları lxml üzerinden tek geçişte çıkar."""
+    if etree is None:
+        return parse_fixture_rows_soup(html, normalized_season, league_name, week_name)
+    if not html:
+        return []
+
+    root = etree.fromstring(html, _HTML_PARSER)
+    if root is None:
+        return []
+    # BeautifulSoup get_text script/style içeriğini saymaz
+    etree.strip_elements(root, "script", "style", with_tail=False)
+
+    week_number_only = extract_week_number_only(week_name)
+    dated = {}
+
+    rows = []
+    for tr in root.iter("tr"):
+        tds = list(tr.iter("td"))
+        if len(tds) < 10:
+            continue
+
+        kod = _cell_text(tds[1])
+        if kod.upper() != "MS":
+            continue
+
+        texts = [_cell_text(td) for td in tds]
+        if "Fikstür" in "".join(texts):
+            continue
+
+        skor = texts[5]
+        if not _is_played(skor):
+            continue
+
+        tarih = texts[0]
+        if tarih not in dated:
+            dated[tarih] = extract_year_from_week(week_name, tarih)
+
+        oran_index = 12 if len(texts) > 12 else 11
+        oranlar = [val or None for val in texts[oran_index:oran_index + 8]]
+        oranlar.extend([None] * (8 - len(oranlar)))
+
+        rows.append([
+            normalized_season,
+            league_name,
+            week_number_only,
+            dated[tarih] or None,
+            kod or None,
+            texts[3] or None,
+            texts[7] or None,
+            skor,
+            texts[8] or None,
+        ] + oranlar)
+
+    return rows
@@ -0,0 +1,188 @@
+"""
+Fikstür veri setinin tek doğru kaynağı: Lig/Sezon bölümlü, tipli Parquet deposu.
+
+Yapı:
+    <store_dir>/<Lig>/<Sezon>.parquet   -> ör. "Almanya Bundesliga/2025-2026.parquet"
+
+Diskte sütunlar tiplidir: oranlar float64 ("-" -> NaN), Tarih datetime64,
+Hafta Int16, lig/sezon/kod/takım adları category. Tarayıcı tarafı metin
+şemasıyla çalışmaya devam eder; to_typed/to_text iki şema arasında çevirir.
+Yalnızca değişen (lig, sezon) bölümleri yeniden yazılır. xlsx/csv artık
+yalnızca istek üzerine üretilen dışa aktarımlardır:
+
+    python fixture_store.py --csv fikstur_tum_ligler_all_seasons.csv
+"""
+import argparse
+import os
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_STORE_DIR = SCRIPT_DIR / "fikstur_store"
+
+COLUMNS = [
+    "Season",
+    "Lig",
+    "Hafta",
+    "Tarih",
+    "Kod",
+    "EvSahibi",
+    "Deplasman",
+    "Skor",
+    "IY_Skor",
+    "1",
+    "0",
+    "2",
+    "1&0",
+    "1&2",
+    "2&0",
+    "Alt",
+    "Üst",
+]
+ODDS_COLUMNS = ["1", "0", "2", "1&0", "1&2", "2&0", "Alt", "Üst"]
+CATEGORY_COLUMNS = ["Season", "Lig", "Kod", "EvSahibi", "Deplasman"]
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def season_filename(season):
+    """'2025/2026' -> '2025-2026.parquet' (dosya adında '/' olamaz)."""
+    return f"{str(season).replace('/', '-')}.parquet"
+
+
+def to_typed(df):
+    """Metin şemasındaki tabloyu depo şemasına çevir."""
+    typed = df.reindex(columns=COLUMNS).copy()
+    for column in ODDS_COLUMNS:
+        typed[column] = pd.to_numeric(typed[column], errors="coerce").astype("float64")
+    typed["Tarih"] = pd.to_datetime(typed["Tarih"], format=DATE_FORMAT, errors="coerce")
+    typed["Hafta"] = pd.to_numeric(typed["Hafta"], errors="coerce").astype("Int16")
+    for column in ("Skor", "IY_Skor"):
+        typed[column] = typed[column].astype("string")
+    for column in CATEGORY_COLUMNS:
+        typed[column] = typed[column].astype("string").astype("category")
+    return typed
+
+
+def to_text(df):
+    """Depo şemasındaki tabloyu tarayıcının ve xlsx/csv dışa aktarımlarının metin şemasına çevir."""
+    text = df.reindex(columns=COLUMNS).copy()
+    for column in ODDS_COLUMNS:
+        values = pd.to_numeric(text[column], errors="coerce")
+        text[column] = values.map(lambda value: f"{value:.2f}", na_action="ignore").fillna("-").astype(object)
+    dates = pd.to_datetime(text["Tarih"], errors="coerce")
+    text["Tarih"] = dates.dt.strftime(DATE_FORMAT).astype(object).where(dates.notna(), None)
+    text["Hafta"] = text["Hafta"].astype("string").fillna("").astype(object)
+    for column in CATEGORY_COLUMNS + ["Skor", "IY_Skor"]:
+        text[column] = text[column].astype(object).where(text[column].notna(), None)
+    return text
+
+
+def _partition_paths(store_dir):
+    store_dir = Path(store_dir)
+    if not store_dir.is_dir():
+        return []
+    return sorted(store_dir.glob("*/*.parquet"))
+
+
+def read_dataset(store_dir=DEFAULT_STORE_DIR, leagues=None, seasons=None, columns=None):
+    """
+    Depodaki bölümleri tipli tek bir DataFrame olarak oku.
+    leagues/seasons verilirse yalnızca o bölümlerin dosyaları açılır.
+    """
+    wanted_files = None if seasons is None else {season_filename(season) for season in seasons}
+    frames = []
+    for path in _partition_paths(store_dir):
+        if leagues is not None and path.parent.name not in leagues:
+            continue
+        if wanted_files is not None and path.name not in wanted_files:
+            continue
+        frames.append(pd.read_parquet(path, columns=columns))
+
+    if not frames:
+        empty = to_typed(pd.DataFrame(columns=COLUMNS))
+        return empty if columns is None else empty[list(columns)]
+
+    # Bölümler kendi kategori sözlükleriyle yazılır; birleşimde sözlükleri metne açmadan birleştir
+    categories = {
+        column: union_categoricals([frame[column] for frame in frames])
+        for column in CATEGORY_COLUMNS
+        if column in frames[0].columns
+    }
+    df = pd.concat(frames, ignore_index=True)
+    for column, values in categories.items():
+        df[column] = pd.Categorical(values)
+    return df
+
+
+def write_dataset(df, store_dir=DEFAULT_STORE_DIR, partitions=None):
+    """
+    Tabloyu (Lig, Sezon) bölümlerine ayırıp yaz.
+    partitions verilirse yalnızca o (lig, sezon) çiftleri yeniden yazılır; verilmezse
+    depo tamamen tabloyla eşitlenir ve tabloda olmayan bölümler silinir.
+    Her dosya önce geçici ada yazılıp os.replace ile yerine konur.
+    """
+    store_dir = Path(store_dir)
+    typed = to_typed(df)
+    groups = typed.groupby(["Lig", "Season"], observed=True, sort=False)
+
+    if partitions is not None:
+        partitions = {(str(league), str(season)) for league, season in partitions}
+
+    written = set()
+    for (league, season), part in groups:
+        key = (str(league), str(season))
+        if partitions is not None and key not in partitions:
+            continue
+        path = store_dir / key[0] / season_filename(key[1])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        part = part.sort_values(["Hafta", "Tarih"], kind="stable", ignore_index=True)
+        for column in CATEGORY_COLUMNS:
+            part[column] = part[column].cat.remove_unused_categories()
+        part.to_parquet(tmp_path, index=False, compression="zstd")
+        os.replace(tmp_path, path)
+        written.add(path)
+
+    if partitions is None:
+        for path in _partition_paths(store_dir):
+            if path not in written:
+                path.unlink()
+    return len(written)
+
+
+def export_dataset(df, xlsx_path=None, csv_path=None):
+    """İstek üzerine xlsx/csv dışa aktarımı (eski dosya biçimiyle birebir sütunlar)."""
+    text = to_text(df) if pd.api.types.is_datetime64_any_dtype(df["Tarih"]) else df.reindex(columns=COLUMNS)
+    if xlsx_path:
+        text.to_excel(xlsx_path, index=False, engine="openpyxl")
+    if csv_path:
+        text.to_csv(csv_path, index=False)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet fikstür deposunu xlsx/csv olarak dışa aktar.")
+    parser.add_argument("--store-dir", default=str(DEFAULT_STORE_DIR), help="Depo klasörü (default: %(default)s)")
+    parser.add_argument("--xlsx", help="Yazılacak xlsx dosyası")
+    parser.add_argument("--csv", help="Yazılacak csv dosyası")
+    parser.add_argument("--league", action="append", help="Yalnızca bu lig (birden fazla verilebilir)")
+    parser.add_argument("--season", action="append", help="Yalnızca bu sezon, ör. 2025/2026")
+    args = parser.parse_args()
+
+    if not args.xlsx and not args.csv:
+        parser.error("--xlsx ya da --csv verilmeli")
+
+    df = read_dataset(args.store_dir, leagues=args.league, seasons=args.season)
+    if df.empty:
+        print(f"✗ Depoda veri yok: {args.store_dir}")
+        return
+    export_dataset(df, xlsx_path=args.xlsx, csv_path=args.csv)
+    for path in (args.xlsx, args.csv):
+        if path:
+            print(f"✓ {len(df)} satır yazıldı: {path}")
+
+
+if __name__ == "__main__":
+    main()
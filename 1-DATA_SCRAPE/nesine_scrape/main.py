@@ -1,28 +1,36 @@
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
+import argparse
+import queue
+import threading
 import os
-import re
 from pathlib import Path
 
+from fetchers import StaleWeekError, create_fetcher
+from fixture_index import FixtureIndex
+from fixture_parser import parse_fixture_rows
+from fixture_store import export_dataset, read_dataset, to_text, write_dataset
+from normalization import normalize_season_label, normalize_seasons, parse_week_number
+from readiness import WaitStats
+from scrape_journal import ScrapeJournal
+from snapshot_cache import SnapshotCache
+
 # ----------------------------- #
 # AYARLAR
 # ----------------------------- #
 
-URL = "https://arsiv.mackolik.com/Standings/Default.aspx"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 UBLOCK_PATH = os.path.join(SCRIPT_DIR, "ublock_origin-1.67.0.xpi")
 HEADLESS = True
 WAIT_TIME = 10
+FETCH_BACKEND = "selenium"  # "selenium" ya da "http" (tarayıcısız doğrudan istek)
+POOL_WORKERS = 1  # 1'den büyükse her lig ayrı bir tarayıcı işçisine dağıtılır
+MAX_TASK_RETRIES = 1  # Çöken tarayıcıda ya da yenilenmeyen haftada yarım kalan görev kaç kez yeniden kuyruğa alınır
+STORE_DIR = Path(SCRIPT_DIR) / "fikstur_store"  # Lig/Sezon bölümlü Parquet deposu; tek doğru kaynak
 AGGREGATE_FILENAME = "fikstur_tum_ligler_all_seasons.xlsx"
-OUTPUT_PATH = Path(SCRIPT_DIR) / AGGREGATE_FILENAME
-TEMP_OUTPUT_PATH = OUTPUT_PATH.with_name(f"{OUTPUT_PATH.stem}_temp{OUTPUT_PATH.suffix}")
+OUTPUT_PATH = Path(SCRIPT_DIR) / AGGREGATE_FILENAME  # --export xlsx hedefi; depo boşsa bir kez buradan taşınır
 CSV_OUTPUT_PATH = OUTPUT_PATH.with_suffix(".csv")
+SNAPSHOT_CACHE_DIR = Path(SCRIPT_DIR) / "html_cache"
+JOURNAL_DIR = Path(SCRIPT_DIR) / "scrape_journal"
 EXPECTED_COLUMNS = [
     "Season",
     "Lig",
@@ -43,18 +51,6 @@ EXPECTED_COLUMNS = [
     "Üst",
 ]
 
-# ----------------------------- #
-# SELENIUM AYARLARI
-# ----------------------------- #
-
-options = Options()
-options.headless = HEADLESS
-driver = webdriver.Firefox(options=options)
-driver.install_addon(UBLOCK_PATH, temporary=True)
-driver.get(URL)
-
-wait = WebDriverWait(driver, WAIT_TIME)
-
 # ----------------------------- #
 # FİLTRE AYARLARI
 # ----------------------------- #
@@ -69,140 +65,15 @@ LEAGUE_URLS = {
 }
 
 
-def normalize_season_label(raw_value):
-    """Return season labels in canonical 'YYYY/YYYY' form."""
-    if not raw_value:
-        return ""
-
-    label = str(raw_value).strip()
-
-    def _format_years(start_str, end_str):
-        start_year = int(start_str)
-        if len(end_str) == 2:
-            base_century = (start_year // 100) * 100
-            end_year = base_century + int(end_str)
-            if end_year <= start_year:
-                end_year += 100
-        else:
-            end_year = int(end_str)
-        return f"{start_year}/{end_year}"
-
-    match = re.match(r"^(\d{4})[\-/](\d{2}|\d{4})$", label)
-    if match:
-        return _format_years(match.group(1), match.group(2))
-
-    match = re.match(r"^(\d{4})\s+(\d{2}|\d{4})$", label)
-    if match:
-        return _format_years(match.group(1), match.group(2))
-
-    return label.replace("-", "/")
-
-
-def parse_week_number(week_name):
-    """Extract numeric portion from a week label; fall back to -1 if absent."""
-    if not week_name:
-        return -1
-    match = re.search(r"(\d+)", week_name)
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            return -1
-    return -1
-
-
-def extract_year_from_week(week_name, date_str):
-    """
-    Extract the year from week_name (format: '1 (5.08.2022 - 7.08.2022)')
-    and add it to date_str (format: '05/08').
-    Handles cases where a week spans two different years.
-    Returns date in format 'DD/MM/YYYY' or original date_str if parsing fails.
-    """
-    if not week_name or not date_str:
-        return date_str
-    
-    # Try to extract date range from week_name
-    # Format: "1 (5.08.2022 - 7.08.2022)" or "1 (28.12.2024 - 2.01.2025)"
-    date_range_match = re.search(r'\((\d{1,2}\.\d{2}\.\d{4})\s*-\s*(\d{1,2}\.\d{2}\.\d{4})\)', week_name)
-    
-    if not date_range_match:
-        return date_str
-    
-    start_date_str = date_range_match.group(1)  # e.g., "5.08.2022"
-    end_date_str = date_range_match.group(2)    # e.g., "7.08.2022"
-    
-    # Parse the date_str (format: "05/08" or "DD/MM")
-    date_match = re.match(r'(\d{2})/(\d{2})', date_str)
-    if not date_match:
-        return date_str
-    
-    day = date_match.group(1)
-    month = date_match.group(2)
-    
-    # Parse start and end dates from week_name
-    start_parts = start_date_str.split('.')  # [day, month, year]
-    end_parts = end_date_str.split('.')      # [day, month, year]
-    
-    if len(start_parts) != 3 or len(end_parts) != 3:
-        return date_str
-    
-    start_month = start_parts[1].zfill(2)
-    start_year = start_parts[2]
-    end_month = end_parts[1].zfill(2)
-    end_year = end_parts[2]
-    
-    # Determine which year to use based on the month
-    if month == start_month:
-        year = start_year
-    elif month == end_month:
-        year = end_year
-    else:
-        # If the month doesn't match either, try to infer
-        # This handles edge cases
-        month_int = int(month)
-        start_month_int = int(start_month)
-        end_month_int = int(end_month)
-        
-        # If week spans two years, pick the appropriate year
-        if start_year != end_year:
-            if month_int == 12 or month_int >= start_month_int:
-                year = start_year
-            else:
-                year = end_year
-        else:
-            year = start_year
-    
-    return f"{day}/{month}/{year}"
-
-
-def extract_week_number_only(week_name):
-    """
-    Extract just the week number from week_name.
-    Format: '1 (5.08.2022 - 7.08.2022)' -> '1'
-    Returns the week number as a string, or the original week_name if no number found.
-    """
-    if not week_name:
-        return week_name
-    
-    # Extract the number before the parenthesis
-    match = re.match(r'^(\d+)\s*\(', week_name)
-    if match:
-        return match.group(1)
-    
-    # Fallback: try to extract any number
-    match = re.search(r'(\d+)', week_name)
-    if match:
-        return match.group(1)
-    
-    return week_name
-
-
 def load_existing_dataset(path):
-    """Load prior scrape results and standardize schema for incremental updates."""
+    """Load prior scrape results (Parquet store or legacy xlsx) and standardize schema for incremental updates."""
     if not path.exists():
         return pd.DataFrame(columns=EXPECTED_COLUMNS)
 
-    df = pd.read_excel(path)
+    if path.is_dir():
+        df = to_text(read_dataset(path))
+    else:
+        df = pd.read_excel(path)
     rename_map = {}
     if "season_year" in df.columns and "Season" not in df.columns:
         rename_map["season_year"] = "Season"
@@ -216,353 +87,487 @@ def load_existing_dataset(path):
     df = df[EXPECTED_COLUMNS]
     for column in ("Season", "Lig", "Hafta"):
         df[column] = df[column].fillna("").astype(str).str.strip()
-    df["Season"] = df["Season"].apply(normalize_season_label)
+    df["Season"] = normalize_seasons(df["Season"])
     return df
 
 
-def merge_existing_and_new(existing_df, new_df):
-    """Merge new rows with historic data, replacing overlapping league/week slices."""
+def upsert_new_rows(dataset, new_df):
+    """Upsert new rows into the indexed dataset, replacing overlapping league/week slices."""
     if new_df.empty:
-        return existing_df.copy()
+        return 0
 
     new_df = new_df.reindex(columns=EXPECTED_COLUMNS)
-    new_df["Season"] = new_df["Season"].apply(normalize_season_label)
+    new_df["Season"] = normalize_seasons(new_df["Season"])
+    return dataset.upsert(new_df)
 
-    if existing_df.empty:
-        combined = new_df.copy()
-    else:
-        key_df = new_df[["Season", "Lig", "Hafta"]].drop_duplicates()
-        filtered_existing = existing_df.merge(
-            key_df,
-            on=["Season", "Lig", "Hafta"],
-            how="left",
-            indicator=True,
-        )
-        filtered_existing = filtered_existing[filtered_existing["_merge"] == "left_only"].drop(columns="_merge")
-        combined = pd.concat([filtered_existing, new_df], ignore_index=True)
-
-    combined = combined.drop_duplicates(
-        subset=["Season", "Lig", "Hafta", "Kod", "Tarih", "EvSahibi", "Deplasman", "Skor"],
-        keep="last",
+
+dataset = FixtureIndex(EXPECTED_COLUMNS, week_number=parse_week_number)
+
+all_dfs = []
+interrupted = False
+progress_lock = threading.Lock()
+stop_event = threading.Event()
+wait_stats = WaitStats()
+snapshot_cache = None  # main() içinde --no-cache verilmezse SnapshotCache olur
+journal = None  # main() içinde ScrapeJournal olur
+dirty_partitions = set()  # Bu çalışmada değişen (lig, sezon) bölümleri; None = depo baştan yazılır
+
+def record_week(league_name, normalized_season, week_name, rows):
+    """Haftanın satırlarını günlüğe commit et; kontrol noktası yalnızca bu satırlar kadar iş yapar."""
+    if journal is not None:
+        journal.append(league_name, normalized_season, week_name, rows)
+    df = pd.DataFrame(rows, columns=EXPECTED_COLUMNS)
+    with progress_lock:
+        all_dfs.append(df)
+        mark_dirty(league_name, normalized_season)
+
+
+def mark_dirty(league_name, normalized_season):
+    if dirty_partitions is not None:
+        dirty_partitions.add((league_name, normalized_season))
+
+
+# ----------------------------- #
+# ARKA UÇ AYARLARI
+# ----------------------------- #
+
+def open_fetcher(backend, base_url=None):
+    """Seçilen arka uç için yeni bir fetcher oluştur."""
+    return create_fetcher(
+        backend,
+        headless=HEADLESS,
+        wait_time=WAIT_TIME,
+        addon_path=UBLOCK_PATH,
+        base_url=base_url,
     )
-    combined["Season"] = combined["Season"].apply(normalize_season_label)
-    combined = combined.sort_values(["Season", "Lig", "Hafta", "Tarih"], ignore_index=True)
-    return combined
 
 
-def get_last_week(existing_df, league_name, season_name):
-    """Return the most recent week label stored for the given league-season pair."""
-    if existing_df.empty:
-        return None
+def close_fetcher(fetcher):
+    if fetcher is None:
+        return
+    with progress_lock:
+        wait_stats.merge(fetcher.wait_stats)
+    fetcher.close()
 
-    mask = (existing_df["Lig"] == league_name) & (existing_df["Season"] == season_name)
-    subset = existing_df.loc[mask]
-    if subset.empty:
-        return None
 
-    subset = subset.copy()
-    subset["_week_number"] = subset["Hafta"].apply(parse_week_number)
-    subset = subset.sort_values(["_week_number", "Hafta"])
-    return subset.iloc[-1]["Hafta"]
+def print_wait_stats():
+    if not wait_stats:
+        return
+    print("\nBekleme istatistikleri:")
+    for line in wait_stats.summary_lines():
+        print(f"  {line}")
 
-existing_data_df = load_existing_dataset(OUTPUT_PATH)
 
-all_dfs = []
-interrupted = False
+# ----------------------------- #
+# FİKSTÜR TABLOSU
+# ----------------------------- #
 
-def save_progress(verbose=True):
-    """Geçici olarak toplanan verileri kaydet"""
-    global existing_data_df
-    if not all_dfs:
+def find_start_position(indexed_weeks, last_week_name, log=print):
+    """Kaydedilmiş son haftaya göre taramanın başlayacağı hafta sırasını bul."""
+    start_position = 0
+    if not last_week_name:
+        return start_position
+
+    last_week_number = parse_week_number(last_week_name)
+    matched = False
+    for pos, (_, week_name) in enumerate(indexed_weeks):
+        if week_name == last_week_name:
+            start_position = pos
+            matched = True
+            break
+    if not matched and last_week_number > 0:
+        for pos, (_, week_name) in enumerate(indexed_weeks):
+            if parse_week_number(week_name) == last_week_number:
+                start_position = pos
+                matched = True
+                break
+    if not matched and last_week_number > 0:
+        for pos, (_, week_name) in enumerate(indexed_weeks):
+            if parse_week_number(week_name) >= last_week_number:
+                start_position = max(0, pos - 1)
+                matched = True
+                break
+    if not matched:
+        log(f"    -> Kaydedilmiş hafta '{last_week_name}' seçeneklerde bulunamadı, sezon başından taranacak.")
+    return start_position
+
+
+def scrape_season(fetcher, league_name, url, season_name=None, log=print, on_seasons=None):
+    """
+    Bir ligin tek bir sezonunu tara; bulunan her haftayı günlüğe ve all_dfs'e ekle.
+    season_name verilmezse en son sezon taranır ve sayfadaki tüm sezon adları
+    on_seasons'a iletilir (backfill modunda eski sezonlar buradan kuyruğa eklenir).
+    """
+    season_names = fetcher.open_league(url)
+
+    if not season_names:
+        log(f"{league_name}: sezon listesi bulunamadı, atlanıyor.")
         return False
 
-    temp_df = pd.concat(all_dfs, ignore_index=True)
-    merged_df = merge_existing_and_new(existing_data_df, temp_df)
-    existing_data_df = merged_df
+    if season_name is None:
+        # Only process the last (most recent) season
+        season_name = season_names[0]  # First option is usually the most recent season
+        season_note = "en son sezon"
+        if on_seasons is not None:
+            on_seasons(season_names)
+    else:
+        season_note = "geçmiş sezon"
 
-    try:
-        merged_df.to_excel(TEMP_OUTPUT_PATH, index=False, engine="openpyxl")
-        if verbose:
-            print(f"  → İlerleme kaydedildi: {str(TEMP_OUTPUT_PATH)} ({len(merged_df)} satır)")
-        return True
-    except ModuleNotFoundError:
-        print("  → Uyarı: openpyxl bulunamadı, ilerleme kaydedilemedi. 'python -m pip install openpyxl' komutunu çalıştırın.")
-    except Exception as err:
-        print(f"  → Uyarı: ilerleme kaydedilirken hata oluştu: {err}")
-    return False
-
-
-def normalize_text(value):
-    if not value:
-        return ""
-    cleaned = value.strip().replace("\xa0", " ")
-    cleaned = cleaned.replace("–", "-").replace("—", "-").replace("−", "-")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = re.sub(r"\s*-\s*", "-", cleaned)
-    return cleaned
-
-
-def is_played_score(value):
-    cleaned = normalize_text(value).lower()
-    if cleaned in {"", "-", "vs", "v", "ert", "tbd"}:
+    normalized_season = normalize_season_label(season_name)
+    log(f"  → Sezon: {normalized_season} ({season_note})")
+
+    week_names = fetcher.select_season(season_name)
+    if week_names is None:
+        log(f"    Sezon '{season_name}' bulunamadı, atlanıyor.")
         return False
-    if re.search(r"\d+\s*-\s*\d+", cleaned):
-        return True
-    return False
 
-# ----------------------------- #
-# TÜM LİGLERİ TEK TEK DOLAŞ
-# ----------------------------- #
-try:
-    for idx, (league_name, url) in enumerate(LEAGUE_URLS.items(), start=1):
-        print(f"\n[{idx}/{len(LEAGUE_URLS)}] {league_name} işleniyor...")
+    indexed_weeks = list(enumerate(week_names))
 
-        league_has_data = False
+    if not indexed_weeks:
+        log("    → Haftalar bulunamadı, sezon atlanıyor.")
+        return False
 
-        try:
-            driver.get(url)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#cboSeason")))
-            time.sleep(1.5)
+    last_week_name = dataset.last_week(league_name, normalized_season)
+    start_position = find_start_position(indexed_weeks, last_week_name, log=log)
 
-            season_select = driver.find_element(By.CSS_SELECTOR, "#cboSeason")
-            season_elements = season_select.find_elements(By.TAG_NAME, "option")
-            season_names = [opt.text.strip() for opt in season_elements if opt.text.strip()]
+    season_has_data = False
 
-            if not season_names:
-                print(f"{league_name}: sezon listesi bulunamadı, atlanıyor.")
-                continue
+    for relative_idx in range(start_position, len(indexed_weeks)):
+        if stop_event.is_set():
+            break
 
-            # Only process the last (most recent) season
-            season_name = season_names[0]  # First option is usually the most recent season
-            normalized_season = normalize_season_label(season_name)
-            print(f"  → Sezon: {normalized_season} (en son sezon)")
-
-            season_select = driver.find_element(By.CSS_SELECTOR, "#cboSeason")
-            season_options = season_select.find_elements(By.TAG_NAME, "option")
-            target_option = None
-            for option in season_options:
-                if option.text.strip() == season_name:
-                    target_option = option
-                    break
+        _, week_name = indexed_weeks[relative_idx]
 
-            if not target_option:
-                print(f"    Sezon '{season_name}' bulunamadı, atlanıyor.")
-                continue
+        progress_total = max(1, len(indexed_weeks) - start_position)
+        progress_current = relative_idx - start_position + 1
+        log(f"    {week_name} ({progress_current}/{progress_total})")
 
-            target_option.click()
-            time.sleep(1.5)
+        html = fetcher.fetch_week(week_name)
+        if snapshot_cache is not None:
+            snapshot_cache.put(league_name, normalized_season, week_name, html)
+        rows = parse_fixture_rows(html, normalized_season, league_name, week_name)
 
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#tab-list")))
-            time.sleep(1)
+        if rows:
+            record_week(league_name, normalized_season, week_name, rows)
+            season_has_data = True
+            log(f"      → {len(rows)} oynanmış maç bulundu")
+        else:
+            if relative_idx == start_position:
+                log("      → Haftada oynanmış maç bulunamadı, sonraki haftalar kontrol ediliyor.")
+                continue
+            log("      → Haftada oynanmış maç yok, kalan haftalar atlanıyor.")
+            break
 
-            navbar = driver.find_element(By.CSS_SELECTOR, "#tab-list")
-            fikstur_btn = navbar.find_element(By.CSS_SELECTOR, "li.ui-state-default:nth-child(3) a")
-            fikstur_btn.click()
+    if season_has_data:
+        log(f"  ✓ {season_name} sezonu işlendi.")
+    else:
+        log(f"  → {season_name} sezonu için yeni veri bulunamadı.")
+    return season_has_data
 
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#cboWeek")))
-            time.sleep(1)
 
-            date_filter = driver.find_element(By.CSS_SELECTOR, "#cboWeek")
-            week_elements = date_filter.find_elements(By.TAG_NAME, "option")
-            indexed_weeks = [(i, opt.text.strip()) for i, opt in enumerate(week_elements) if opt.text.strip()]
+# ----------------------------- #
+# TÜM LİGLERİ DOLAŞ
+# ----------------------------- #
 
-            if not indexed_weeks:
-                print("    → Haftalar bulunamadı, sezon atlanıyor.")
+class ScrapeScheduler:
+    """
+    Lig/sezon görevlerinin ortak kuyruğu.
+    Her lig önce en son sezonuyla kuyruğa girer; backfill modunda o görev
+    sayfadaki sezon listesini görünce eski sezonları ayrı görevler olarak ekler.
+    Görev: (sıra, lig, url, sezon adı ya da None, deneme sayısı)
+    """
+
+    def __init__(self, league_items, backfill=False, max_seasons=0):
+        self.queue = queue.Queue()
+        self.backfill = backfill
+        self.max_seasons = max_seasons
+        self._lock = threading.Lock()
+        self._count = 0
+        self._expanded = set()
+        for league_name, url in league_items:
+            self.add(league_name, url)
+
+    @property
+    def total(self):
+        return self._count
+
+    def idle(self):
+        """Kuyruk boş ve işlenen görev yoksa True; o zaman yeni görev gelmez."""
+        return self.queue.unfinished_tasks == 0
+
+    def add(self, league_name, url, season_name=None):
+        with self._lock:
+            self._count += 1
+            self.queue.put((self._count, league_name, url, season_name, 0))
+
+    def retry(self, task):
+        idx, league_name, url, season_name, attempt = task
+        self.queue.put((idx, league_name, url, season_name, attempt + 1))
+
+    def expand(self, league_name, url, season_names):
+        """En son sezon dışındaki sezonları (max_seasons sınırıyla) kuyruğa ekle."""
+        with self._lock:
+            if league_name in self._expanded:
+                return
+            self._expanded.add(league_name)
+        older = season_names[1:self.max_seasons] if self.max_seasons else season_names[1:]
+        for season_name in older:
+            self.add(league_name, url, season_name)
+
+
+def work_loop(scheduler, backend, base_url=None, log=print):
+    """Kuyruk boşalana kadar görev al ve tek bir fetcher ile işle."""
+    fetcher = None
+    try:
+        while not stop_event.is_set():
+            try:
+                task = scheduler.queue.get(timeout=0.2)
+            except queue.Empty:
+                # Başka bir işçinin açmakta olduğu lig yeni sezon görevleri ekleyebilir
+                if scheduler.idle():
+                    break
                 continue
 
-            last_week_name = get_last_week(existing_data_df, league_name, normalized_season)
-            start_position = 0
-            if last_week_name:
-                last_week_number = parse_week_number(last_week_name)
-                matched = False
-                for pos, (_, week_name) in enumerate(indexed_weeks):
-                    if week_name == last_week_name:
-                        start_position = pos
-                        matched = True
-                        break
-                if not matched and last_week_number > 0:
-                    for pos, (_, week_name) in enumerate(indexed_weeks):
-                        if parse_week_number(week_name) == last_week_number:
-                            start_position = pos
-                            matched = True
-                            break
-                if not matched and last_week_number > 0:
-                    for pos, (_, week_name) in enumerate(indexed_weeks):
-                        if parse_week_number(week_name) >= last_week_number:
-                            start_position = max(0, pos - 1)
-                            matched = True
-                            break
-                if not matched:
-                    print(
-                        f"    -> Kaydedilmiş hafta '{last_week_name}' seçeneklerde bulunamadı, sezon başından taranacak."
-                    )
-
-            season_has_data = False
-
-            for relative_idx in range(start_position, len(indexed_weeks)):
-                option_index, week_name = indexed_weeks[relative_idx]
-
-                date_filter = driver.find_element(By.CSS_SELECTOR, "#cboWeek")
-                week_options = date_filter.find_elements(By.TAG_NAME, "option")
-
-                progress_total = max(1, len(indexed_weeks) - start_position)
-                progress_current = relative_idx - start_position + 1
-                print(f"    {week_name} ({progress_current}/{progress_total})")
-
-                try:
-                    week_options[option_index].click()
-                except Exception:
-                    date_filter = driver.find_element(By.CSS_SELECTOR, "#cboWeek")
-                    week_options = date_filter.find_elements(By.TAG_NAME, "option")
-                    week_options[option_index].click()
-
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#dvFixtureInner > table:nth-child(1)")))
-                time.sleep(1.2)
-
-                table = driver.find_element(By.CSS_SELECTOR, "#dvFixtureInner > table:nth-child(1)")
-                html = table.get_attribute("outerHTML")
-                soup = BeautifulSoup(html, "html.parser")
-
-                rows = []
-                for tr in soup.find_all("tr"):
-                    tds = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
-                    if not tds or "Fikstür" in "".join(tds):
-                        continue
-                    if len(tds) < 10:
-                        continue
-
-                    tarih = normalize_text(tds[0]) if len(tds) > 0 else ""
-                    kod = normalize_text(tds[1]) if len(tds) > 1 else ""
-                    if kod.upper() != "MS":
-                        continue
-                    ev_sahibi = normalize_text(tds[3]) if len(tds) > 3 else ""
-                    skor = normalize_text(tds[5]) if len(tds) > 5 else ""
-                    deplasman = normalize_text(tds[7]) if len(tds) > 7 else ""
-                    iy_skor_raw = normalize_text(tds[8]) if len(tds) > 8 else ""
-
-                    if not is_played_score(skor):
-                        continue
-
-                    iy_skor = iy_skor_raw if is_played_score(iy_skor_raw) else (iy_skor_raw if iy_skor_raw else None)
-
-                    # Add year to the date using week_name information
-                    tarih_with_year = extract_year_from_week(week_name, tarih)
-                    
-                    # Extract only the week number for storage
-                    week_number_only = extract_week_number_only(week_name)
-
-                    oran_index = 12 if len(tds) > 12 else 11
-                    oranlar = [normalize_text(val) or None for val in tds[oran_index:]]
-                    while len(oranlar) < 8:
-                        oranlar.append(None)
-
-                    row = [
-                        normalized_season,
-                        league_name,
-                        week_number_only,
-                        tarih_with_year or None,
-                        kod or None,
-                        ev_sahibi or None,
-                        deplasman or None,
-                        skor,
-                        iy_skor,
-                    ] + oranlar[:8]
-                    rows.append(row)
-
-                cols = [
-                    "Season",
-                    "Lig",
-                    "Hafta",
-                    "Tarih",
-                    "Kod",
-                    "EvSahibi",
-                    "Deplasman",
-                    "Skor",
-                    "IY_Skor",
-                    "1",
-                    "0",
-                    "2",
-                    "1&0",
-                    "1&2",
-                    "2&0",
-                    "Alt",
-                    "Üst",
-                ]
-
-                if rows:
-                    df = pd.DataFrame(rows, columns=cols)
-                    all_dfs.append(df)
-                    season_has_data = True
-                    league_has_data = True
-                    print(f"      → {len(rows)} oynanmış maç bulundu")
+            idx, league_name, url, season_name, attempt = task
+            label = league_name if season_name is None else f"{league_name} {normalize_season_label(season_name)}"
+            on_seasons = None
+            if scheduler.backfill and season_name is None:
+                on_seasons = lambda names, league_name=league_name, url=url: scheduler.expand(league_name, url, names)
+
+            try:
+                if fetcher is None:
+                    fetcher = open_fetcher(backend, base_url)
+                log(f"[{idx}/{scheduler.total}] {label} işleniyor...")
+                if scrape_season(fetcher, league_name, url, season_name, log=log, on_seasons=on_seasons):
+                    log(f"{label} tamamlandı.")
                 else:
-                    if relative_idx == start_position:
-                        print("      → Haftada oynanmış maç bulunamadı, sonraki haftalar kontrol ediliyor.")
-                        continue
-                    print("      → Haftada oynanmış maç yok, kalan haftalar atlanıyor.")
-                    break
+                    log(f"{label} veri bulunamadı, atlandı.")
+            except Exception as err:
+                if fetcher is not None and fetcher.is_alive():
+                    if isinstance(err, StaleWeekError) and attempt < MAX_TASK_RETRIES:
+                        # Hafta kaydedilmedi; görev kaydedilen son haftadan yeniden başlar
+                        log(f"{label}: {err}; yeniden denenecek.")
+                        scheduler.retry(task)
+                    else:
+                        log(f"{label} hata verdi: {err}")
+                    continue
+                close_fetcher(fetcher)
+                fetcher = None
+                if attempt < MAX_TASK_RETRIES:
+                    log(f"{label}: tarayıcı çöktü, yeni tarayıcıyla yeniden denenecek.")
+                    scheduler.retry(task)
+                else:
+                    log(f"{label} hata verdi: {err}")
+            finally:
+                scheduler.queue.task_done()
+    finally:
+        # Kesinti ya da beklenmeyen hatada da tarayıcı açık kalmasın
+        close_fetcher(fetcher)
+
+
+def run_sequential(scheduler, backend, base_url=None):
+    """Tüm görevleri tek bir fetcher ile sırayla işle."""
+    work_loop(scheduler, backend, base_url)
+
+
+def run_pool(scheduler, workers, backend, base_url=None):
+    """
+    Görevleri ortak kuyruktan N bağımsız işçiye dağıt.
+    Her işçi kendi fetcher'ını (Firefox oturumu ya da HTTP oturumu) yönetir; çöken
+    bir tarayıcı yeniden başlatılır ve yarım kalan görev en fazla MAX_TASK_RETRIES
+    kez kuyruğa geri alınır.
+    """
+    def worker(worker_id):
+        # Satırların diğer işçilerin çıktısıyla karışmaması için tek write çağrısı
+        log = lambda message: print(f"[W{worker_id}] {message}\n", end="", flush=True)
+        work_loop(scheduler, backend, base_url, log=log)
+
+    threads = [
+        threading.Thread(target=worker, args=(worker_id,), daemon=True)
+        for worker_id in range(1, workers + 1)
+    ]
+    for thread in threads:
+        thread.start()
 
-            if season_has_data:
-                print(f"  ✓ {season_name} sezonu işlendi.")
-                save_progress()
-            else:
-                print(f"  → {season_name} sezonu için yeni veri bulunamadı.")
-
-            if league_has_data:
-                print(f"{league_name} tamamlandı.")
-            else:
-                print(f"{league_name} veri bulunamadı, atlandı.")
-
-        except Exception as e:
-            print(f"{league_name} hata verdi: {e}")
-            continue
-except KeyboardInterrupt:
-    interrupted = True
-    print("\n! İşlem kullanıcı tarafından durduruldu, mevcut veriler kaydediliyor...")
-    save_progress()
-except Exception as exc:
-    interrupted = True
-    print(f"\n! Beklenmeyen bir hata oluştu: {exc}")
-    save_progress()
-finally:
     try:
-        driver.quit()
-    except Exception:
-        pass
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        # İşçiler ellerindeki haftayı bitirip dursun, sonra ilerleme kaydedilsin
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        raise
+
+
+def replay_from_cache(cache):
+    """Tarayıcı açmadan önbellekteki tüm haftaları güncel ayrıştırıcıyla yeniden işle."""
+    entries = sorted(cache.entries(), key=lambda entry: (entry[0], entry[1], parse_week_number(entry[2]), entry[2]))
+    print(f"Önbellekten yeniden oluşturuluyor: {len(entries)} hafta ({cache.cache_dir})")
+
+    replayed_rows = 0
+    for league_name, season, week_name, digest in entries:
+        rows = parse_fixture_rows(cache.read_object(digest), season, league_name, week_name)
+        if rows:
+            all_dfs.append(pd.DataFrame(rows, columns=EXPECTED_COLUMNS))
+            mark_dirty(league_name, season)
+            replayed_rows += len(rows)
+    print(f"  → {replayed_rows} oynanmış maç yeniden ayrıştırıldı")
+
 
 # ----------------------------- #
 # TÜM DF'LERİ BİRLEŞTİR VE KAYDET
 # ----------------------------- #
 
-new_data_df = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame(columns=EXPECTED_COLUMNS)
-
-if new_data_df.empty and existing_data_df.empty:
-    print("\n✗ Hiç veri bulunamadı!")
-    if interrupted:
-        print("! İşlem kullanıcı tarafından durduruldu.")
-else:
-    if new_data_df.empty:
-        final_df = existing_data_df.copy()
-    else:
-        final_df = merge_existing_and_new(existing_data_df, new_data_df)
-
-    final_df = final_df.reindex(columns=EXPECTED_COLUMNS)
-    final_df["Season"] = final_df["Season"].apply(normalize_season_label)
-    final_df.to_excel(OUTPUT_PATH, index=False, engine="openpyxl")
-    final_df.to_csv(CSV_OUTPUT_PATH, index=False)
+def write_final_output(exports=()):
+    new_data_df = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame(columns=EXPECTED_COLUMNS)
+
+    if new_data_df.empty and dataset.empty:
+        print("\n✗ Hiç veri bulunamadı!")
+        if interrupted:
+            print("! İşlem kullanıcı tarafından durduruldu.")
+        return
+
+    upsert_new_rows(dataset, new_data_df)
+    final_df = dataset.frame()
+    written = 0
+    if dirty_partitions is None or dirty_partitions:
+        written = write_dataset(final_df, STORE_DIR, partitions=dirty_partitions)
+    export_dataset(
+        final_df,
+        xlsx_path=OUTPUT_PATH if "xlsx" in exports else None,
+        csv_path=CSV_OUTPUT_PATH if "csv" in exports else None,
+    )
 
-    if not interrupted and TEMP_OUTPUT_PATH.exists():
-        TEMP_OUTPUT_PATH.unlink()
+    # Günlükteki her şey artık ana kayıtta; segmentler silinebilir
+    if journal is not None:
+        journal.clear()
 
     if new_data_df.empty:
         print(f"\nInfo: Yeni veri bulunamadı, mevcut kayıt güncellendi ({len(final_df)} satır).")
     else:
         print(f"\n✓ Tüm ligler tamamlandı ({len(final_df)} satır).")
-    print(f"✓ Excel kaydı: {str(OUTPUT_PATH)}")
-    print(f"✓ CSV kaydı: {str(CSV_OUTPUT_PATH)}")
+    print(f"✓ Parquet deposu: {str(STORE_DIR)} ({written} bölüm yeniden yazıldı)")
+    if "xlsx" in exports:
+        print(f"✓ Excel kaydı: {str(OUTPUT_PATH)}")
+    if "csv" in exports:
+        print(f"✓ CSV kaydı: {str(CSV_OUTPUT_PATH)}")
 
     if interrupted:
-        print(f"! İşlem tamamlanmadan durduruldu, ara kayıt {str(TEMP_OUTPUT_PATH)} dosyasında saklandı.")
+        print("! İşlem tamamlanmadan durduruldu; aynı komut kalan haftalardan devam eder.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Mackolik arşivinden lig fikstürlerini ve oranlarını topla.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=POOL_WORKERS,
+        help="Paralel işçi sayısı; 1 ise ligler sırayla taranır (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("selenium", "http"),
+        default=FETCH_BACKEND,
+        help="Sayfa getirme yöntemi: Firefox ile tıklama ya da doğrudan HTTP isteği (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="HTTP arka ucunda arsiv.mackolik.com yerine kullanılacak sunucu, ör. http://127.0.0.1:8000 (yerel test sunucusu)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Her ligin #cboSeason listesindeki tüm sezonlarını tara (yarıda kalırsa aynı komut günlükten devam eder)",
+    )
+    parser.add_argument(
+        "--max-seasons",
+        type=int,
+        default=0,
+        help="Backfill modunda lig başına en fazla kaç sezon taranacağı; 0 = hepsi (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(SNAPSHOT_CACHE_DIR),
+        help="Ham HTML önbelleğinin klasörü (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Getirilen sayfaları önbelleğe yazma",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Siteye gitmeden veri setini önbellekteki sayfalardan yeniden oluştur",
+    )
+    parser.add_argument(
+        "--export",
+        nargs="+",
+        choices=("xlsx", "csv"),
+        default=[],
+        help="Parquet deposuna ek olarak birleşik veri setini xlsx/csv olarak da yaz",
+    )
+    return parser.parse_args()
+
+
+def main():
+    global interrupted, snapshot_cache, journal, dirty_partitions
+    args = parse_args()
+
+    existing_df = load_existing_dataset(STORE_DIR)
+    if existing_df.empty and OUTPUT_PATH.exists():
+        # İlk çalışma: eski xlsx kaydı bir kez Parquet deposuna taşınır
+        print(f"Parquet deposu boş, mevcut kayıt taşınıyor: {str(OUTPUT_PATH)}")
+        existing_df = load_existing_dataset(OUTPUT_PATH)
+        dirty_partitions = None
+    dataset.upsert(existing_df)
+    journal = ScrapeJournal(JOURNAL_DIR, EXPECTED_COLUMNS)
+    journal_rows = journal.load_rows()
+    if journal_rows:
+        # Önceki çalışma sıkıştırılmadan kesildi; commit edilen son haftadan devam et
+        print(f"Yarım kalan çalışmadan devam ediliyor: günlükte {len(journal.committed())} hafta ({len(journal_rows)} satır)")
+        journal_df = pd.DataFrame(journal_rows, columns=EXPECTED_COLUMNS)
+        upsert_new_rows(dataset, journal_df)
+        for league_name, season in journal_df[["Lig", "Season"]].drop_duplicates().itertuples(index=False):
+            mark_dirty(league_name, normalize_season_label(season))
+    if not args.no_cache or args.replay:
+        snapshot_cache = SnapshotCache(args.cache_dir)
+
+    if args.replay:
+        replay_from_cache(snapshot_cache)
+        write_final_output(args.export)
+        return
+
+    league_items = list(LEAGUE_URLS.items())
+    scheduler = ScrapeScheduler(league_items, backfill=args.backfill, max_seasons=args.max_seasons)
+    workers = max(1, args.workers if args.backfill else min(args.workers, len(league_items)))
+    if args.backfill:
+        print(f"Backfill modu: tüm sezonlar, en fazla {workers} eşzamanlı görev")
+
+    try:
+        if workers > 1:
+            print(f"Havuz modu: {workers} işçi ({args.backend}), {len(league_items)} lig")
+            run_pool(scheduler, workers, args.backend, args.base_url)
+        else:
+            run_sequential(scheduler, args.backend, args.base_url)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n! İşlem kullanıcı tarafından durduruldu, tamamlanan haftalar günlükte kayıtlı.")
+    except Exception as exc:
+        interrupted = True
+        print(f"\n! Beklenmeyen bir hata oluştu: {exc}")
+
+    print_wait_stats()
+    write_final_output(args.export)
+
+    if not HEADLESS and not interrupted:
+        input("Enter'a basınca kapatılacak...")
+
 
-if not HEADLESS and not interrupted:
-    input("Enter'a basınca kapatılacak...")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Sezon, hafta ve tarih etiketlerinin normalizasyonu.
+
+Kurallar tarayıcının sayfa başına kullandığı tekil fonksiyonlardır
+(normalize_season_label, parse_week_number, extract_week_number_only,
+extract_year_from_week, week_date_range); sütun olarak işlenenlerin bütün sütunu
+pandas str erişimcileriyle tek geçişte işleyen vektörel karşılıkları da vardır
+(normalize_seasons, week_numbers_only, add_year_to_dates). main.py, fetchers.py,
+fixture_parser.py ve _old/convert_old_data.py aynı kuralları buradan kullanır.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+SEASON_PATTERN = r"^(\d{4})(?:[\-/]|\s+)(\d{2}|\d{4})$"
+WEEK_RANGE_PATTERN = r"\((\d{1,2})\.(\d{2})\.(\d{4})\s*-\s*(\d{1,2})\.(\d{2})\.(\d{4})\)"
+DAY_MONTH_PATTERN = r"^(\d{2})/(\d{2})"
+DATE_FORMAT = "%d/%m/%Y"
+
+_SEASON_RE = re.compile(SEASON_PATTERN)
+_WEEK_RANGE_RE = re.compile(WEEK_RANGE_PATTERN)
+_DAY_MONTH_RE = re.compile(DAY_MONTH_PATTERN)
+_NUMBER_RE = re.compile(r"(\d+)")
+
+
+# ----------------------------- #
+# TEKİL DEĞERLER
+# ----------------------------- #
+
+def normalize_season_label(raw_value):
+    """Return season labels in canonical 'YYYY/YYYY' form."""
+    if not raw_value:
+        return ""
+
+    label = str(raw_value).strip()
+    match = _SEASON_RE.match(label)
+    if not match:
+        return label.replace("-", "/")
+
+    start_year = int(match.group(1))
+    end_str = match.group(2)
+    if len(end_str) == 2:
+        end_year = (start_year // 100) * 100 + int(end_str)
+        if end_year <= start_year:
+            end_year += 100
+    else:
+        end_year = int(end_str)
+    return f"{start_year}/{end_year}"
+
+
+def parse_week_number(week_name):
+    """Extract numeric portion from a week label; fall back to -1 if absent."""
+    if not week_name:
+        return -1
+    match = _NUMBER_RE.search(str(week_name))
+    return int(match.group(1)) if match else -1
+
+
+def extract_week_number_only(week_name):
+    """
+    Extract just the week number from week_name.
+    Format: '1 (5.08.2022 - 7.08.2022)' -> '1'
+    Returns the week number as a string, or the original week_name if no number found.
+    """
+    if not week_name:
+        return week_name
+    match = _NUMBER_RE.search(str(week_name))
+    return match.group(1) if match else week_name
+
+
+def week_date_range(week_name):
+    """
+    Hafta etiketindeki tarih aralığı: '1 (5.08.2022 - 7.08.2022)' -> (başlangıç, bitiş)
+    pd.Timestamp çifti; etikette aralık yoksa None.
+    """
+    range_match = _WEEK_RANGE_RE.search(str(week_name or ""))
+    if not range_match:
+        return None
+    start_day, start_month, start_year, end_day, end_month, end_year = (int(part) for part in range_match.groups())
+    return pd.Timestamp(start_year, start_month, start_day), pd.Timestamp(end_year, end_month, end_day)
+
+
+def _pick_year(month, start_month, start_year, end_month, end_year):
+    if month == start_month:
+        return start_year
+    if month == end_month:
+        return end_year
+    # Ay iki uçla da eşleşmiyorsa: yıl dönümüne yayılan haftada aralık başına göre seç
+    if start_year != end_year:
+        return start_year if int(month) == 12 or int(month) >= int(start_month) else end_year
+    return start_year
+
+
+def extract_year_from_week(week_name, date_str):
+    """
+    Extract the year from week_name (format: '1 (5.08.2022 - 7.08.2022)')
+    and add it to date_str (format: '05/08').
+    Handles cases where a week spans two different years.
+    Returns date in format 'DD/MM/YYYY' or original date_str if parsing fails.
+    """
+    if not week_name or not date_str:
+        return date_str
+
+    range_match = _WEEK_RANGE_RE.search(str(week_name))
+    date_match = _DAY_MONTH_RE.match(str(date_str))
+    if not range_match or not date_match:
+        return date_str
+
+    _, start_month, start_year, _, end_month, end_year = range_match.groups()
+    day, month = date_match.groups()
+    return f"{day}/{month}/{_pick_year(month, start_month, start_year, end_month, end_year)}"
+
+
+# ----------------------------- #
+# VEKTÖREL SÜTUNLAR
+# ----------------------------- #
+
+def _as_text(series):
+    return pd.Series(series).astype("string")
+
+
+def _per_unique(series, transform):
+    """
+    transform'u yalnızca tekil değerler üzerinde çalıştırıp sonucu satırlara geri dağıt.
+    Sezon/hafta/tarih etiketleri çok tekrar ettiği için regex ve metin maliyeti satır
+    sayısından bağımsızlaşır; satır başına kalan iş tek bir numpy take'tir.
+    """
+    series = pd.Series(series)
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    values = pd.Series(transform(pd.Series(uniques, dtype=object))).to_numpy()
+    return pd.Series(values[codes], index=series.index)
+
+
+def _normalize_unique_seasons(labels):
+    labels = _as_text(labels).fillna("").str.strip()
+    parts = labels.str.extract(SEASON_PATTERN)
+    matched = parts[0].notna()
+
+    start = pd.to_numeric(parts[0], errors="coerce")
+    end = pd.to_numeric(parts[1], errors="coerce")
+    short = parts[1].str.len() == 2
+    expanded = (start // 100) * 100 + end
+    expanded = expanded.where(expanded > start, expanded + 100)
+    end = end.where(~short, expanded)
+
+    result = labels.str.replace("-", "/", regex=False)
+    canonical = start.astype("Int64").astype("string") + "/" + end.astype("Int64").astype("string")
+    return result.where(~matched, canonical).astype(object)
+
+
+def normalize_seasons(series):
+    """normalize_season_label'in sütun hâli; boş/NA değerler '' olur."""
+    return _per_unique(series, _normalize_unique_seasons)
+
+
+def week_numbers_only(series):
+    """extract_week_number_only'nin sütun hâli; sayı yoksa değer olduğu gibi kalır."""
+    def transform(labels):
+        numbers = _as_text(labels).str.extract(r"(\d+)", expand=False)
+        return numbers.astype(object).where(numbers.notna(), labels)
+
+    return _per_unique(series, transform)
+
+
+def _add_year_to_unique_pairs(week_names, dates):
+    ranges = _as_text(week_names).str.extract(WEEK_RANGE_PATTERN)
+    day_month = _as_text(dates).str.extract(DAY_MONTH_PATTERN)
+    start_month, start_year, end_month, end_year = ranges[1], ranges[2], ranges[4], ranges[5]
+    day, month = day_month[0], day_month[1]
+
+    month_int = pd.to_numeric(month, errors="coerce")
+    start_month_int = pd.to_numeric(start_month, errors="coerce")
+    spans_years = start_year != end_year
+    year = np.select(
+        [
+            (month == start_month).fillna(False).to_numpy(bool),
+            (month == end_month).fillna(False).to_numpy(bool),
+            (spans_years & ((month_int == 12) | (month_int >= start_month_int))).fillna(False).to_numpy(bool),
+            spans_years.fillna(False).to_numpy(bool),
+        ],
+        [start_year, end_year, start_year, end_year],
+        default=start_year,
+    )
+
+    resolved = ranges[0].notna() & day.notna()
+    with_year = day + "/" + month + "/" + pd.Series(year, index=dates.index, dtype="string")
+    return with_year.astype(object).where(resolved, dates)
+
+
+def add_year_to_dates(week_names, dates):
+    """
+    extract_year_from_week'in sütun hâli: 'DD/MM' tarihlerine hafta aralığından yıl ekler.
+    Hafta aralığı ya da tarih çözümlenemezse özgün değer korunur. Hesap yalnızca
+    tekil (hafta, tarih) çiftleri üzerinde yapılır.
+    """
+    dates = pd.Series(dates)
+    week_codes, week_uniques = pd.factorize(pd.Series(week_names), use_na_sentinel=False)
+    date_codes, date_uniques = pd.factorize(dates, use_na_sentinel=False)
+    pair_codes, pairs = pd.factorize(week_codes.astype("int64") * len(date_uniques) + date_codes)
+
+    pair_weeks = pd.Series(np.asarray(week_uniques, dtype=object)[pairs // len(date_uniques)], dtype=object)
+    pair_dates = pd.Series(np.asarray(date_uniques, dtype=object)[pairs % len(date_uniques)], dtype=object)
+    values = _add_year_to_unique_pairs(pair_weeks, pair_dates).to_numpy()
+    return pd.Series(values[pair_codes], index=dates.index)
+
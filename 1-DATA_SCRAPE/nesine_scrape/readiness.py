@@ -0,0 +1,105 @@
+"""
+Sabit time.sleep beklemeleri yerine sayfanın gerçekten hazır olduğunu algılayan koşullar.
+
+Koşullar WebDriverWait.until ile kullanılır. fixture_changed, #dvFixtureInner
+içeriğinin parmak izini (innerHTML özeti) tıklamadan önceki hâliyle
+karşılaştırır ve içerik değiştikten sonra bir yoklama boyunca sabit kalınca
+hazır sayar. WaitStats her beklemenin süresini ve yerini aldığı sabit
+beklemeyi kaydeder; böylece sayfa başına kazanılan süre raporlanabilir.
+"""
+import hashlib
+import time
+
+_INNER_HTML_SCRIPT = (
+    "var el = document.querySelector(arguments[0]);"
+    "return el ? el.innerHTML : null;"
+)
+
+
+def page_fingerprint(driver, selector):
+    """Seçicinin innerHTML'inin kısa özetini döndür; eleman yoksa None."""
+    html = driver.execute_script(_INNER_HTML_SCRIPT, selector)
+    if not html:
+        return None
+    return hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class options_loaded:
+    """<select> en az bir dolu seçenek içerdiğinde seçenek metinlerini döndürür."""
+
+    _SCRIPT = (
+        "var el = document.querySelector(arguments[0]);"
+        "if (!el) { return null; }"
+        "return Array.prototype.map.call(el.options, function (o) { return o.text.trim(); });"
+    )
+
+    def __init__(self, selector):
+        self.selector = selector
+
+    def __call__(self, driver):
+        texts = driver.execute_script(self._SCRIPT, self.selector)
+        if texts and any(texts):
+            return texts
+        return False
+
+
+class fixture_changed:
+    """İçerik önceki parmak izinden farklılaşıp bir yoklama boyunca sabit kalınca True döner."""
+
+    def __init__(self, selector, previous):
+        self.selector = selector
+        self.previous = previous
+        self._candidate = None
+
+    def __call__(self, driver):
+        current = page_fingerprint(driver, self.selector)
+        if current is None or current == self.previous:
+            self._candidate = None
+            return False
+        if current != self._candidate:
+            # Değişiklik yeni başladı; DOM yerine oturana kadar bir yoklama daha bekle
+            self._candidate = current
+            return False
+        return True
+
+
+class WaitStats:
+    """Etiket başına bekleme sayısı, toplam/maksimum süre ve kaldırılan sabit bekleme."""
+
+    def __init__(self):
+        self._records = {}
+
+    def record(self, label, seconds, replaced_sleep=0.0):
+        count, total, worst, replaced = self._records.get(label, (0, 0.0, 0.0, 0.0))
+        self._records[label] = (count + 1, total + seconds, max(worst, seconds), replaced + replaced_sleep)
+
+    def merge(self, other):
+        for label, (count, total, worst, replaced) in other._records.items():
+            own = self._records.get(label, (0, 0.0, 0.0, 0.0))
+            self._records[label] = (own[0] + count, own[1] + total, max(own[2], worst), own[3] + replaced)
+
+    def timed(self, label, wait, condition, replaced_sleep=0.0):
+        """wait.until(condition) çağrısını süresiyle birlikte kaydet."""
+        start = time.perf_counter()
+        try:
+            return wait.until(condition)
+        finally:
+            self.record(label, time.perf_counter() - start, replaced_sleep)
+
+    def __bool__(self):
+        return bool(self._records)
+
+    def summary_lines(self):
+        """
+        Kazanç, kaldırılan sabit beklemeden gerçek bekleme süresi düşülerek hesaplanır.
+        Eski akış sabit beklemeden önce ayrıca presence beklemesi de yaptığı için bu bir alt sınırdır.
+        """
+        lines = []
+        for label, (count, total, worst, replaced) in sorted(self._records.items()):
+            average = total / count if count else 0.0
+            saved = (replaced - total) / count if count else 0.0
+            line = f"{label:<14} {count:>5} bekleme | ort. {average:.2f}s | maks. {worst:.2f}s"
+            if replaced:
+                line += f" | sayfa başına kazanç ≥ {saved:+.2f}s"
+            lines.append(line)
+        return lines
@@ -0,0 +1,105 @@
+"""
+Taranan haftalar için yalnızca sona eklenen, çökmeye dayanıklı günlük.
+
+Yapı:
+    <journal_dir>/segments/<sıra>.jsonl   -> bir haftanın satırları (satır başına bir JSON nesnesi)
+    <journal_dir>/manifest.jsonl          -> işlenmiş (commit edilmiş) segmentlerin listesi
+
+Her hafta önce kendi segment dosyasına yazılır (geçici dosya + fsync + os.replace),
+ardından manifest'e tek satır eklenir. Manifest satırı commit noktasıdır:
+manifest'te olmayan ya da yarım yazılmış segmentler yok sayılır. Böylece her
+kontrol noktası yalnızca o haftanın satırları kadar iş yapar ve çalışma
+kesilirse son commit edilen haftadan devam edilir. Çalışma sonunda segmentler
+ana veri setine sıkıştırılıp clear() ile silinir.
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+
+class ScrapeJournal:
+    def __init__(self, journal_dir, columns):
+        self.journal_dir = os.fspath(journal_dir)
+        self.segments_dir = os.path.join(self.journal_dir, "segments")
+        self.manifest_path = os.path.join(self.journal_dir, "manifest.jsonl")
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self._next_segment = None
+
+    def _read_manifest(self):
+        entries = []
+        if not os.path.exists(self.manifest_path):
+            return entries
+        with open(self.manifest_path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Commit sırasında kesilen son satır
+                    continue
+        return entries
+
+    def append(self, league, season, week, rows):
+        """Bir haftanın satırlarını yeni bir segment olarak yaz ve manifest'e commit et."""
+        with self._lock:
+            if self._next_segment is None:
+                self._next_segment = max((entry["segment"] for entry in self._read_manifest()), default=0) + 1
+            segment = self._next_segment
+            self._next_segment += 1
+
+            os.makedirs(self.segments_dir, exist_ok=True)
+            segment_path = os.path.join(self.segments_dir, f"{segment:08d}.jsonl")
+            tmp_path = f"{segment_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                for row in rows:
+                    handle.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, segment_path)
+
+            entry = {
+                "segment": segment,
+                "league": league,
+                "season": season,
+                "week": week,
+                "rows": len(rows),
+                "committed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            with open(self.manifest_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        return segment
+
+    def committed(self):
+        """Manifest'teki ve segment dosyası diskte olan kayıtlar, commit sırasıyla."""
+        with self._lock:
+            entries = self._read_manifest()
+        return [
+            entry for entry in entries
+            if os.path.exists(os.path.join(self.segments_dir, f"{entry['segment']:08d}.jsonl"))
+        ]
+
+    def load_rows(self):
+        """Commit edilmiş tüm segmentlerin satırlarını, columns sırasında liste olarak döndür."""
+        rows = []
+        for entry in self.committed():
+            segment_path = os.path.join(self.segments_dir, f"{entry['segment']:08d}.jsonl")
+            with open(segment_path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        record = json.loads(line)
+                        rows.append([record.get(column) for column in self.columns])
+        return rows
+
+    def clear(self):
+        """Sıkıştırma tamamlandıktan sonra günlüğü sil."""
+        with self._lock:
+            if os.path.isdir(self.journal_dir):
+                shutil.rmtree(self.journal_dir)
+            self._next_segment = None
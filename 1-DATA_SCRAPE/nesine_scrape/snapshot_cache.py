@@ -0,0 +1,100 @@
+"""
+Getirilen fikstür tablolarının ham HTML'ini diskte saklayan içerik-adresli önbellek.
+
+Yapı:
+    <cache_dir>/objects/<ilk 2 hane>/<sha256>.html.gz   -> sıkıştırılmış HTML (aynı içerik bir kez yazılır)
+    <cache_dir>/index.jsonl                             -> (lig, sezon, hafta) -> sha256 kayıtları
+
+index.jsonl yalnızca sona eklenir; aynı anahtar için son satır geçerlidir.
+Böylece "replay" modu tarayıcı açmadan tüm geçmişi önbellekten yeniden ayrıştırabilir.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class SnapshotCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = os.fspath(cache_dir)
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.index_path = os.path.join(self.cache_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Yarım yazılmış son satır (ör. çökme) atlanır
+                        continue
+                    self._index[(entry["league"], entry["season"], entry["week"])] = entry
+        return self._index
+
+    def put(self, league, season, week, html):
+        """HTML'i sakla ve (lig, sezon, hafta) anahtarını içeriğin özetine bağla."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp{threading.get_ident()}"
+                with gzip.open(tmp_path, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_path, path)
+
+            index = self._load_index()
+            key = (league, season, week)
+            if index.get(key, {}).get("sha256") == digest:
+                return digest
+
+            entry = {
+                "league": league,
+                "season": season,
+                "week": week,
+                "sha256": digest,
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            index[key] = entry
+        return digest
+
+    def get(self, league, season, week):
+        """Anahtar için saklanan HTML'i döndür; yoksa None."""
+        with self._lock:
+            entry = self._load_index().get((league, season, week))
+        if entry is None:
+            return None
+        return self.read_object(entry["sha256"])
+
+    def read_object(self, digest):
+        with gzip.open(self._object_path(digest), "rb") as handle:
+            return handle.read().decode("utf-8")
+
+    def entries(self):
+        """Her anahtarın en güncel kaydı: (lig, sezon, hafta, sha256) listesi."""
+        with self._lock:
+            index = dict(self._load_index())
+        return [(league, season, week, entry["sha256"]) for (league, season, week), entry in index.items()]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load_index())
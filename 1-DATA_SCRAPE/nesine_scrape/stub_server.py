@@ -0,0 +1,70 @@
+"""
+Kaydedilmiş sayfaları arsiv.mackolik.com gibi sunan yerel test sunucusu.
+
+HTTP arka ucunu canlı siteye gitmeden denemek için:
+    python stub_server.py sayfalar/ --port 8000
+    python main.py --backend http --base-url http://127.0.0.1:8000
+
+Beklenen dosya adları (sayfalar/ klasöründe):
+    standings_<sId>.html          -> /Standings/Default.aspx?sId=<sId>
+    fixture_<sId>.html            -> fikstür uç noktası, hafta seçilmemiş (#cboWeek listesi)
+    fixture_<sId>_<hafta>.html    -> fikstür uç noktası, belirli hafta
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+def page_name_for(path, query):
+    params = {key: values[0] for key, values in parse_qs(query, keep_blank_values=True).items()}
+    if path.lower().startswith("/standings/"):
+        return f"standings_{params.get('sId', '')}.html"
+    if "fixture" in path.lower():
+        week = params.get("week", "")
+        return f"fixture_{params.get('id', '')}_{week}.html" if week else f"fixture_{params.get('id', '')}.html"
+    return None
+
+
+def make_handler(page_dir):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive bağlantıları da denensin
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            name = page_name_for(parts.path, parts.query)
+            page_path = page_dir / name if name else None
+            if page_path is None or not page_path.exists():
+                self.send_error(404, f"No saved page: {name}")
+                return
+            body = page_path.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydedilmiş fikstür sayfalarını sunan yerel test sunucusu.")
+    parser.add_argument("page_dir", help="Kaydedilmiş HTML sayfalarının bulunduğu klasör")
+    parser.add_argument("--port", type=int, default=8000, help="Dinlenecek port (default: %(default)s)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(Path(args.page_dir)))
+    print(f"Test sunucusu: http://127.0.0.1:{args.port} ({args.page_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,21 @@ import numpy as np
 import pickle
 import json
 import os
+import sys
 from datetime import datetime
 
+# Repository root, for the shared betting package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')))
+from betting.features import match_features
+
+# predict_from_odds form dict keys -> training column names (last 5 matches)
+FORM_COLUMNS = {
+    'avg_goals_scored': 'Avg_Goals_Scored_Last5',
+    'avg_goals_conceded': 'Avg_Goals_Conceded_Last5',
+    'form_points': 'Form_Points_Last5',
+    'win_ratio': 'Win_Ratio_Last5',
+}
+
 class MatchPredictor:
     def __init__(self, model_dir='models'):
         """Initialize predictor with latest model"""
@@ -141,82 +154,26 @@ class MatchPredictor:
     def _create_feature_dict(self, home_odds, draw_odds, away_odds,
                             under_2_5, over_2_5,
                             home_form, away_form):
-        """Create feature dictionary from inputs"""
-        data = {}
-        
-        # Basic odds
-        data['HomeOdds'] = home_odds
-        data['DrawOdds'] = draw_odds
-        data['AwayOdds'] = away_odds
-        
-        # Calculate implied probabilities
-        data['Prob_Home'] = 1 / home_odds if home_odds > 0 else 0
-        data['Prob_Draw'] = 1 / draw_odds if draw_odds > 0 else 0
-        data['Prob_Away'] = 1 / away_odds if away_odds > 0 else 0
-        
-        # Calculate margin (bookmaker overround)
-        total_prob = data['Prob_Home'] + data['Prob_Draw'] + data['Prob_Away']
-        data['Margin'] = total_prob - 1
-        
-        # True probabilities (removing margin)
-        if total_prob > 0:
-            data['True_Prob_Home'] = data['Prob_Home'] / total_prob
-            data['True_Prob_Draw'] = data['Prob_Draw'] / total_prob
-            data['True_Prob_Away'] = data['Prob_Away'] / total_prob
-        
-        # Entropy (uncertainty measure)
-        probs = [data['True_Prob_Home'], data['True_Prob_Draw'], data['True_Prob_Away']]
-        data['Entropy'] = -sum(p * np.log(p) if p > 0 else 0 for p in probs)
-        
-        # Favorite/Underdog analysis
-        data['Favorite_Odds'] = min(home_odds, draw_odds, away_odds)
-        data['Underdog_Odds'] = max(home_odds, draw_odds, away_odds)
-        data['Mismatch_Ratio'] = data['Underdog_Odds'] / data['Favorite_Odds'] if data['Favorite_Odds'] > 0 else 0
-        data['Home_Is_Favorite'] = 1 if home_odds == data['Favorite_Odds'] else 0
-        
-        # Over/Under 2.5 goals
-        if under_2_5 is not None and over_2_5 is not None:
-            data['Under2.5'] = under_2_5
-            data['Over2.5'] = over_2_5
-            data['Prob_Under2.5'] = 1 / under_2_5 if under_2_5 > 0 else 0
-            data['Prob_Over2.5'] = 1 / over_2_5 if over_2_5 > 0 else 0
-            total_ou = data['Prob_Under2.5'] + data['Prob_Over2.5']
-            data['Margin_OU2.5'] = total_ou - 1
-            
-            # Expected goals from market
-            true_prob_over = data['Prob_Over2.5'] / total_ou if total_ou > 0 else 0.5
-            data['Market_Expected_Goals'] = 2.5 + (true_prob_over - 0.5) * 2  # Rough estimate
-        
-        # Double chance odds (if not provided, estimate them)
-        data['HomeDrawOdds'] = np.nan
-        data['HomeAwayOdds'] = np.nan
-        data['AwayDrawOdds'] = np.nan
-        
-        # Team form features
-        if home_form:
-            data['Home_Avg_Goals_Scored_Last5'] = home_form.get('avg_goals_scored', np.nan)
-            data['Home_Avg_Goals_Conceded_Last5'] = home_form.get('avg_goals_conceded', np.nan)
-            data['Home_Form_Points_Last5'] = home_form.get('form_points', np.nan)
-            data['Home_Win_Ratio_Last5'] = home_form.get('win_ratio', np.nan)
-        
-        if away_form:
-            data['Away_Avg_Goals_Scored_Last5'] = away_form.get('avg_goals_scored', np.nan)
-            data['Away_Avg_Goals_Conceded_Last5'] = away_form.get('avg_goals_conceded', np.nan)
-            data['Away_Form_Points_Last5'] = away_form.get('form_points', np.nan)
-            data['Away_Win_Ratio_Last5'] = away_form.get('win_ratio', np.nan)
-        
-        # Form differences
-        if home_form and away_form:
-            home_gd = home_form.get('avg_goals_scored', 0) - home_form.get('avg_goals_conceded', 0)
-            away_gd = away_form.get('avg_goals_scored', 0) - away_form.get('avg_goals_conceded', 0)
-            data['Goal_Diff_Form'] = home_gd - away_gd
-            data['Points_Diff_Form'] = home_form.get('form_points', 0) - away_form.get('form_points', 0)
+        """
+        Create feature dictionary from inputs.
+        Features come from the same betting.features functions that built the
+        training data; anything not derivable from the inputs is left out (NaN).
+        """
+        match = {
+            'HomeOdds': home_odds,
+            'DrawOdds': draw_odds,
+            'AwayOdds': away_odds,
+            'Under2.5': under_2_5 if under_2_5 is not None else np.nan,
+            'Over2.5': over_2_5 if over_2_5 is not None else np.nan,
+        }
         
-        # Days since last match (if not provided, use default)
-        data['Home_Days_Since_Last'] = np.nan
-        data['Away_Days_Since_Last'] = np.nan
+        # Team form features supplied by the caller
+        for prefix, form in (('Home', home_form), ('Away', away_form)):
+            if form:
+                for key, column in FORM_COLUMNS.items():
+                    match[f'{prefix}_{column}'] = form.get(key, np.nan)
         
-        return data
+        return match_features(match)
     
     def _get_betting_recommendation(self, result):
         """Generate betting recommendation based on prediction and odds"""
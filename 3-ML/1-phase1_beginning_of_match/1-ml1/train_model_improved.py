@@ -12,10 +12,17 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, f1_score
 import pickle
 import json
+import os
+import sys
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+# Repository root, for the shared betting package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')))
+from betting.features import load_feature_matrix
+from betting.walk_forward import WalkForwardPlan
+
 # ============================================================
 # MODEL TRAINING CONFIGURATION
 # ============================================================
@@ -26,6 +33,16 @@ ENABLE_GRADIENT_BOOSTING = False  # Disabled for now
 # Feature Engineering Configuration
 TREAT_ODDS_AS_CATEGORICAL = True  # Each unique odds value = separate category
 
+# Evaluation: shuffled stratified split, or expanding-window walk-forward (train up to T, test T+1)
+WALK_FORWARD = False
+WALK_FORWARD_PERIOD = 'Season'  # 'Season', or a pandas period of the match date ('W', 'M')
+WALK_FORWARD_MIN_TRAIN_PERIODS = 1
+TREES_PER_FOLD = 50  # Trees / boosting stages added per fold when warm-starting ensembles
+
+# Load match columns as a compact MatchTable (coded names, int8 goals, float32 odds)
+COMPACT_MATCHES = False
+CODEBOOK_PATH = None  # e.g. 'codebook.json', to keep team/league codes stable across runs
+
 class ImprovedMatchOutcomePredictor:
     def __init__(self, data_path='data_new.csv'):
         """Initialize the predictor"""
@@ -40,11 +57,16 @@ class ImprovedMatchOutcomePredictor:
         self.models = {}
         self.best_model = None
         self.feature_names = None
+        self.plan = None  # WalkForwardPlan in walk-forward mode
+        self._fold_cache = {}  # fold -> imputed (and scaled) train/test matrices
         
     def load_and_prepare_data(self):
         """Load data and prepare for training"""
-        print("Loading data...")
-        self.df = pd.read_csv(self.data_path)
+        if COMPACT_MATCHES:
+            self.df = load_feature_matrix(self.data_path, codebook_path=CODEBOOK_PATH)
+        else:
+            print("Loading data...")
+            self.df = pd.read_csv(self.data_path)
         print(f"Data loaded: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
         
         # Remove rows with missing target
@@ -69,7 +91,8 @@ class ImprovedMatchOutcomePredictor:
             for col in odds_cols_to_categorize:
                 if col in self.df.columns:
                     # Round to 2 decimal places to avoid floating point issues
-                    self.df[f'{col}_rounded'] = self.df[col].round(2)
+                    # (in float64, so float32 odds from a MatchTable give the same categories)
+                    self.df[f'{col}_rounded'] = self.df[col].astype(float).round(2)
                     
                     # Create label encoder for this column
                     le = LabelEncoder()
@@ -257,15 +280,8 @@ class ImprovedMatchOutcomePredictor:
         # Select features
         features = self.select_features()
         
-        # Prepare features (X)
-        X = self.df[features].copy()
-        
-        # Handle missing values
-        X = X.fillna(X.median())
-        
-        # Replace inf values
-        X = X.replace([np.inf, -np.inf], np.nan)
-        X = X.fillna(X.median())
+        # Prepare features (X); inf values count as missing
+        X = self.df[features].replace([np.inf, -np.inf], np.nan)
         
         # Prepare target (y)
         y = self.df['FT_Result'].copy()
@@ -280,6 +296,11 @@ class ImprovedMatchOutcomePredictor:
             X, y, test_size=test_size, random_state=random_state, stratify=y
         )
         
+        # Handle missing values with training-set medians (the test set must not leak into them)
+        medians = self.X_train.median()
+        self.X_train = self.X_train.fillna(medians)
+        self.X_test = self.X_test.fillna(medians)
+        
         print(f"\nTrain set: {self.X_train.shape[0]} samples")
         print(f"Test set: {self.X_test.shape[0]} samples")
         
@@ -289,13 +310,58 @@ class ImprovedMatchOutcomePredictor:
         
         return self
     
-    def train_models(self):
-        """Train multiple models with class balancing"""
-        print("\n" + "="*70)
-        print("TRAINING MODELS")
-        print("="*70)
+    def prepare_walk_forward(self, period=WALK_FORWARD_PERIOD, min_train_periods=WALK_FORWARD_MIN_TRAIN_PERIODS):
+        """Prepare features, target and the walk-forward fold plan"""
+        print("\nPreparing features and target...")
+        
+        self.engineer_features()
+        features = self.select_features()
+        
+        # Missing values are imputed per fold, from that fold's training window only
+        self.df = self.df.reset_index(drop=True)
+        self.X = self.df[features].replace([np.inf, -np.inf], np.nan)
+        self.y = self.df['FT_Result']
         
-        # Define models with class balancing (based on configuration flags)
+        self.plan = WalkForwardPlan(self.df, period=period, min_train_periods=min_train_periods)
+        self._fold_cache = {}
+        print(f"\nWalk-forward plan ({period}, {len(self.plan)} folds):")
+        for line in self.plan.describe():
+            print(f"  {line}")
+        
+        return self
+    
+    def _fold_matrices(self, fold, scaled=False):
+        """
+        Train/test matrices of a fold (fold=None: every row the plan covers, for the
+        final model), imputed with training-window medians. Cached, so every model
+        reuses them.
+        """
+        if fold not in self._fold_cache:
+            if fold is None:
+                train = np.flatnonzero(self.plan.codes >= 0)
+                test = train[:0]
+            else:
+                train, test = self.plan.folds[fold]
+            X_train = self.X.iloc[train]
+            medians = X_train.median()
+            self._fold_cache[fold] = {
+                'X_train': X_train.fillna(medians).astype(np.float32),
+                'X_test': self.X.iloc[test].fillna(medians).astype(np.float32),
+                'y_train': self.y.iloc[train],
+                'y_test': self.y.iloc[test],
+            }
+        matrices = self._fold_cache[fold]
+        if scaled and 'X_train_scaled' not in matrices:
+            scaler = StandardScaler().fit(matrices['X_train'])
+            matrices['scaler'] = scaler
+            matrices['X_train_scaled'] = scaler.transform(matrices['X_train'])
+            matrices['X_test_scaled'] = scaler.transform(matrices['X_test']) if len(matrices['X_test']) else None
+        if scaled:
+            return matrices['X_train_scaled'], matrices['X_test_scaled'], matrices['y_train'], matrices['y_test']
+        return matrices['X_train'], matrices['X_test'], matrices['y_train'], matrices['y_test']
+    
+    def _build_models(self):
+        """Models enabled in the configuration, with class balancing"""
         models_to_train = {}
         
         if ENABLE_LOGISTIC_REGRESSION:
@@ -338,6 +404,15 @@ class ImprovedMatchOutcomePredictor:
         if not models_to_train:
             raise ValueError("No models enabled! Please enable at least one model in configuration.")
         
+        return models_to_train
+    
+    def train_models(self):
+        """Train multiple models with class balancing"""
+        print("\n" + "="*70)
+        print("TRAINING MODELS")
+        print("="*70)
+        
+        models_to_train = self._build_models()
         results = {}
         
         # Use stratified k-fold
@@ -400,6 +475,88 @@ class ImprovedMatchOutcomePredictor:
         
         return results
     
+    def train_walk_forward(self, trees_per_fold=TREES_PER_FOLD):
+        """
+        Walk-forward training: each model is fitted on the fold's training window and
+        scored on the next period. Models are warm-started across folds - ensembles
+        keep their trees/stages and add trees_per_fold fitted on the grown window, the
+        logistic regression starts from the previous coefficients - instead of being
+        refitted from scratch. The best model finally takes one more step on every match.
+        """
+        print("\n" + "="*70)
+        print("WALK-FORWARD TRAINING")
+        print("="*70)
+        
+        models_to_train = self._build_models()
+        results = {}
+        
+        for name, model in models_to_train.items():
+            print(f"\nTraining {name} ({len(self.plan)} folds)...")
+            model.set_params(warm_start=True)
+            scaled = 'Logistic' in name
+            
+            fold_scores, predictions, probabilities, actual = [], [], [], []
+            for fold in range(len(self.plan)):
+                X_train_use, X_test_use, y_train, y_test = self._fold_matrices(fold, scaled=scaled)
+                if fold > 0 and 'n_estimators' in model.get_params():
+                    model.set_params(n_estimators=model.n_estimators + trees_per_fold)
+                model.fit(X_train_use, y_train)
+                
+                y_pred = model.predict(X_test_use)
+                fold_scores.append(f1_score(y_test, y_pred, average='macro'))
+                predictions.append(y_pred)
+                probabilities.append(model.predict_proba(X_test_use))
+                actual.append(y_test)
+                print(f"  {self.plan.test_label(fold)}: F1 Macro {fold_scores[-1]:.4f} "
+                      f"(train {len(y_train)}, test {len(y_test)})")
+            
+            # Out-of-sample predictions of every fold, in fold order
+            y_pred = np.concatenate(predictions)
+            y_test = pd.concat(actual)
+            accuracy = accuracy_score(y_test, y_pred)
+            f1_macro = f1_score(y_test, y_pred, average='macro')
+            f1_weighted = f1_score(y_test, y_pred, average='weighted')
+            
+            results[name] = {
+                'model': model,
+                'accuracy': accuracy,
+                'f1_macro': f1_macro,
+                'f1_weighted': f1_weighted,
+                'cv_mean': np.mean(fold_scores),
+                'cv_std': np.std(fold_scores),
+                'predictions': y_pred,
+                'probabilities': np.concatenate(probabilities)
+            }
+            
+            print(f"  Accuracy:    {accuracy:.4f}")
+            print(f"  F1 Macro:    {f1_macro:.4f}")
+            print(f"  F1 Weighted: {f1_weighted:.4f}")
+            print(f"  Fold F1:     {np.mean(fold_scores):.4f} (+/- {np.std(fold_scores):.4f})")
+            
+            self.models[name] = model
+        
+        best_model_name = max(results, key=lambda x: results[x]['f1_macro'])
+        self.best_model = results[best_model_name]['model']
+        self.best_model_name = best_model_name
+        
+        # Evaluation set for evaluate_best_model: the out-of-sample matches
+        self.X_test = pd.concat([self._fold_matrices(fold)[1] for fold in range(len(self.plan))])
+        self.y_test = pd.concat([self._fold_matrices(fold)[3] for fold in range(len(self.plan))])
+        
+        # Final step on every match the plan covers
+        self.X_train, _, self.y_train, _ = self._fold_matrices(None)
+        self.scaler = StandardScaler().fit(self.X_train)
+        if 'n_estimators' in self.best_model.get_params():
+            self.best_model.set_params(n_estimators=self.best_model.n_estimators + trees_per_fold)
+        X_final = self.scaler.transform(self.X_train) if 'Logistic' in best_model_name else self.X_train
+        self.best_model.fit(X_final, self.y_train)
+        
+        print(f"\n{'='*70}")
+        print(f"BEST MODEL: {best_model_name} (walk-forward F1 Macro: {results[best_model_name]['f1_macro']:.4f})")
+        print(f"{'='*70}")
+        
+        return results
+    
     def evaluate_best_model(self, results):
         """Detailed evaluation of the best model"""
         print("\n" + "="*70)
@@ -487,7 +644,10 @@ class ImprovedMatchOutcomePredictor:
                 'treat_odds_as_categorical': TREAT_ODDS_AS_CATEGORICAL,
                 'logistic_regression_enabled': ENABLE_LOGISTIC_REGRESSION,
                 'random_forest_enabled': ENABLE_RANDOM_FOREST,
-                'gradient_boosting_enabled': ENABLE_GRADIENT_BOOSTING
+                'gradient_boosting_enabled': ENABLE_GRADIENT_BOOSTING,
+                'walk_forward': WALK_FORWARD,
+                'walk_forward_period': WALK_FORWARD_PERIOD if WALK_FORWARD else None,
+                'walk_forward_folds': len(self.plan) if self.plan is not None else None
             },
             'categorical_encoders': {
                 col: {
@@ -527,11 +687,16 @@ def main():
     # Load and prepare data
     predictor.load_and_prepare_data()
     
-    # Prepare train-test split (includes feature engineering)
-    predictor.prepare_train_test_split(test_size=0.2, random_state=42)
-    
-    # Train models
-    results = predictor.train_models()
+    if WALK_FORWARD:
+        # Walk-forward folds (includes feature engineering), warm-started across folds
+        predictor.prepare_walk_forward()
+        results = predictor.train_walk_forward()
+    else:
+        # Prepare train-test split (includes feature engineering)
+        predictor.prepare_train_test_split(test_size=0.2, random_state=42)
+        
+        # Train models
+        results = predictor.train_models()
     
     # Evaluate best model
     predictor.evaluate_best_model(results)
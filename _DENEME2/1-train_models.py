@@ -1,11 +1,32 @@
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import OneHotEncoder
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
-from imblearn.over_sampling import SMOTE
 from tqdm import tqdm
 import joblib
+import numpy as np
+import os
+import tempfile
+import time
+
+# --- Training mode ---
+# 'multi_output': one shared forest over all targets - one fit, one predict call and
+#                 one model file (results/models/_multi_output.pkl)
+# 'per_target':   one class-weighted forest per target, one model file each
+TRAINING_MODE = 'multi_output'
+# Input encoding:
+# 'codes':  one float32 column of category codes per input (5 columns) - trees split
+#           on them directly; Favorite_Odds and Hafta codes follow the numeric order
+# 'onehot': sparse CSR one-hot matrix (one column per category value)
+ENCODING = 'codes'
+# Leaf size of the shared forest: every leaf stores a probability per target, so
+# fully grown trees would make the model file very large
+MULTI_OUTPUT_MIN_SAMPLES_LEAF = 20
+# Per-target mode: targets are trained in TRAINING_WORKERS processes, each forest on
+# THREADS_PER_WORKER threads (workers x threads should not exceed the CPU count)
+THREADS_PER_WORKER = 1
+TRAINING_WORKERS = max(1, (os.cpu_count() or 1) // THREADS_PER_WORKER)
 
 # --- 1. Load Data ---
 df = pd.read_csv('/Users/batumbp/Files/betting/_DENEME2/data/fikstur_feature_matrix_final.csv')
@@ -34,7 +55,11 @@ pd.Series(test_indices).to_csv('/Users/batumbp/Files/betting/_DENEME2/results/te
 X_full_raw = df[input_cols]
 
 # --- 4. Fit Encoder on ALL Data (for deployment) ---
-encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+# Unknown categories become NaN codes / all-zero one-hot rows at prediction time
+if ENCODING == 'codes':
+    encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan, dtype=np.float32)
+else:
+    encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=True, dtype=np.float32)
 encoder.fit(X_full_raw)
 
 # Save the fitted encoder
@@ -49,63 +74,39 @@ X_test_encoded = encoder.transform(X_test_raw)
 # Also prepare full dataset encoding for final models
 X_full_encoded = encoder.transform(X_full_raw)
 
-# --- 5. Loop, Train, and Evaluate Efficiently ---
-model_results = []
-
-for target_col in tqdm(target_cols, desc="Training models for each feature"):
-    # Ensure target is a valid binary column
-    if df[target_col].nunique() != 2:
-        continue
-
-    y_full = df[target_col]
-    y_train = train_df[target_col]
-    y_test = test_df[target_col]
-
-    # Use SMOTE for significant minority classes, otherwise use class_weight
-    min_class_count = y_train.value_counts().min()
-    if min_class_count > 10:
-        smote = SMOTE(random_state=42, k_neighbors=min(min_class_count - 1, 5))
-        X_train_res, y_train_res = smote.fit_resample(X_train_encoded, y_train)
-        eval_model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
-    else:
-        X_train_res, y_train_res = X_train_encoded, y_train
-        eval_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42, n_jobs=-1)
+# --- 5. Train and Evaluate ---
+# Start from empty model and prediction directories, so predict_new_matches.py and the
+# analysis never pick up files of an earlier run (another mode or a dropped target)
+for output_dir, extension in (('/Users/batumbp/Files/betting/_DENEME2/results/models', '.pkl'),
+                              ('/Users/batumbp/Files/betting/_DENEME2/results/predictions', '.csv')):
+    os.makedirs(output_dir, exist_ok=True)
+    for file_name in os.listdir(output_dir):
+        if file_name.endswith(extension):
+            os.remove(os.path.join(output_dir, file_name))
 
-    # Train evaluation model
-    eval_model.fit(X_train_res, y_train_res)
-    
-    # Train final model on ALL data (for predictions on new matches)
-    min_class_count_full = y_full.value_counts().min()
-    if min_class_count_full > 10:
-        smote_full = SMOTE(random_state=42, k_neighbors=min(min_class_count_full - 1, 5))
-        X_full_res, y_full_res = smote_full.fit_resample(X_full_encoded, y_full)
-        final_model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
-    else:
-        X_full_res, y_full_res = X_full_encoded, y_full
-        final_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42, n_jobs=-1)
-    
-    final_model.fit(X_full_res, y_full_res)
-    
-    # Save the FINAL model (for making predictions on new matches)
-    joblib.dump(final_model, f'/Users/batumbp/Files/betting/_DENEME2/results/models/{target_col.replace("/", "_")}.pkl')
+model_results = []
+binary_targets = [col for col in target_cols if df[col].nunique() == 2]
 
-    # Evaluate on test set using evaluation model
-    y_pred = eval_model.predict(X_test_encoded)
-    y_pred_proba = eval_model.predict_proba(X_test_encoded)[:, 1]
 
+def save_evaluation(target_col, y_test, y_pred, y_pred_proba, train_pos_rate):
+    """Save the evaluation predictions of one target and return its test metrics"""
     # Calculate comprehensive metrics
     accuracy = accuracy_score(y_test, y_pred)
     precision = precision_score(y_test, y_pred, zero_division=0)
     recall = recall_score(y_test, y_pred, zero_division=0)
     f1 = f1_score(y_test, y_pred, zero_division=0)
     auc = roc_auc_score(y_test, y_pred_proba)
-    
-    # Class distribution info
-    train_pos_rate = y_train.mean()
-    test_pos_rate = y_test.mean()
-    
-    # Store results
-    model_results.append({
+
+    # Create a results DataFrame for this feature (evaluation predictions)
+    predictions_df = pd.DataFrame({
+        'true_label': y_test.values,
+        'predicted_proba': y_pred_proba
+    }, index=y_test.index)
+
+    # Save the evaluation predictions
+    predictions_df.to_csv(f'/Users/batumbp/Files/betting/_DENEME2/results/predictions/{target_col.replace("/", "_")}.csv')
+
+    return {
         'Feature': target_col,
         'Accuracy': f"{accuracy:.4f}",
         'Precision': f"{precision:.4f}",
@@ -113,18 +114,119 @@ for target_col in tqdm(target_cols, desc="Training models for each feature"):
         'F1_Score': f"{f1:.4f}",
         'AUC': f"{auc:.4f}",
         'Train_Positive_Rate': f"{train_pos_rate:.4f}",
-        'Test_Positive_Rate': f"{test_pos_rate:.4f}",
+        'Test_Positive_Rate': f"{y_test.mean():.4f}",
         'Test_Samples': len(y_test)
-    })
+    }
 
-    # Create a results DataFrame for this feature (evaluation predictions)
-    predictions_df = pd.DataFrame({
-        'true_label': y_test.values,
-        'predicted_proba': y_pred_proba
-    }, index=y_test.index)
 
-    # Save the evaluation predictions
-    predictions_df.to_csv(f'/Users/batumbp/Files/betting/_DENEME2/results/predictions/{target_col.replace("/", "_")}.csv')
+def positive_proba(model, X):
+    """P(target = 1) for every target of a multi-output forest, one column per target"""
+    probas = model.predict_proba(X)
+    return np.column_stack([
+        proba[:, list(classes).index(1)] if 1 in classes else np.zeros(len(X))
+        for proba, classes in zip(probas, model.classes_)
+    ])
+
+
+def train_target(target_col, matrix_paths, y_full, y_train, y_test):
+    """
+    Train, save and evaluate the models of one target (per-target mode, run in a
+    worker process). Returns the target, its test metrics and its training seconds.
+    """
+    started = time.perf_counter()
+    X_train_encoded = joblib.load(matrix_paths['train'], mmap_mode='r')
+    X_test_encoded = joblib.load(matrix_paths['test'], mmap_mode='r')
+    X_full_encoded = joblib.load(matrix_paths['full'], mmap_mode='r')
+
+    # Class weights balance every target on the shared matrices (no resampled copies)
+    eval_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42,
+                                        n_jobs=THREADS_PER_WORKER)
+
+    # Train evaluation model
+    eval_model.fit(X_train_encoded, y_train)
+
+    # Train final model on ALL data (for predictions on new matches)
+    final_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42,
+                                         n_jobs=THREADS_PER_WORKER)
+    final_model.fit(X_full_encoded, y_full)
+
+    # Save the FINAL model (for making predictions on new matches)
+    joblib.dump(final_model, f'/Users/batumbp/Files/betting/_DENEME2/results/models/{target_col.replace("/", "_")}.pkl')
+
+    # Evaluate on test set using evaluation model
+    y_pred = eval_model.predict(X_test_encoded)
+    y_pred_proba = eval_model.predict_proba(X_test_encoded)[:, 1]
+
+    result = save_evaluation(target_col, y_test, y_pred, y_pred_proba, y_train.mean())
+    return target_col, result, time.perf_counter() - started
+
+
+if TRAINING_MODE == 'multi_output':
+    # One forest fits every target at once: trees split on the encoded inputs, and each
+    # leaf stores the class frequencies of all targets. Class weights cannot balance a
+    # shared fit (each target has its own minority class), so the label of a target is
+    # predicted when its probability exceeds its training positive rate instead.
+    Y_train = train_df[binary_targets].to_numpy(dtype=np.int8)
+    Y_full = df[binary_targets].to_numpy(dtype=np.int8)
+    train_pos_rates = Y_train.mean(axis=0)
+
+    # Train evaluation model and predict every target of the test set in one call
+    print(f"Training one multi-output model for {len(binary_targets)} targets...")
+    eval_model = RandomForestClassifier(n_estimators=100, min_samples_leaf=MULTI_OUTPUT_MIN_SAMPLES_LEAF,
+                                        random_state=42, n_jobs=-1)
+    eval_model.fit(X_train_encoded, Y_train)
+    test_proba = positive_proba(eval_model, X_test_encoded)
+
+    # Train final model on ALL data (for predictions on new matches)
+    final_model = RandomForestClassifier(n_estimators=100, min_samples_leaf=MULTI_OUTPUT_MIN_SAMPLES_LEAF,
+                                         random_state=42, n_jobs=-1)
+    final_model.fit(X_full_encoded, Y_full)
+
+    # Save the FINAL model with its target order (read by predict_new_matches.py)
+    joblib.dump({'model': final_model, 'targets': binary_targets},
+                '/Users/batumbp/Files/betting/_DENEME2/results/models/_multi_output.pkl')
+
+    for position, target_col in enumerate(tqdm(binary_targets, desc="Evaluating each feature")):
+        y_pred_proba = test_proba[:, position]
+        y_pred = (y_pred_proba > train_pos_rates[position]).astype(int)
+        model_results.append(
+            save_evaluation(target_col, test_df[target_col], y_pred, y_pred_proba, train_pos_rates[position])
+        )
+
+else:
+    # Each worker process trains whole targets; the encoded matrices are written once
+    # and memory-mapped read-only by every worker instead of being copied to each task
+    with tempfile.TemporaryDirectory(prefix='train-models-') as matrix_dir:
+        matrix_paths = {}
+        for name, matrix in (('train', X_train_encoded), ('test', X_test_encoded), ('full', X_full_encoded)):
+            matrix_paths[name] = os.path.join(matrix_dir, f'X_{name}.joblib')
+            joblib.dump(matrix, matrix_paths[name])
+
+        print(f"Training {len(binary_targets)} targets on {TRAINING_WORKERS} workers "
+              f"x {THREADS_PER_WORKER} threads...")
+        started = time.perf_counter()
+        target_seconds = {}
+        with joblib.parallel_config(backend='loky', inner_max_num_threads=THREADS_PER_WORKER):
+            jobs = joblib.Parallel(n_jobs=TRAINING_WORKERS, batch_size=1, return_as='generator_unordered')(
+                joblib.delayed(train_target)(
+                    target_col, matrix_paths, df[target_col], train_df[target_col], test_df[target_col]
+                )
+                for target_col in binary_targets
+            )
+            progress = tqdm(jobs, total=len(binary_targets), desc="Training models for each feature")
+            for target_col, result, seconds in progress:
+                model_results.append(result)
+                target_seconds[target_col] = seconds
+                progress.set_postfix_str(f"{target_col}: {seconds:.1f}s")
+
+    # Report results in target order, whatever order the workers finished in
+    order = {target_col: position for position, target_col in enumerate(binary_targets)}
+    model_results.sort(key=lambda result: order[result['Feature']])
+    wall_seconds = time.perf_counter() - started
+    print(f"Trained {len(target_seconds)} targets in {wall_seconds:.1f}s "
+          f"({sum(target_seconds.values()):.1f}s of per-target training)")
+    for target_col, seconds in sorted(target_seconds.items(), key=lambda item: -item[1])[:5]:
+        print(f"  {target_col}: {seconds:.1f}s")
 
 # Save comprehensive model results
 results_df = pd.DataFrame(model_results)
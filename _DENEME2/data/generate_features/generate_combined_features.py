@@ -1,6 +1,12 @@
+import sys
+import time
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from betting.scores import parse_scores
 
 # --- Helper Functions for Binning ---
 def bin_goal_difference(diff_series: pd.Series) -> pd.Series:
@@ -33,12 +39,8 @@ def create_final_feature_matrix(input_filename: str, output_filename: str):
         return
 
     # --- 2. Vectorized Data Parsing and Cleaning ---
-    scores_ft = df['Skor'].str.split('-', expand=True)
-    df['home_ft'] = pd.to_numeric(scores_ft[0], errors='coerce')
-    df['away_ft'] = pd.to_numeric(scores_ft[1], errors='coerce')
-    scores_ht = df['IY_Skor'].str.split('-', expand=True)
-    df['home_ht'] = pd.to_numeric(scores_ht[0], errors='coerce')
-    df['away_ht'] = pd.to_numeric(scores_ht[1], errors='coerce')
+    df['home_ft'], df['away_ft'] = parse_scores(df['Skor'])
+    df['home_ht'], df['away_ht'] = parse_scores(df['IY_Skor'])
 
     original_rows = len(df)
     df.dropna(subset=['home_ft', 'away_ft', 'home_ht', 'away_ht'], inplace=True)
@@ -1,6 +1,12 @@
 import pandas as pd
 import joblib
 import numpy as np
+import os
+
+# Training mode of the saved models (TRAINING_MODE in 1-train_models.py):
+# 'multi_output' loads results/models/_multi_output.pkl, 'per_target' every other model file
+TRAINING_MODE = 'multi_output'
+MULTI_OUTPUT_MODEL_FILE = '_multi_output.pkl'
 
 # Feature to odds column mapping (same as analysis script)
 FEATURE_TO_ODDS_MAPPING = {
@@ -17,13 +23,15 @@ FEATURE_TO_ODDS_MAPPING = {
 }
 
 def predict_match_probabilities(new_match_data, model_dir='/Users/batumbp/Files/betting/_DENEME2/results/models/',
-                               encoder_path='/Users/batumbp/Files/betting/_DENEME2/results/encoder.pkl'):
+                               encoder_path='/Users/batumbp/Files/betting/_DENEME2/results/encoder.pkl',
+                               training_mode=TRAINING_MODE):
     """
     Predict probabilities for new match data using trained models.
     Shows both model predictions and implied probabilities from odds where available.
 
     Parameters:
     new_match_data: DataFrame with match data. Should include odds columns if available.
+    training_mode: 'multi_output' or 'per_target' - only that mode's model files are loaded.
 
     Returns:
     DataFrame with predictions for all features
@@ -42,9 +50,12 @@ def predict_match_probabilities(new_match_data, model_dir='/Users/batumbp/Files/
     # Encode the new data
     X_new_encoded = encoder.transform(X_new)
 
-    # Get list of available models
-    import os
-    model_files = [f for f in os.listdir(model_dir) if f.endswith('.pkl')]
+    # Get the model files of the training mode (never a mix of both modes)
+    if training_mode == 'multi_output':
+        model_files = [MULTI_OUTPUT_MODEL_FILE]
+    else:
+        model_files = sorted(f for f in os.listdir(model_dir)
+                             if f.endswith('.pkl') and f != MULTI_OUTPUT_MODEL_FILE)
 
     # Initialize results DataFrame
     results = new_match_data.copy()
@@ -54,7 +65,9 @@ def predict_match_probabilities(new_match_data, model_dir='/Users/batumbp/Files/
     implied_proba_data = {}
     odds_available_data = {}
 
-    # Predict for each feature
+    # Model probabilities of every feature: a multi-output model (a dict with the
+    # model and its target order) predicts all of its features in one call
+    feature_probas = {}
     for model_file in model_files:
         feature_name = model_file.replace('.pkl', '')
         model_path = os.path.join(model_dir, model_file)
@@ -63,32 +76,40 @@ def predict_match_probabilities(new_match_data, model_dir='/Users/batumbp/Files/
             # Load model
             model = joblib.load(model_path)
 
-            # Get probability for positive class
-            proba = model.predict_proba(X_new_encoded)[:, 1]
-
-            # Store model probability
-            model_proba_data[f'{feature_name}_model_proba'] = proba
-
-            # Add implied probability if odds mapping exists and odds column is available
-            if feature_name in FEATURE_TO_ODDS_MAPPING:
-                odds_col = FEATURE_TO_ODDS_MAPPING[feature_name]
-                if odds_col in new_match_data.columns:
-                    # Calculate implied probability as 1/odds
-                    odds_values = pd.to_numeric(new_match_data[odds_col], errors='coerce')
-                    implied_proba = 1 / odds_values
-                    implied_proba_data[f'{feature_name}_implied_proba'] = implied_proba
-                    odds_available_data[f'{feature_name}_odds_available'] = True
-                else:
-                    implied_proba_data[f'{feature_name}_implied_proba'] = np.nan
-                    odds_available_data[f'{feature_name}_odds_available'] = False
+            if isinstance(model, dict):
+                probas = model['model'].predict_proba(X_new_encoded)
+                for target, proba, classes in zip(model['targets'], probas, model['model'].classes_):
+                    feature_probas[target.replace('/', '_')] = (
+                        proba[:, list(classes).index(1)] if 1 in classes else np.zeros(len(X_new_encoded))
+                    )
             else:
-                implied_proba_data[f'{feature_name}_implied_proba'] = np.nan
-                odds_available_data[f'{feature_name}_odds_available'] = False
+                # Get probability for positive class
+                feature_probas[feature_name] = model.predict_proba(X_new_encoded)[:, 1]
 
         except Exception as e:
             print(f"Error predicting for {feature_name}: {e}")
             continue
 
+    for feature_name, proba in feature_probas.items():
+        # Store model probability
+        model_proba_data[f'{feature_name}_model_proba'] = proba
+
+        # Add implied probability if odds mapping exists and odds column is available
+        if feature_name in FEATURE_TO_ODDS_MAPPING:
+            odds_col = FEATURE_TO_ODDS_MAPPING[feature_name]
+            if odds_col in new_match_data.columns:
+                # Calculate implied probability as 1/odds
+                odds_values = pd.to_numeric(new_match_data[odds_col], errors='coerce')
+                implied_proba = 1 / odds_values
+                implied_proba_data[f'{feature_name}_implied_proba'] = implied_proba
+                odds_available_data[f'{feature_name}_odds_available'] = True
+            else:
+                implied_proba_data[f'{feature_name}_implied_proba'] = np.nan
+                odds_available_data[f'{feature_name}_odds_available'] = False
+        else:
+            implied_proba_data[f'{feature_name}_implied_proba'] = np.nan
+            odds_available_data[f'{feature_name}_odds_available'] = False
+
     # Create DataFrames from collected data and concatenate at once
     if model_proba_data:
         model_proba_df = pd.DataFrame(model_proba_data, index=results.index)
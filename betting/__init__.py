@@ -0,0 +1,9 @@
+"""
+Shared code for the betting pipeline: scraping, data preparation and the models.
+
+The numbered stage folders are scripts rather than packages; they put the repository
+root on sys.path and import from here, e.g.:
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from betting.scores import parse_scores
+"""
@@ -0,0 +1,42 @@
+"""
+Match feature library shared by training and inference.
+
+    from betting.features import load_and_parse_data, build_features, match_features
+
+    df = build_features(load_and_parse_data(path, result_codes=(1, 0, 2)))   # batch / training
+    row = match_features({'HomeOdds': 1.8, 'DrawOdds': 3.5, 'AwayOdds': 4.2})  # one match / inference
+
+Feature groups are registered by name in FEATURES (see registry.py) and run in
+PIPELINE order; both paths call the same functions.
+"""
+from betting.features.registry import (
+    FEATURES,
+    PIPELINE,
+    Feature,
+    apply_features,
+    build_features,
+    match_features,
+    register_feature,
+    single_match_features,
+)
+from betting.features.loading import load_and_parse_data, load_feature_matrix
+from betting.features.market import generate_goal_market_features, generate_odds_features
+from betting.features.form import (
+    build_team_match_table,
+    ewm_form_features,
+    form_windows,
+    generate_form_difference_features,
+    generate_h2h_features,
+    generate_team_form_features,
+    team_form_columns,
+    team_pair_codes,
+)
+from betting.features.context import (
+    generate_advanced_context_features,
+    generate_halftime_features,
+    generate_inplay_enhanced_features,
+    generate_match_context_features,
+)
+from betting.features.ratings import RATING_COLUMNS, RatingEngine, generate_rating_features
+from betting.features.parallel import build_features_parallel, league_shards
+from betting.features.store import match_keys, read_feature_store, refresh_feature_store, select_state_rows
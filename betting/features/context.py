@@ -0,0 +1,155 @@
+"""
+Match context features: rest days, halftime state, in-play indicators and
+market/form context. Goals are nullable Int64 (see betting.scores).
+"""
+import numpy as np
+
+from betting.features.form import build_team_match_table
+from betting.features.registry import register_feature
+
+
+def _flag(mask):
+    """0/1 indicator from a comparison on nullable goals; a missing score counts as False"""
+    return mask.fillna(False).astype(int)
+
+
+@register_feature(
+    'halftime',
+    inputs=[
+        'HTHG', 'HTAG', 'FTHG', 'FTAG', 'Home_Is_Favorite'
+    ],
+    outputs=[
+        'HT_Goal_Diff', 'HT_BTTS', 'Favorite_Winning_HT', 'Comeback_Required',
+        'HT_Score_Encoded'
+    ],
+    single_match=True,
+)
+def generate_halftime_features(df):
+    """Generate features related to halftime state"""
+    print("Generating halftime features...")
+    
+    # Goal difference at halftime
+    df['HT_Goal_Diff'] = df['HTHG'] - df['HTAG']
+    
+    # Both teams to score at halftime
+    df['HT_BTTS'] = _flag((df['HTHG'] > 0) & (df['HTAG'] > 0))
+    
+    # Favorite status at halftime
+    df['Favorite_Winning_HT'] = np.where(
+        df['Home_Is_Favorite'] == 1,
+        _flag(df['HTHG'] > df['HTAG']),
+        _flag(df['HTAG'] > df['HTHG'])
+    )
+    
+    # Comeback required
+    df['Comeback_Required'] = _flag((df['HT_Goal_Diff'] < 0) & (df['FTHG'] > df['FTAG'])) | \
+                              _flag((df['HT_Goal_Diff'] > 0) & (df['FTHG'] < df['FTAG']))
+    
+    # Halftime score encoded (for embedding)
+    df['HT_Score_Encoded'] = df['HTHG'].astype(str) + '-' + df['HTAG'].astype(str)
+    
+    return df
+
+
+@register_feature(
+    'match_context',
+    inputs=[
+        'League', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'
+    ],
+    outputs=[
+        'Home_Days_Since_Last', 'Away_Days_Since_Last', 'Total_Goals', 'BTTS',
+        'Home_Clean_Sheet', 'Away_Clean_Sheet'
+    ],
+)
+def generate_match_context_features(df, across_competitions=False):
+    """
+    Generate contextual match features.
+    Rest days count from the team's previous match at either venue - within the same
+    league by default, or in any competition when across_competitions=True.
+    """
+    print("Generating match context features...")
+    
+    # Days since last match for each team
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    
+    long = build_team_match_table(df, by_league=not across_competitions)
+    dates = long['Date'].to_numpy()
+    rest_days = np.full(len(long), np.nan)
+    has_previous = long['Position'].to_numpy() > 0
+    previous = np.flatnonzero(has_previous) - 1
+    rest_days[has_previous] = (dates[has_previous] - dates[previous]) / np.timedelta64(1, 'D')
+    
+    match = long['Match'].to_numpy()
+    is_home = long['Is_Home'].to_numpy()
+    home_rest = np.full(len(df), np.nan)
+    away_rest = np.full(len(df), np.nan)
+    home_rest[match[is_home]] = rest_days[is_home]
+    away_rest[match[~is_home]] = rest_days[~is_home]
+    df['Home_Days_Since_Last'] = home_rest
+    df['Away_Days_Since_Last'] = away_rest
+    
+    # Total goals in match
+    df['Total_Goals'] = df['FTHG'] + df['FTAG']
+    
+    # Both teams to score
+    df['BTTS'] = _flag((df['FTHG'] > 0) & (df['FTAG'] > 0))
+    
+    # Clean sheets
+    df['Home_Clean_Sheet'] = _flag(df['FTAG'] == 0)
+    df['Away_Clean_Sheet'] = _flag(df['FTHG'] == 0)
+    
+    return df
+
+
+@register_feature(
+    'advanced_context',
+    inputs=[
+        'Home_Days_Since_Last', 'Away_Days_Since_Last', 'HomeOdds', 'DrawOdds',
+        'AwayOdds'
+    ],
+    outputs=[
+        'Days_Since_Last_Match', 'Odds_Disagreement'
+    ],
+)
+def generate_advanced_context_features(df):
+    """Generate advanced contextual features"""
+    print("Generating advanced context features...")
+    
+    # Days since last match (average of home and away)
+    df['Days_Since_Last_Match'] = (df['Home_Days_Since_Last'] + df['Away_Days_Since_Last']) / 2
+    
+    # Market volatility: Odds disagreement
+    # Higher values indicate more uncertainty/disagreement in the market
+    df['Odds_Disagreement'] = df[['HomeOdds', 'DrawOdds', 'AwayOdds']].std(axis=1)
+    
+    return df
+
+
+@register_feature(
+    'inplay',
+    inputs=[
+        'HT_Goal_Diff', 'HTHG', 'HTAG'
+    ],
+    outputs=[
+        'Comeback_Status', 'First_Goal_Timing_Bucket'
+    ],
+    single_match=True,
+)
+def generate_inplay_enhanced_features(df):
+    """Generate enhanced in-play features for halftime prediction"""
+    print("Generating enhanced in-play features...")
+    
+    # Comeback status: Is the team that's behind at HT trying to comeback?
+    df['Comeback_Status'] = np.where(
+        _flag(df['HT_Goal_Diff'] == 0), 0,  # No comeback needed (level)
+        np.where(_flag(df['HT_Goal_Diff'] > 0), 1,  # Home leading
+                 2)  # Away leading
+    )
+    
+    # First goal timing bucket
+    # 0 = No goals in first half, 1 = Goals in first half
+    df['First_Goal_Timing_Bucket'] = np.where(
+        _flag((df['HTHG'] == 0) & (df['HTAG'] == 0)), 0, 1
+    )
+    
+    return df
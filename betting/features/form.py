@@ -0,0 +1,371 @@
+"""
+Team history features: rolling form over each team's previous matches and
+head-to-head records, computed for every match at once on a long
+team-perspective table (one row per team per match).
+"""
+import numpy as np
+import pandas as pd
+
+from betting.features.registry import register_feature
+
+# Last-n form statistics per side: the basic set, then the advanced set
+BASIC_FORM_STATS = ['Avg_Goals_Scored', 'Avg_Goals_Conceded', 'Form_Points', 'Win_Ratio']
+ADVANCED_FORM_STATS = ['Form_Consistency', 'Weighted_Form_Points', 'Clean_Sheet_Ratio']
+# Exponentially weighted means: source column of the team-perspective table -> statistic
+EWM_FORM_STATS = {'Scored': 'Avg_Goals_Scored', 'Conceded': 'Avg_Goals_Conceded',
+                  'Points': 'Avg_Points', 'Win': 'Win_Ratio'}
+
+
+def _goals(df):
+    """Full-time goals as float arrays (NaN for unplayed matches)"""
+    return (df['FTHG'].to_numpy(float, na_value=np.nan), df['FTAG'].to_numpy(float, na_value=np.nan))
+
+
+def build_team_match_table(df, by_league=True):
+    """
+    Reshape matches into a long team-perspective table: one row per team per match.
+    Rows are grouped contiguously by (Team, League) - or by Team alone when
+    by_league=False - and ordered inside each group by (Date, home before away,
+    match order), the order the original per-team loop saw after concatenating
+    home and away history and sorting it by date.
+    """
+    # Results come from the goals, so the table does not depend on the FT_Result encoding
+    home_goals, away_goals = _goals(df)
+    home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3, 1], 0)
+    away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3, 1], 0)
+
+    n = len(df)
+    long = pd.DataFrame({
+        'Match': np.concatenate([np.arange(n), np.arange(n)]),
+        'Team': np.concatenate([df['HomeTeam'].to_numpy(object), df['AwayTeam'].to_numpy(object)]),
+        'League': np.concatenate([df['League'].to_numpy(object)] * 2),
+        'Date': np.concatenate([df['Date'].to_numpy()] * 2),
+        'Is_Home': np.repeat([True, False], n),
+        'Scored': np.concatenate([home_goals, away_goals]),
+        'Conceded': np.concatenate([away_goals, home_goals]),
+        'Points': np.concatenate([home_points, away_points]),
+    })
+    long['Win'] = (long['Points'] == 3).astype(int)
+
+    group = long.groupby(['Team', 'League'] if by_league else ['Team'], sort=False).ngroup().to_numpy()
+    date_key = long['Date'].to_numpy().astype('datetime64[ns]').view('int64').copy()
+    date_key[pd.isna(long['Date']).to_numpy()] = np.iinfo(np.int64).max  # NaT sorts last, as in sort_values
+    order = np.lexsort((long['Match'].to_numpy(), ~long['Is_Home'].to_numpy(), date_key, group))
+    long = long.iloc[order].reset_index(drop=True)
+    long['Group'] = group[order]
+    long['Date_Key'] = date_key[order]
+    long['Position'] = long.groupby('Group', sort=False).cumcount().to_numpy()
+    return long
+
+
+def _lagged(values, positions, lag):
+    """values shifted by lag inside each contiguous group; unavailable slots are NaN."""
+    shifted = np.full(len(values), np.nan)
+    if lag < len(values):
+        shifted[lag:] = values[:-lag]
+    shifted[positions < lag] = np.nan
+    return shifted
+
+
+def _prefix_sums(values):
+    """Exclusive prefix sums: window [start, stop) sums to sums[stop] - sums[start]."""
+    return np.concatenate([[0.0], np.cumsum(values)])
+
+
+def _form_prefix_sums(long):
+    """
+    Cumulative sums over the sorted team-perspective table, shared by every window.
+    Goals, points and wins are whole numbers, so window sums taken as differences of
+    these prefix sums are exact (the points spread is summed per window instead); missing goals are counted separately so that a
+    window containing one still yields NaN, as np.mean over it would.
+    """
+    index = np.arange(len(long), dtype=float)
+    points = long['Points'].to_numpy(float)
+    conceded = long['Conceded'].to_numpy(float)
+    sums = {}
+    for column in ('Scored', 'Conceded'):
+        values = long[column].to_numpy(float)
+        sums[column] = _prefix_sums(np.nan_to_num(values))
+        sums[f'{column}_Missing'] = _prefix_sums(np.isnan(values))
+    sums['Points'] = _prefix_sums(points)
+    sums['Ranked_Points'] = _prefix_sums((index + 1) * points)
+    sums['Win'] = _prefix_sums(long['Win'].to_numpy(float))
+    sums['Clean_Sheet'] = _prefix_sums(conceded == 0)
+    return sums
+
+
+def _rolling_form(long, sums, n_matches):
+    """Last-n statistics over each team's previous matches (shifted, so the current match is excluded)."""
+    positions = long['Position'].to_numpy()
+    stop = np.arange(len(long))
+    start = stop - np.minimum(positions, n_matches)
+    count = (stop - start).astype(float)
+
+    def window(name):
+        return sums[name][stop] - sums[name][start]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scored = np.where(window('Scored_Missing') > 0, np.nan, window('Scored'))
+        conceded = np.where(window('Conceded_Missing') > 0, np.nan, window('Conceded'))
+        points = window('Points')
+        # Squared deviations from the window mean, added oldest to newest as np.std adds them
+        mean_points = points / count
+        point_values = long['Points'].to_numpy(float)
+        squared_deviation = np.zeros(len(long))
+        for lag in range(n_matches, 0, -1):
+            deviation = _lagged(point_values, positions, lag) - mean_points
+            squared_deviation += np.where(positions >= lag, deviation * deviation, 0.0)
+        # Linear weights 1..k from oldest to newest
+        weighted = window('Ranked_Points') - start * points
+
+        form = pd.DataFrame({
+            'Avg_Goals_Scored': scored / count,
+            'Avg_Goals_Conceded': conceded / count,
+            'Form_Points': points,
+            'Win_Ratio': window('Win') / count,
+            'Form_Consistency': np.where(count > 1, np.sqrt(squared_deviation / count), 0.0),
+            'Weighted_Form_Points': weighted / (count * (count + 1) / 2),
+            'Clean_Sheet_Ratio': window('Clean_Sheet') / count,
+        })
+    form[count == 0] = np.nan
+    return form
+
+
+def _ewm_form(long, span):
+    """Exponentially weighted means over each team's previous matches (current match excluded)."""
+    values = long[list(EWM_FORM_STATS)].astype(float)
+    smoothed = values.groupby(long['Group'].to_numpy(), sort=False).ewm(span=span).mean()
+    smoothed = smoothed.reset_index(level=0, drop=True).sort_index()
+    positions = long['Position'].to_numpy()
+    return pd.DataFrame({
+        name: _lagged(smoothed[column].to_numpy(), positions, 1)
+        for column, name in EWM_FORM_STATS.items()
+    })
+
+
+def _exact_form_window(long, row, stop, n_matches):
+    """
+    Reference window for a team that played home and away on the same date: the
+    previous matches (by match order), last n home and last n away, stably sorted by
+    date, then the last n overall.
+    """
+    start = row - long['Position'][row]
+    candidates = np.arange(start, stop)
+    candidates = candidates[long['Match'][candidates] < long['Match'][row]]
+    if len(candidates) == 0:
+        return None
+    candidates = candidates[np.argsort(long['Match'][candidates], kind='stable')]
+    is_home = long['Is_Home'][candidates]
+    window = np.concatenate([candidates[is_home][-n_matches:], candidates[~is_home][-n_matches:]])
+    window = window[np.argsort(long['Date_Key'][window], kind='stable')][-n_matches:]
+
+    points = long['Points'][window]
+    conceded = long['Conceded'][window]
+    weights = np.arange(1, len(points) + 1)
+    return {
+        'Avg_Goals_Scored': np.mean(long['Scored'][window]),
+        'Avg_Goals_Conceded': np.mean(conceded),
+        'Form_Points': np.sum(points),
+        'Win_Ratio': np.mean(long['Win'][window]),
+        'Form_Consistency': np.std(points) if len(points) > 1 else 0,
+        'Weighted_Form_Points': np.average(points, weights=weights),
+        'Clean_Sheet_Ratio': (conceded == 0).sum() / len(conceded),
+    }
+
+
+def _match_columns(long, row_count, forms):
+    """Team-perspective form frames (suffix -> frame) as Home_/Away_ match columns"""
+    columns = {}
+    for prefix, is_home in (('Home', True), ('Away', False)):
+        rows = long['Is_Home'].to_numpy() == is_home
+        matches = long['Match'].to_numpy()[rows]
+        for suffix, form in forms.items():
+            for name in form.columns:
+                values = np.full(row_count, np.nan)
+                values[matches] = form[name].to_numpy()[rows]
+                columns[f'{prefix}_{name}_{suffix}'] = values
+    return columns
+
+
+def ewm_form_features(df, ewm_spans):
+    """
+    The *_EWM{span} columns of team_form for every row of df, in df's row order.
+    EWM means reach back over a team's whole history, so the feature store computes
+    them with this on the full fixture table rather than on its rolling state.
+    """
+    long = build_team_match_table(df)
+    forms = {f'EWM{span}': _ewm_form(long, span) for span in ewm_spans}
+    return pd.DataFrame(_match_columns(long, len(df), forms), index=df.index)
+
+
+def form_windows(n_matches=5, windows=None):
+    """Last-n window sizes of team_form: n_matches (the form_differences window) and any further windows"""
+    return list(dict.fromkeys([n_matches, *(windows or ())]))
+
+
+def team_form_columns(n_matches=5, windows=None, ewm_spans=()):
+    """Columns team_form adds: per window the basic then the advanced stats (home, away), then the EWM means"""
+    columns = []
+    for window in form_windows(n_matches, windows):
+        for stats in (BASIC_FORM_STATS, ADVANCED_FORM_STATS):
+            columns += [f'{side}_{stat}_Last{window}' for side in ('Home', 'Away') for stat in stats]
+    columns += [f'{side}_{stat}_EWM{span}' for side in ('Home', 'Away')
+                for span in ewm_spans for stat in EWM_FORM_STATS.values()]
+    return columns
+
+
+def form_difference_inputs(n_matches=5):
+    """Last-n form columns form_differences reads"""
+    return [f'{side}_{stat}_Last{n_matches}' for side in ('Home', 'Away')
+            for stat in ('Avg_Goals_Scored', 'Avg_Goals_Conceded', 'Form_Points')]
+
+
+@register_feature(
+    'team_form',
+    inputs=[
+        'League', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'
+    ],
+    outputs=team_form_columns,
+)
+def generate_team_form_features(df, n_matches=5, windows=None, ewm_spans=()):
+    """
+    Generate rolling form features for each team.
+    Every last-n window adds a *_Last{n} column set: n_matches, then any further
+    sizes in windows. ewm_spans adds exponentially weighted *_EWM{span} means.
+    All windows share one team-perspective table and one set of cumulative sums.
+    """
+    windows = form_windows(n_matches, windows)
+    label = ', '.join(str(window) for window in windows)
+    spans = f", EWM spans {', '.join(str(span) for span in ewm_spans)}" if ewm_spans else ''
+    print(f"Generating team form features (last {label} matches{spans})...")
+    
+    # Sort by date and league
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    
+    # Initialize form columns (basic + advanced)
+    for col in team_form_columns(n_matches, windows):
+        df[col] = np.nan
+    
+    # Calculate form for every team at once on the team-perspective table
+    long = build_team_match_table(df)
+    sums = _form_prefix_sums(long)
+    forms = {f'Last{window}': _rolling_form(long, sums, window) for window in windows}
+
+    # A team with a home and an away match on the same date: history by match order
+    # differs from the date-sorted prefix, so recompute those (rare) rows directly.
+    venues_on_date = long.groupby(['Group', 'Date_Key'])['Is_Home'].transform('nunique').to_numpy()
+    tied_rows = np.flatnonzero(venues_on_date > 1)
+    if len(tied_rows):
+        arrays = {column: long[column].to_numpy() for column in long.columns}
+        group_stop = np.cumsum(np.bincount(arrays['Group']))
+        for window in windows:
+            form = forms[f'Last{window}']
+            for row in tied_rows:
+                exact = _exact_form_window(arrays, row, group_stop[arrays['Group'][row]], window)
+                for name in form.columns:
+                    form.at[row, name] = np.nan if exact is None else exact[name]
+
+    for span in ewm_spans:
+        forms[f'EWM{span}'] = _ewm_form(long, span)
+
+    # Map the team-perspective rows back onto matches
+    for column, values in _match_columns(long, len(df), forms).items():
+        df[column] = values
+    
+    return df
+
+
+@register_feature(
+    'form_differences',
+    inputs=form_difference_inputs,
+    outputs=[
+        'Goal_Diff_Form', 'Points_Diff_Form'
+    ],
+    single_match=True,
+)
+def generate_form_difference_features(df, n_matches=5):
+    """Home-minus-away form gaps over the last-n window"""
+    window = f'Last{n_matches}'
+    df['Goal_Diff_Form'] = (df[f'Home_Avg_Goals_Scored_{window}'] - df[f'Home_Avg_Goals_Conceded_{window}']) - \
+                           (df[f'Away_Avg_Goals_Scored_{window}'] - df[f'Away_Avg_Goals_Conceded_{window}'])
+    df['Points_Diff_Form'] = df[f'Home_Form_Points_{window}'] - df[f'Away_Form_Points_{window}']
+    
+    return df
+
+
+def team_pair_codes(df):
+    """
+    Unordered pair key per match: (League, first team, second team) with the two
+    names sorted. Also returns whether the pair's first team is the home side.
+    """
+    home = df['HomeTeam'].astype(str).to_numpy()
+    away = df['AwayTeam'].astype(str).to_numpy()
+    first = np.where(home <= away, home, away)
+    second = np.where(home <= away, away, home)
+    pair = pd.DataFrame({'League': df['League'].to_numpy(), 'First': first, 'Second': second})
+    pair_code = pair.groupby(['League', 'First', 'Second'], sort=False).ngroup().to_numpy()
+    return pair_code, home == first
+
+
+@register_feature(
+    'h2h',
+    inputs=[
+        'League', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'
+    ],
+    outputs=[
+        'H2H_Avg_Goal_Diff', 'H2H_Recent_Win_Ratio'
+    ],
+)
+def generate_h2h_features(df, n_matches=5):
+    """Generate head-to-head features between teams"""
+    print(f"Generating head-to-head features (last {n_matches} H2H matches)...")
+    
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    
+    pair_code, first_is_home = team_pair_codes(df)
+    
+    # Every meeting oriented to the pair's first team
+    home_goals, away_goals = _goals(df)
+    goal_diff = home_goals - away_goals
+    first_diff = np.where(first_is_home, goal_diff, -goal_diff)
+    first_win = np.where(first_is_home, home_goals > away_goals, away_goals > home_goals).astype(float)
+    second_win = np.where(first_is_home, away_goals > home_goals, home_goals > away_goals).astype(float)
+    
+    # Group meetings by pair in match order (already date order within a league)
+    order = np.lexsort((np.arange(len(df)), pair_code))
+    sorted_pair = pair_code[order]
+    position = pd.Series(sorted_pair).groupby(sorted_pair).cumcount().to_numpy()
+    group_start = np.arange(len(df)) - position
+    
+    # Only strictly earlier dates count: history ends at the first meeting on the current date
+    sorted_dates = df['Date'].to_numpy()[order]
+    same_date_rank = pd.DataFrame({'Pair': sorted_pair, 'Date': sorted_dates}).groupby(['Pair', 'Date'], sort=False, dropna=False).cumcount().to_numpy()
+    history_end = np.arange(len(df)) - same_date_rank
+    history_start = np.maximum(history_end - n_matches, group_start)
+    count = (history_end - history_start).astype(float)
+    
+    def window_sum(values):
+        cumulative = np.concatenate([[0.0], np.cumsum(np.nan_to_num(values[order]))])
+        missing = np.concatenate([[0], np.cumsum(np.isnan(values[order]))])
+        total = cumulative[history_end] - cumulative[history_start]
+        return np.where(missing[history_end] - missing[history_start] > 0, np.nan, total)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_first_diff = window_sum(first_diff) / count
+        first_ratio = window_sum(first_win) / count
+        second_ratio = window_sum(second_win) / count
+    
+    # Orient back to the current home side
+    sorted_first_is_home = first_is_home[order]
+    h2h_goal_diff = np.where(sorted_first_is_home, avg_first_diff, -avg_first_diff)
+    h2h_win_ratio = np.where(sorted_first_is_home, first_ratio, second_ratio)
+    no_history = (count == 0) | pd.isna(sorted_dates)
+    h2h_goal_diff[no_history] = np.nan
+    h2h_win_ratio[no_history] = np.nan
+    
+    df['H2H_Avg_Goal_Diff'] = np.nan
+    df['H2H_Recent_Win_Ratio'] = np.nan
+    df.loc[order, 'H2H_Avg_Goal_Diff'] = h2h_goal_diff
+    df.loc[order, 'H2H_Recent_Win_Ratio'] = h2h_win_ratio
+    
+    return df
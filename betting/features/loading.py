@@ -0,0 +1,82 @@
+"""
+Loading the fixture dataset into the English column schema used by the features,
+and enriched feature files for training.
+"""
+import os
+
+import pandas as pd
+
+from betting.matches import COLUMN_NAMES, ODDS_COLUMNS, CodeBook, MatchTable
+from betting.scores import match_results, parse_scores
+
+
+def load_and_parse_data(file_path, result_codes, compact=False, codebook_path=None):
+    """
+    Load the fixture store (Parquet directory) or a CSV export and parse basic features.
+    result_codes is the (home win, draw, away win) encoding for FT_Result/HT_Result;
+    the data-prep and ML pipelines use different ones.
+
+    compact=True returns the frame view of a MatchTable instead (categorical names,
+    Int8 goals, float32 odds, no FT_Score/HT_Score text); codebook_path keeps its
+    team/league codes stable across runs.
+    """
+    print("Loading data...")
+    if compact:
+        codebook = CodeBook.load(codebook_path) if codebook_path else None
+        table = MatchTable.load(file_path, codebook)
+        if codebook_path:
+            table.codebook.save(codebook_path)
+        print(f"Loaded {len(table)} matches ({table.nbytes / 1e6:.1f} MB as a match table)")
+        return table.to_frame(result_codes)
+
+    if os.path.isdir(file_path) or file_path.endswith('.parquet'):
+        df = pd.read_parquet(file_path)
+    else:
+        df = pd.read_csv(file_path)
+    
+    print(f"Loaded {len(df)} matches")
+    
+    # Parse scores
+    print("Parsing scores...")
+    df['FTHG'], df['FTAG'] = parse_scores(df['Skor'])
+    df['HTHG'], df['HTAG'] = parse_scores(df['IY_Skor'])
+    
+    # Calculate results
+    df['FT_Result'] = match_results(df['FTHG'], df['FTAG'], *result_codes)
+    df['HT_Result'] = match_results(df['HTHG'], df['HTAG'], *result_codes)
+    
+    # Rename columns for clarity
+    df = df.rename(columns=COLUMN_NAMES)
+    
+    # Parse date (format: dd/mm/yyyy for new file, handles full dates)
+    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
+    
+    # Handle missing odds (convert '-' to NaN)
+    for col in ODDS_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    return df
+
+
+def load_feature_matrix(file_path, codebook_path=None):
+    """
+    Load an enriched feature file (feature_engineering.py output, CSV or Parquet) for
+    training, with its match columns held in a MatchTable: categorical team/league
+    names, Int8 goals and float32 odds instead of text and float64. Feature and result
+    columns are kept as read; the FT_Score/HT_Score text is dropped.
+    """
+    print("Loading data...")
+    if os.path.isdir(file_path) or file_path.endswith('.parquet'):
+        df = pd.read_parquet(file_path)
+    else:
+        df = pd.read_csv(file_path)
+    
+    codebook = CodeBook.load(codebook_path) if codebook_path else None
+    table = MatchTable.from_frame(df, codebook, date_format='ISO8601')
+    if codebook_path:
+        table.codebook.save(codebook_path)
+    matches = table.to_frame()
+    features = df.drop(columns=[column for column in df.columns
+                                if column in matches.columns or column in ('FT_Score', 'HT_Score')])
+    print(f"Loaded {len(df)} matches ({table.nbytes / 1e6:.1f} MB of match columns as a match table)")
+    return pd.concat([matches, features], axis=1)
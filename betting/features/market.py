@@ -0,0 +1,82 @@
+"""
+Features derived from the betting market: 1X2 odds and the over/under 2.5 goals line.
+All of them only read the match's own odds, so they also run on a single match.
+"""
+import numpy as np
+
+from betting.features.registry import register_feature
+
+
+@register_feature(
+    'odds',
+    inputs=[
+        'HomeOdds', 'DrawOdds', 'AwayOdds'
+    ],
+    outputs=[
+        'Prob_Home', 'Prob_Draw', 'Prob_Away', 'Margin', 'True_Prob_Home',
+        'True_Prob_Draw', 'True_Prob_Away', 'Entropy', 'Favorite_Odds',
+        'Underdog_Odds', 'Mismatch_Ratio', 'Home_Is_Favorite'
+    ],
+    single_match=True,
+)
+def generate_odds_features(df):
+    """Generate features derived from betting odds"""
+    print("Generating odds-derived features...")
+    
+    # Implied probabilities (accounting for bookmaker margin)
+    df['Prob_Home'] = 1 / df['HomeOdds']
+    df['Prob_Draw'] = 1 / df['DrawOdds']
+    df['Prob_Away'] = 1 / df['AwayOdds']
+    
+    # Bookmaker margin (overround)
+    df['Margin'] = df['Prob_Home'] + df['Prob_Draw'] + df['Prob_Away'] - 1
+    
+    # True probabilities (remove margin)
+    df['True_Prob_Home'] = df['Prob_Home'] / (df['Prob_Home'] + df['Prob_Draw'] + df['Prob_Away'])
+    df['True_Prob_Draw'] = df['Prob_Draw'] / (df['Prob_Home'] + df['Prob_Draw'] + df['Prob_Away'])
+    df['True_Prob_Away'] = df['Prob_Away'] / (df['Prob_Home'] + df['Prob_Draw'] + df['Prob_Away'])
+    
+    # Market entropy (uncertainty measure)
+    df['Entropy'] = -(df['True_Prob_Home'] * np.log2(df['True_Prob_Home'] + 1e-10) +
+                      df['True_Prob_Draw'] * np.log2(df['True_Prob_Draw'] + 1e-10) +
+                      df['True_Prob_Away'] * np.log2(df['True_Prob_Away'] + 1e-10))
+    
+    # Favorite odds and underdog odds
+    df['Favorite_Odds'] = df[['HomeOdds', 'AwayOdds']].min(axis=1)
+    df['Underdog_Odds'] = df[['HomeOdds', 'AwayOdds']].max(axis=1)
+    
+    # Mismatch ratio (strength difference)
+    df['Mismatch_Ratio'] = df['Underdog_Odds'] / df['Favorite_Odds']
+    
+    # Is home team favorite?
+    df['Home_Is_Favorite'] = (df['HomeOdds'] < df['AwayOdds']).astype(int)
+    
+    return df
+
+
+@register_feature(
+    'goal_market',
+    inputs=[
+        'Under2.5', 'Over2.5'
+    ],
+    outputs=[
+        'Prob_Over2.5', 'Prob_Under2.5', 'Margin_OU2.5', 'Market_Expected_Goals'
+    ],
+    single_match=True,
+)
+def generate_goal_market_features(df):
+    """Generate features from Over/Under 2.5 goals market"""
+    print("Generating goal market features...")
+    
+    # Probabilities for O/U 2.5
+    df['Prob_Over2.5'] = 1 / df['Over2.5']
+    df['Prob_Under2.5'] = 1 / df['Under2.5']
+    
+    # Margin for O/U market
+    df['Margin_OU2.5'] = df['Prob_Over2.5'] + df['Prob_Under2.5'] - 1
+    
+    # Market expected goals (simplified approximation)
+    # Higher over probability suggests more goals expected
+    df['Market_Expected_Goals'] = 2.5 + (df['Prob_Over2.5'] - df['Prob_Under2.5']) * 2
+    
+    return df
@@ -0,0 +1,99 @@
+"""
+Per-league feature computation on a process pool.
+
+Every history feature (form, H2H, rest days) looks only at matches of the same
+league, so leagues are independent shards. The parent writes the sorted fixture
+table once to an Arrow IPC file; each worker memory-maps it, takes its league's
+contiguous row range without copying and writes its enriched rows to its own Arrow
+file, which the parent memory-maps back. Only file paths and row offsets cross
+process boundaries, never pickled frames.
+"""
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+
+from betting.features.registry import build_features
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path, start=0, stop=None):
+    # read_all over a memory map references the mapped pages instead of copying them
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    stop = table.num_rows if stop is None else stop
+    return table.slice(start, stop - start).to_pandas()
+
+
+def _build_frame(df, params, cache_dir, precomputed_columns):
+    # Precomputed outputs travel as extra columns of the rows: group name -> its columns
+    precomputed = {name: df[columns] for name, columns in precomputed_columns.items()}
+    df = df.drop(columns=[column for columns in precomputed_columns.values() for column in columns])
+    return build_features(df, cache_dir=cache_dir, precomputed=precomputed, **params)
+
+
+def _build_shard(source_path, start, stop, out_path, params, cache_dir, precomputed_columns):
+    shard = _read_arrow(source_path, start, stop)
+    _write_arrow(_build_frame(shard, params, cache_dir, precomputed_columns), out_path)
+    return out_path
+
+
+def league_shards(df):
+    """(league, start, stop) row ranges of a table sorted by League, largest first"""
+    sizes = df.groupby('League', sort=False, observed=True, dropna=False).size()
+    bounds = sizes.cumsum()
+    shards = [(league, stop - size, stop) for (league, size), stop in zip(sizes.items(), bounds)]
+    return sorted(shards, key=lambda shard: shard[1] - shard[2])
+
+
+def build_features_parallel(df, n_matches=5, workers=None, cache_dir=None, precomputed=None,
+                            windows=None, ewm_spans=(), across_competitions=False):
+    """
+    build_features with each league computed in its own process; returns the same
+    frame. workers defaults to the number of CPUs. With a cache_dir each league keeps
+    its own group cache under <cache_dir>/leagues/. precomputed, windows, ewm_spans
+    and across_competitions are passed on as in build_features (precomputed outputs
+    aligned with the rows of df). Rest days across competitions link the leagues, so
+    that mode is computed in one process.
+    """
+    params = {'n_matches': n_matches, 'windows': windows, 'ewm_spans': ewm_spans,
+              'across_competitions': across_competitions}
+    precomputed = precomputed or {}
+    if precomputed:
+        # Attach the precomputed outputs so they are sorted and sharded with their rows
+        df = pd.concat([df.reset_index(drop=True)] +
+                       [frame.reset_index(drop=True) for frame in precomputed.values()], axis=1)
+    precomputed_columns = {name: list(frame.columns) for name, frame in precomputed.items()}
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    shards = league_shards(df)
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if across_competitions and workers > 1:
+        print("Rest days across competitions need every league at once; computing in one process")
+        workers = 1
+    if workers <= 1:
+        return _build_frame(df, params, cache_dir, precomputed_columns)
+
+    print(f"Computing features for {len(shards)} leagues on {workers} processes...")
+    with tempfile.TemporaryDirectory(prefix='features-') as tmp_dir:
+        source_path = os.path.join(tmp_dir, 'source.arrow')
+        _write_arrow(df, source_path)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for league, start, stop in shards:
+                shard_id = hashlib.sha256(str(league).encode()).hexdigest()[:16]
+                shard_cache = None if cache_dir is None else os.path.join(cache_dir, 'leagues', shard_id)
+                out_path = os.path.join(tmp_dir, f'{shard_id}.arrow')
+                futures[start] = pool.submit(
+                    _build_shard, source_path, start, stop, out_path, params, shard_cache,
+                    precomputed_columns
+                )
+            # Concatenate in row order, which is the (League, Date) order of build_features
+            parts = [_read_arrow(futures[start].result()) for start in sorted(futures)]
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,184 @@
+"""
+Team strength ratings: Elo and Pi-ratings (Constantinou & Fenton, 2013), updated
+match by match in date order.
+
+Teams are rated per league, like the form features, and held in flat NumPy arrays
+indexed by integer team IDs. Matches are grouped into rounds in which no team plays
+twice; a round is updated with a few array operations, so the cost is per round
+(about the number of matches a team plays), not per match, and the result is the
+same as a match-by-match loop. RatingEngine keeps its state between calls, so new
+matches can be added on top of stored ratings (see the feature store).
+"""
+import numpy as np
+import pandas as pd
+
+from betting.features.form import _goals
+from betting.features.registry import register_feature
+
+RATING_COLUMNS = [
+    'Home_Elo', 'Away_Elo', 'Elo_Difference', 'Elo_Home_Expected',
+    'Home_Pi_Rating', 'Away_Pi_Rating', 'Pi_Goal_Diff_Expected'
+]
+
+
+def _pi_goals(rating):
+    """Goal difference a Pi-rating stands for: sign(r) * (10^(|r|/3) - 1)"""
+    return np.sign(rating) * (10 ** (np.abs(rating) / 3) - 1)
+
+
+def _rounds(home, away, played):
+    """
+    Round of every match: one after the latest round of either team. Played matches of
+    a team land in increasing rounds, so a round never updates a team twice. An unplayed
+    match updates nothing, so the next played match of its teams may share its round
+    (ratings are read before a round's updates) but not come earlier.
+    """
+    last = [-1] * (max(home.max(initial=-1), away.max(initial=-1)) + 1)
+    rounds = []
+    for home_id, away_id, is_played in zip(home.tolist(), away.tolist(), played.tolist()):
+        current = max(last[home_id], last[away_id]) + 1
+        rounds.append(current)
+        last[home_id] = last[away_id] = current if is_played else current - 1
+    return np.array(rounds, dtype=np.int64)
+
+
+class RatingEngine:
+    """
+    Elo and Pi-ratings of every (League, Team) seen so far.
+
+    Elo: one rating per team (starting at 1500), home advantage in rating points and
+    a K factor scaled by the goal margin as in the World Football Elo ratings.
+    Pi: a home and an away rating per team (starting at 0); the error between the
+    actual and the expected goal difference moves the rating of the venue played by
+    learning_rate and the other venue's rating by catch_up of that change.
+    """
+
+    def __init__(self, elo_k=20.0, home_advantage=60.0, learning_rate=0.035, catch_up=0.7):
+        self.elo_k = elo_k
+        self.home_advantage = home_advantage
+        self.learning_rate = learning_rate
+        self.catch_up = catch_up
+        self.teams = {}  # (league, team) -> team ID
+        self.elo = np.empty(0)
+        self.pi_home = np.empty(0)
+        self.pi_away = np.empty(0)
+
+    def team_ids(self, leagues, teams):
+        """Integer IDs of (league, team) pairs, registering new teams with initial ratings"""
+        league_codes, league_values = pd.factorize(leagues, use_na_sentinel=False)
+        team_codes, team_values = pd.factorize(teams, use_na_sentinel=False)
+        codes, pairs = pd.factorize(league_codes.astype(np.int64) * len(team_values) + team_codes)
+        keys = zip(league_values[pairs // len(team_values)], team_values[pairs % len(team_values)])
+        ids = np.array([self.teams.setdefault(key, len(self.teams)) for key in keys], dtype=np.int64)
+        added = len(self.teams) - len(self.elo)
+        if added:
+            self.elo = np.concatenate([self.elo, np.full(added, 1500.0)])
+            self.pi_home = np.concatenate([self.pi_home, np.zeros(added)])
+            self.pi_away = np.concatenate([self.pi_away, np.zeros(added)])
+        return ids[codes]
+
+    def update(self, df):
+        """
+        Rate the matches of df (League, Date, HomeTeam, AwayTeam, FTHG, FTAG) and
+        update the ratings with the played ones. Returns the pre-match ratings of every
+        match (RATING_COLUMNS), indexed like df. Matches are taken in date order (NaT
+        last, ties in df order); they should come after the matches already rated.
+        """
+        n = len(df)
+        leagues = np.tile(df['League'].to_numpy(object), 2)
+        ids = self.team_ids(leagues, np.concatenate([df['HomeTeam'].to_numpy(object), df['AwayTeam'].to_numpy(object)]))
+        home_goals, away_goals = _goals(df)
+
+        date_key = df['Date'].to_numpy().astype('datetime64[ns]').view('int64').copy()
+        date_key[pd.isna(df['Date']).to_numpy()] = np.iinfo(np.int64).max
+        order = np.argsort(date_key, kind='stable')
+        home, away = ids[:n][order], ids[n:][order]
+        goal_diff = (home_goals - away_goals)[order]
+        played = ~np.isnan(goal_diff)
+
+        rounds = _rounds(home, away, played)
+        by_round = np.argsort(rounds, kind='stable')
+        bounds = np.flatnonzero(np.diff(rounds[by_round])) + 1
+
+        snapshot = np.full((n, 6), np.nan)
+        for batch in np.split(by_round, bounds):
+            snapshot[batch] = self._rate(home[batch], away[batch], goal_diff[batch], played[batch])
+
+        values = np.empty_like(snapshot)
+        values[order] = snapshot
+        home_elo, away_elo, expected, home_pi, away_pi, pi_goal_diff = values.T
+        return pd.DataFrame({
+            'Home_Elo': home_elo,
+            'Away_Elo': away_elo,
+            'Elo_Difference': home_elo - away_elo,
+            'Elo_Home_Expected': expected,
+            'Home_Pi_Rating': home_pi,
+            'Away_Pi_Rating': away_pi,
+            'Pi_Goal_Diff_Expected': pi_goal_diff,
+        }, index=df.index)
+
+    def _rate(self, home, away, goal_diff, played):
+        """Pre-match ratings of one round, then the updates of its played matches"""
+        home_elo, away_elo = self.elo[home], self.elo[away]
+        expected = 1 / (1 + 10 ** ((away_elo - home_elo - self.home_advantage) / 400))
+        home_pi, away_pi = self.pi_home[home], self.pi_away[away]
+        pi_goal_diff = _pi_goals(home_pi) - _pi_goals(away_pi)
+
+        home, away, goal_diff = home[played], away[played], goal_diff[played]
+        if len(home):
+            # Elo: margin multiplier 1 / 1.5 / (11 + margin) / 8 for 1 / 2 / 3+ goals
+            margin = np.abs(goal_diff)
+            multiplier = np.where(margin <= 1, 1.0, np.where(margin == 2, 1.5, (11 + margin) / 8))
+            score = np.where(goal_diff > 0, 1.0, np.where(goal_diff == 0, 0.5, 0.0))
+            change = self.elo_k * multiplier * (score - expected[played])
+            self.elo[home] += change
+            self.elo[away] -= change
+
+            # Pi: positive error = the home side beat its expected goal difference
+            error = goal_diff - pi_goal_diff[played]
+            change = self.learning_rate * np.sign(error) * 3 * np.log10(1 + np.abs(error))
+            self.pi_home[home] += change
+            self.pi_away[home] += self.catch_up * change
+            self.pi_away[away] -= change
+            self.pi_home[away] -= self.catch_up * change
+
+        return np.column_stack([home_elo, away_elo, expected, home_pi, away_pi, pi_goal_diff])
+
+    def state(self):
+        """Current ratings as a frame (League, Team, Elo, Pi_Home, Pi_Away), for storing"""
+        keys = list(self.teams)
+        return pd.DataFrame({
+            'League': [league for league, _ in keys],
+            'Team': [team for _, team in keys],
+            'Elo': self.elo,
+            'Pi_Home': self.pi_home,
+            'Pi_Away': self.pi_away,
+        })
+
+    @classmethod
+    def from_state(cls, state, **params):
+        """Engine continuing from ratings saved with state()"""
+        engine = cls(**params)
+        engine.team_ids(state['League'].to_numpy(object), state['Team'].to_numpy(object))
+        engine.elo = state['Elo'].to_numpy(float).copy()
+        engine.pi_home = state['Pi_Home'].to_numpy(float).copy()
+        engine.pi_away = state['Pi_Away'].to_numpy(float).copy()
+        return engine
+
+
+@register_feature(
+    'ratings',
+    inputs=[
+        'League', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'
+    ],
+    outputs=RATING_COLUMNS,
+)
+def generate_rating_features(df):
+    """Elo and Pi-ratings of both teams before each match"""
+    print("Generating rating features...")
+
+    ratings = RatingEngine().update(df)
+    for column in RATING_COLUMNS:
+        df[column] = ratings[column]
+
+    return df
@@ -0,0 +1,347 @@
+"""
+Registry of named feature groups.
+
+Every group is a plain function df -> df registered with the columns it reads and the
+columns it adds. Training runs the whole pipeline over the fixture table
+(build_features); inference runs the same functions over a single match
+(match_features), so both sides compute a feature in exactly one way.
+
+Declared inputs/outputs are column lists, or functions of the group's parameters
+returning them when the column names depend on those parameters (e.g. the form
+window in *_Last{n_matches}).
+
+A group is single_match when it only reads the match's own fields (odds, scores, or
+form values supplied by the caller); the others need the teams' match history.
+
+The declared inputs/outputs make the groups a graph: a group depends on the groups
+that produce its inputs. apply_features hands each group only its input columns,
+checks that the columns it adds are exactly the declared ones, keeps just those,
+and with a cache_dir stores those outputs on disk under a hash of the input data,
+the parameters and the group's code. A group is recomputed only when one of those
+changes; editing one feature leaves the cached form/H2H outputs in place. Each group
+keeps its CACHE_ENTRIES_PER_GROUP most recently used entries, so runs with different
+parameters (e.g. form windows) do not evict each other.
+"""
+import contextlib
+import hashlib
+import inspect
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+class Feature:
+    def __init__(self, name, func, inputs, outputs, single_match):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.single_match = single_match
+        signature = inspect.signature(func)
+        self._params = set(signature.parameters) - {'df'}
+        self._defaults = {
+            key: parameter.default for key, parameter in signature.parameters.items()
+            if key in self._params and parameter.default is not inspect.Parameter.empty
+        }
+
+    def __call__(self, df, **params):
+        return self.func(df, **self.params(params))
+
+    def params(self, params):
+        """The subset of params this group's function accepts"""
+        return {key: value for key, value in sorted(params.items()) if key in self._params}
+
+    def _columns(self, declared, params):
+        if callable(declared):
+            return list(declared(**{**self._defaults, **self.params(params)}))
+        return list(declared)
+
+    def input_columns(self, params):
+        """Columns the group reads when run with params"""
+        return self._columns(self.inputs, params)
+
+    def output_columns(self, params):
+        """Columns the group adds when run with params"""
+        return self._columns(self.outputs, params)
+
+    def code_hash(self):
+        """
+        Hash of the source of the function's module and of every betting module it
+        uses (e.g. the form table helpers behind match_context).
+        """
+        modules = {self.func.__module__}
+        for value in self.func.__globals__.values():
+            module = getattr(value, '__module__', None) or getattr(value, '__name__', None)
+            if isinstance(module, str) and module.startswith('betting.'):
+                modules.add(module)
+        digest = hashlib.sha256()
+        for module in sorted(modules):
+            path = getattr(sys.modules.get(module), '__file__', None)
+            if path:
+                with open(path, 'rb') as handle:
+                    digest.update(handle.read())
+        return digest.hexdigest()
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, single_match={self.single_match})"
+
+
+FEATURES = {}  # name -> Feature
+
+# Cached outputs kept per group; older entries (by last use) are removed on write
+CACHE_ENTRIES_PER_GROUP = 8
+
+# Pipeline order (also the output column order); a group must come after the groups whose outputs it reads
+PIPELINE = [
+    'odds',
+    'goal_market',
+    'halftime',
+    'match_context',
+    'team_form',
+    'form_differences',
+    'h2h',
+    'ratings',
+    'advanced_context',
+    'inplay',
+]
+
+
+def register_feature(name, inputs, outputs, single_match=False):
+    """
+    Decorator: register func as the feature group `name`. inputs/outputs are column
+    lists or functions taking the group's parameters and returning one.
+    """
+    def decorator(func):
+        FEATURES[name] = Feature(name, func, inputs, outputs, single_match)
+        return func
+    return decorator
+
+
+def dependencies(name, params=None):
+    """Groups whose outputs the group `name` reads when run with params"""
+    params = params or {}
+    inputs = set(FEATURES[name].input_columns(params))
+    return [other for other in PIPELINE
+            if other != name and inputs & set(FEATURES[other].output_columns(params))]
+
+
+def resolve(names=None, available=(), params=None):
+    """
+    Groups to run, in pipeline order: the requested ones plus every upstream group
+    that produces an input not already in `available`. Declared columns are
+    resolved for params.
+    """
+    params = params or {}
+    wanted = set(PIPELINE if names is None else names)
+    pending = list(wanted)
+    while pending:
+        name = pending.pop()
+        missing = set(FEATURES[name].input_columns(params)) - set(available)
+        for upstream in dependencies(name, params):
+            if upstream not in wanted and missing & set(FEATURES[upstream].output_columns(params)):
+                wanted.add(upstream)
+                pending.append(upstream)
+    ordered = [name for name in PIPELINE if name in wanted]
+    for position, name in enumerate(ordered):
+        late = set(dependencies(name, params)) & set(ordered[position + 1:])
+        if late:
+            raise ValueError(f"Feature group {name!r} runs before its inputs from {sorted(late)}")
+    return ordered
+
+
+def _frame_hash(frame):
+    digest = hashlib.sha256()
+    digest.update(repr([(column, str(dtype)) for column, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _prune_cache(group_dir, keep=CACHE_ENTRIES_PER_GROUP):
+    """Remove all but the keep most recently used cache entries of a group"""
+    entries = [os.path.join(group_dir, name) for name in os.listdir(group_dir) if name.endswith('.parquet')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # removed by a concurrent run
+
+
+def _run_group(feature, columns, row_count, params, cache_dir):
+    """
+    Outputs of one group (in declared order), from the disk cache when its inputs and
+    code are unchanged. Raises ValueError when an input is missing or the columns the
+    group adds differ from its declaration.
+    """
+    input_columns = feature.input_columns(params)
+    missing = [column for column in input_columns if column not in columns]
+    if missing:
+        raise ValueError(
+            f"Feature group {feature.name!r} needs {missing}, which neither the data nor an "
+            f"earlier group provides (params: {feature.params(params)})"
+        )
+    inputs = pd.DataFrame({column: columns[column] for column in input_columns})
+    path = None
+    if cache_dir is not None:
+        key = hashlib.sha256(
+            f"{_frame_hash(inputs)}|{feature.params(params)!r}|{feature.code_hash()}".encode()
+        ).hexdigest()[:32]
+        path = os.path.join(cache_dir, feature.name, f"{key}.parquet")
+        if os.path.exists(path):
+            print(f"Using cached {feature.name} features")
+            os.utime(path)  # mark as recently used for pruning
+            return pd.read_parquet(path)
+
+    inputs['_Row'] = np.arange(row_count)
+    input_columns = set(inputs.columns)
+    result = feature(inputs, **params)
+    declared = feature.output_columns(params)
+    added = [column for column in result.columns if column not in input_columns]
+    if set(added) != set(declared):
+        raise ValueError(
+            f"Feature group {feature.name!r} (params: {feature.params(params)}) does not add the "
+            f"columns it declares: missing {sorted(set(declared) - set(added))}, "
+            f"undeclared {sorted(set(added) - set(declared))}"
+        )
+    # Groups may re-sort their frame; line the outputs up with the input rows again
+    order = np.argsort(result['_Row'].to_numpy(), kind='stable')
+    outputs = result[declared].iloc[order].reset_index(drop=True)
+
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        outputs.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        _prune_cache(os.path.dirname(path))
+    return outputs
+
+
+def _precomputed_outputs(feature, frame, rows, params):
+    """Outputs of a group computed by the caller (rows aligned with the input df), in the sorted row order"""
+    declared = feature.output_columns(params)
+    missing = [column for column in declared if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Precomputed {feature.name!r} outputs lack {missing}")
+    return frame[declared].iloc[rows].reset_index(drop=True)
+
+
+def apply_features(df, names=None, cache_dir=None, precomputed=None, **params):
+    """
+    Run feature groups (and the upstream groups they need) over df and return df
+    with their outputs appended, rows in (League, Date) order when those columns
+    exist. params (e.g. n_matches=5) are passed to the groups that accept them.
+    precomputed maps a group name to its outputs, already computed by the caller
+    for the rows of df in their given order; that group is not run.
+    """
+    precomputed = precomputed or {}
+    df = df.reset_index(drop=True)
+    if {'League', 'Date'} <= set(df.columns):
+        df = df.sort_values(['League', 'Date'])
+    rows = df.index.to_numpy()
+    df = df.reset_index(drop=True)
+
+    columns = dict(df.items())
+    for name in resolve(names, available=df.columns, params=params):
+        if name in precomputed:
+            outputs = _precomputed_outputs(FEATURES[name], precomputed[name], rows, params)
+        else:
+            outputs = _run_group(FEATURES[name], columns, len(df), params, cache_dir)
+        columns.update(outputs.items())
+    return pd.DataFrame(columns)
+
+
+def build_features(df, n_matches=5, cache_dir=None, precomputed=None, windows=None, ewm_spans=(),
+                   across_competitions=False):
+    """
+    Run every feature group over a parsed fixture table (the batch/training path).
+    windows adds last-n form windows to n_matches; ewm_spans adds EWM form means.
+    across_competitions counts rest days from a team's previous match in any league.
+    """
+    return apply_features(df, cache_dir=cache_dir, precomputed=precomputed, n_matches=n_matches,
+                          windows=tuple(windows or ()), ewm_spans=tuple(ewm_spans),
+                          across_competitions=across_competitions)
+
+
+def pipeline_code_hash():
+    """Hash of the code of every registered group, to detect stale stored features"""
+    return hashlib.sha256(''.join(FEATURES[name].code_hash() for name in PIPELINE).encode()).hexdigest()
+
+
+def single_match_features():
+    """Names of the groups that can run on one match without its history"""
+    return [name for name in PIPELINE if FEATURES[name].single_match]
+
+
+def _quietly(func, *args, **kwargs):
+    """Run func without the groups' progress prints (one line per group and call)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def match_features(match, history=None, n_matches=5, windows=None, ewm_spans=(), across_competitions=False,
+                   ratings_state=None):
+    """
+    Features for one match (the inference path), as a dict.
+
+    match holds the parsed fields that are known (HomeOdds, DrawOdds, AwayOdds,
+    Under2.5, Over2.5, ...; HomeTeam/AwayTeam/League/Date for history features;
+    form values such as Home_Form_Points_Last5 when the caller supplies them).
+    Without history only the single-match groups run and absent inputs are NaN; a
+    group none of whose own inputs are known (e.g. halftime before kickoff) is
+    skipped and its outputs are NaN too.
+    With a parsed fixture history the match is appended to that history's rolling
+    state and the full pipeline runs, giving the values the batch path would give
+    (windows/ewm_spans/across_competitions as in build_features). Ratings continue
+    from ratings_state (RatingEngine.state() after the history, e.g. the feature
+    store's ratings.parquet) when given, else they are rated over the history once.
+    """
+    row = pd.DataFrame([match])
+    if history is None:
+        params = {'n_matches': n_matches}
+        names = single_match_features()
+        produced = {column for name in names for column in FEATURES[name].output_columns(params)}
+        known = {column for column in row.columns if row[column].notna().any()}
+        run, skipped = [], []
+        for name in names:
+            own_inputs = set(FEATURES[name].input_columns(params)) - produced
+            if own_inputs and not own_inputs & known:
+                skipped.append(name)
+            else:
+                run.append(name)
+            for column in FEATURES[name].input_columns(params):
+                if column not in row.columns and column not in produced:
+                    row[column] = np.nan
+        features = _quietly(apply_features, row, run, n_matches=n_matches).iloc[0].to_dict()
+        for name in skipped:
+            features.update(dict.fromkeys(FEATURES[name].output_columns(params), np.nan))
+        return features
+
+    # Imported here: these modules build on this registry
+    from betting.features.form import ewm_form_features, form_windows
+    from betting.features.ratings import RATING_COLUMNS, RatingEngine
+    from betting.features.store import select_state_rows
+
+    state = select_state_rows(history, max(form_windows(n_matches, windows)))
+    row = row.reindex(columns=list(dict.fromkeys(list(state.columns) + list(row.columns))))
+    frame = pd.concat([state, row], ignore_index=True)
+    frame['_Target'] = np.arange(len(frame)) == len(state)
+    # Ratings depend on the whole history, not just the rolling state: rate the match
+    # on top of the history's final ratings and hand them to the pipeline
+    if ratings_state is None:
+        engine = RatingEngine()
+        engine.update(history)
+    else:
+        engine = RatingEngine.from_state(ratings_state)
+    ratings = pd.concat([pd.DataFrame(np.nan, index=range(len(state)), columns=RATING_COLUMNS),
+                         engine.update(row)], ignore_index=True)
+    enriched = _quietly(build_features, frame, n_matches=n_matches, precomputed={'ratings': ratings},
+                        windows=windows, ewm_spans=ewm_spans, across_competitions=across_competitions)
+    features = enriched[enriched['_Target']].drop(columns='_Target').iloc[0].to_dict()
+    # EWM form also reaches back past the rolling state
+    if ewm_spans:
+        full = pd.concat([history, row], ignore_index=True)
+        features.update(ewm_form_features(full, ewm_spans).iloc[len(history)].to_dict())
+    return features
@@ -0,0 +1,186 @@
+"""
+Incremental feature store.
+
+    <store_dir>/parts/<n>.parquet  enriched rows, one file per refresh
+    <store_dir>/state.parquet      rolling state: the parsed rows new matches can still depend on
+                                   (last n matches per team and league for the longest form
+                                   window, last n meetings per pair); EWM form means reach back
+                                   further and are recomputed from the full fixture table
+    <store_dir>/ratings.parquet    Elo/Pi ratings after the last stored match (they depend on the
+                                   whole history, so they are carried forward rather than recomputed)
+    <store_dir>/keys.npy           match keys of every stored row
+    <store_dir>/meta.json          committed parts, settings and last stored date per league;
+                                   written last, so an interrupted refresh is simply ignored
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from betting.features.form import build_team_match_table, ewm_form_features, form_windows, team_pair_codes
+from betting.features.parallel import build_features_parallel
+from betting.features.ratings import RATING_COLUMNS, RatingEngine
+from betting.features.registry import build_features, pipeline_code_hash
+
+MATCH_KEY_COLUMNS = ['Season', 'League', 'Week', 'Code', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'HTHG', 'HTAG']
+
+
+def match_keys(df):
+    """Stable uint64 hash of the columns that identify a played match (score included)"""
+    keys = df[MATCH_KEY_COLUMNS].astype('string').fillna('')
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def select_state_rows(df, n_matches):
+    """Rows a later match can depend on: each team's last n matches per league and each pair's last n meetings"""
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    long = build_team_match_table(df)
+    remaining = long.groupby('Group', sort=False)['Position'].transform('max').to_numpy() - long['Position'].to_numpy()
+    keep = np.zeros(len(df), dtype=bool)
+    keep[long['Match'].to_numpy()[remaining < n_matches]] = True
+    pair_code, _ = team_pair_codes(df)
+    keep |= pd.Series(pair_code).groupby(pair_code).cumcount(ascending=False).to_numpy() < n_matches
+    return df[keep].reset_index(drop=True)
+
+
+def _write_atomic(path, write):
+    tmp_path = f'{path}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _save_store(store_dir, meta, part, state, ratings, keys):
+    os.makedirs(os.path.join(store_dir, 'parts'), exist_ok=True)
+    part_name = f"{len(meta['parts']):08d}.parquet"
+    _write_atomic(os.path.join(store_dir, 'parts', part_name), lambda path: part.to_parquet(path, index=False))
+    _write_atomic(os.path.join(store_dir, 'state.parquet'), lambda path: state.to_parquet(path, index=False))
+    _write_atomic(os.path.join(store_dir, 'ratings.parquet'), lambda path: ratings.to_parquet(path, index=False))
+    with open(os.path.join(store_dir, 'keys.npy.tmp'), 'wb') as handle:
+        np.save(handle, keys)
+    os.replace(os.path.join(store_dir, 'keys.npy.tmp'), os.path.join(store_dir, 'keys.npy'))
+    meta['parts'].append(part_name)
+
+    def write_meta(path):
+        with open(path, 'w') as handle:
+            json.dump(meta, handle, indent=2)
+    _write_atomic(os.path.join(store_dir, 'meta.json'), write_meta)
+
+
+def _team_dates(df, how):
+    """First ('min') or last ('max') match date of every team, home or away"""
+    teams = pd.concat([df['HomeTeam'], df['AwayTeam']], ignore_index=True).astype(str).to_numpy()
+    return pd.concat([df['Date'], df['Date']], ignore_index=True).groupby(teams).agg(how)
+
+
+def _last_dates(df):
+    return {str(league): str(date) for league, date in df.groupby('League', observed=True)['Date'].max().items()}
+
+
+def read_feature_store(store_dir):
+    """All enriched rows in the store, in (League, Date) order"""
+    with open(os.path.join(store_dir, 'meta.json')) as handle:
+        meta = json.load(handle)
+    parts = [pd.read_parquet(os.path.join(store_dir, 'parts', name)) for name in meta['parts']]
+    df = pd.concat(parts, ignore_index=True)
+    return df.sort_values(['League', 'Date'], kind='stable').reset_index(drop=True)
+
+
+def refresh_feature_store(df, store_dir, n_matches=5, full_refresh=False, cache_dir=None, workers=1,
+                          windows=None, ewm_spans=(), across_competitions=False):
+    """
+    Bring the feature store up to date with a parsed fixture table and return every enriched row.
+    Only matches whose key is not stored yet are computed, on top of the stored rolling state.
+    A full rebuild happens on the first run, when settings or feature code change, when
+    stored matches disappear or change (e.g. a corrected score), or when a new match is not
+    strictly later than everything already stored for its league. Full rebuilds go through
+    the per-group cache in cache_dir, so only groups whose code or inputs changed recompute,
+    and with workers > 1 compute each league in its own process. windows, ewm_spans and
+    across_competitions work as in build_features; they are part of the settings. Across
+    competitions, a team's new match must also be later than all of its stored matches.
+    """
+    keys = match_keys(df)
+    windows = form_windows(n_matches, windows)
+    ewm_spans = list(ewm_spans)
+    settings = {'n_matches': n_matches, 'windows': windows, 'ewm_spans': ewm_spans,
+                'across_competitions': across_competitions, 'columns': list(df.columns)}
+    # Rows kept as rolling state: enough for the longest form window and for H2H
+    state_depth = max(windows)
+    meta_path = os.path.join(store_dir, 'meta.json')
+    reason = None
+    if full_refresh:
+        reason = 'requested'
+    elif not os.path.exists(meta_path):
+        reason = 'no feature store yet'
+    else:
+        with open(meta_path) as handle:
+            meta = json.load(handle)
+        stored_keys = np.load(os.path.join(store_dir, 'keys.npy'))
+        if any(meta.get(key) != value for key, value in settings.items()):
+            reason = 'feature settings changed'
+        elif meta.get('code') != pipeline_code_hash():
+            reason = 'feature code changed'
+        elif not np.isin(stored_keys, keys).all():
+            reason = 'stored matches changed'
+
+    if reason is None:
+        is_new = ~np.isin(keys, stored_keys)
+        new_rows = df[is_new]
+        if new_rows.empty:
+            print(f"Feature store is up to date ({len(stored_keys)} matches)")
+            return read_feature_store(store_dir)
+        last_dates = {league: pd.Timestamp(date) for league, date in meta['last_date'].items()}
+        first_new = new_rows.groupby('League', observed=True)['Date'].min()
+        if new_rows['Date'].isna().any() or any(
+            str(league) in last_dates and date <= last_dates[str(league)] for league, date in first_new.items()
+        ):
+            reason = 'new matches precede stored ones'
+        elif across_competitions:
+            # Rest days link a team's leagues; its last match of each league is in the state
+            state = pd.read_parquet(os.path.join(store_dir, 'state.parquet'))
+            first_new, last_stored = _team_dates(new_rows, 'min'), _team_dates(state, 'max')
+            shared = first_new.index.intersection(last_stored.index)
+            if (first_new[shared] <= last_stored[shared]).any():
+                reason = 'new matches precede stored ones of the same team'
+
+    if reason is not None:
+        print(f"Full feature rebuild ({reason})...")
+        if os.path.isdir(store_dir):
+            shutil.rmtree(store_dir)
+        # The ratings group runs here, once: the store also keeps the engine's final state
+        engine = RatingEngine()
+        precomputed = {'ratings': engine.update(df)}
+        if workers > 1:
+            enriched = build_features_parallel(df.copy(), n_matches=n_matches, workers=workers, cache_dir=cache_dir,
+                                               precomputed=precomputed, windows=windows, ewm_spans=ewm_spans,
+                                               across_competitions=across_competitions)
+        else:
+            enriched = build_features(df.copy(), n_matches=n_matches, cache_dir=cache_dir, precomputed=precomputed,
+                                      windows=windows, ewm_spans=ewm_spans, across_competitions=across_competitions)
+        meta = {**settings, 'code': pipeline_code_hash(), 'parts': [], 'last_date': _last_dates(df)}
+        _save_store(store_dir, meta, enriched, select_state_rows(df, state_depth), engine.state(), keys)
+        return enriched
+
+    print(f"Incremental feature update: {len(new_rows)} new matches on top of {len(stored_keys)} stored")
+    state = pd.read_parquet(os.path.join(store_dir, 'state.parquet'))
+    history = pd.concat([state, new_rows], ignore_index=True)
+    # The rolling state is too short for ratings: continue the stored ones instead
+    engine = RatingEngine.from_state(pd.read_parquet(os.path.join(store_dir, 'ratings.parquet')))
+    new_ratings = engine.update(new_rows)
+    ratings = pd.concat([pd.DataFrame(np.nan, index=range(len(state)), columns=RATING_COLUMNS), new_ratings],
+                        ignore_index=True)
+    # New rows are picked by position, so repeated (duplicate) matches stay separate rows
+    enriched = build_features(history.assign(_New_Row=np.arange(len(history)) - len(state)), n_matches=n_matches,
+                              precomputed={'ratings': ratings}, windows=windows, ewm_spans=ewm_spans,
+                              across_competitions=across_competitions)
+    fresh = enriched[enriched['_New_Row'] >= 0].copy()
+    if ewm_spans:
+        # EWM means reach back past the rolling state: take them from the full table
+        ewm = ewm_form_features(df, ewm_spans)[is_new]
+        fresh[list(ewm.columns)] = ewm.to_numpy()[fresh['_New_Row'].to_numpy()]
+    fresh = fresh.drop(columns='_New_Row')
+    meta['last_date'].update(_last_dates(new_rows))
+    _save_store(store_dir, meta, fresh, select_state_rows(history, state_depth), engine.state(),
+                np.concatenate([stored_keys, match_keys(new_rows)]))
+    return read_feature_store(store_dir)
@@ -0,0 +1,195 @@
+"""
+Compact typed match table.
+
+MatchTable keeps the fixture dataset as one contiguous NumPy array per column:
+league/season/status codes and team IDs from a persistent CodeBook, int8 goals
+(-1 = not played), float32 odds and datetime64 dates - about a tenth of the memory
+of an object-dtype text frame. to_frame() wraps the arrays in a pandas frame with
+the English column schema of the feature code (categorical names, nullable Int8
+goals) without copying them.
+
+    table = MatchTable.load(path, codebook=CodeBook.load('codebook.json'))
+    df = table.to_frame(result_codes=(1, 0, 2))
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from betting.scores import parse_scores
+
+# Scraper (Turkish) column names -> English schema
+COLUMN_NAMES = {
+    'Lig': 'League',
+    'Hafta': 'Week',
+    'Tarih': 'Date',
+    'Kod': 'Code',
+    'EvSahibi': 'HomeTeam',
+    'Deplasman': 'AwayTeam',
+    'Skor': 'FT_Score',
+    'IY_Skor': 'HT_Score',
+    '1': 'HomeOdds',
+    '0': 'DrawOdds',
+    '2': 'AwayOdds',
+    '1&0': 'HomeDrawOdds',
+    '1&2': 'HomeAwayOdds',
+    '2&0': 'AwayDrawOdds',
+    'Alt': 'Under2.5',
+    'Üst': 'Over2.5'
+}
+ODDS_COLUMNS = ['HomeOdds', 'DrawOdds', 'AwayOdds', 'HomeDrawOdds',
+                'HomeAwayOdds', 'AwayDrawOdds', 'Under2.5', 'Over2.5']
+GOAL_COLUMNS = ['FTHG', 'FTAG', 'HTHG', 'HTAG']
+# Coded column -> CodeBook field; home and away teams share one dictionary
+CODED_COLUMNS = {
+    'Season': 'Season',
+    'League': 'League',
+    'Code': 'Code',
+    'HomeTeam': 'Team',
+    'AwayTeam': 'Team',
+}
+
+
+def code_dtype(size):
+    """Smallest code dtype for a dictionary of size names - the one pandas categoricals use"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class CodeBook:
+    """
+    Persistent name <-> integer code dictionary per field (League, Season, Code, Team).
+    Codes never change once assigned: new names are appended (sorted within a batch),
+    so codes saved with a model or a table stay valid as the dataset grows.
+    """
+
+    def __init__(self, names=None):
+        self.names = {field: list(values) for field, values in (names or {}).items()}
+        self._codes = {field: {name: code for code, name in enumerate(values)}
+                       for field, values in self.names.items()}
+
+    def encode(self, field, values):
+        """Codes of values (-1 for missing, code_dtype wide), registering names not seen before"""
+        codes, uniques = pd.factorize(pd.Series(values))
+        uniques = [str(name) for name in np.asarray(uniques, dtype=object)]
+        known = self._codes.setdefault(field, {})
+        names = self.names.setdefault(field, [])
+        for name in sorted(set(uniques) - set(known)):
+            known[name] = len(names)
+            names.append(name)
+        lookup = np.array([known[name] for name in uniques] + [-1], dtype=code_dtype(len(names)))
+        return lookup[codes]  # code -1 (missing) picks the trailing -1
+
+    def decode(self, field):
+        """Names of a field, indexed by code"""
+        return self.names.get(field, [])
+
+    def save(self, path):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.names, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """CodeBook saved at path; an empty one if the file does not exist yet"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as handle:
+            return cls(json.load(handle))
+
+
+class MatchTable:
+    """
+    Fixture dataset as contiguous typed arrays (columns: name -> NumPy array) plus the
+    CodeBook that decodes the coded columns.
+    """
+
+    def __init__(self, columns, codebook):
+        self.columns = columns
+        self.codebook = codebook
+
+    @classmethod
+    def from_frame(cls, raw, codebook=None, date_format='%d/%m/%Y'):
+        """
+        Build from a fixture frame in the scraper schema (text CSV or typed Parquet store),
+        or from an English-schema frame whose goals are already parsed (a feature matrix
+        written by feature_engineering.py, with date_format='ISO8601').
+        """
+        codebook = CodeBook() if codebook is None else codebook
+        raw = raw.rename(columns=COLUMN_NAMES)
+        columns = {}
+        for column in ('Season', 'League', 'Code'):
+            columns[column] = codebook.encode(CODED_COLUMNS[column], raw[column])
+        # Both team columns in one pass, so they get the same code width
+        teams = codebook.encode('Team', pd.concat([raw['HomeTeam'], raw['AwayTeam']], ignore_index=True))
+        columns['HomeTeam'], columns['AwayTeam'] = teams[:len(raw)], teams[len(raw):]
+        week = pd.to_numeric(raw['Week'], errors='coerce')
+        columns['Week'] = week.fillna(-1).to_numpy(np.int16)
+        dates = pd.to_datetime(raw['Date'], format=date_format, errors='coerce')
+        columns['Date'] = dates.to_numpy('datetime64[ns]')
+        for score, (home, away) in (('FT_Score', ('FTHG', 'FTAG')), ('HT_Score', ('HTHG', 'HTAG'))):
+            if home in raw.columns:
+                home_goals, away_goals = pd.to_numeric(raw[home]), pd.to_numeric(raw[away])
+            else:
+                home_goals, away_goals = parse_scores(raw[score])
+            columns[home] = home_goals.to_numpy(np.int8, na_value=-1)
+            columns[away] = away_goals.to_numpy(np.int8, na_value=-1)
+        for column in ODDS_COLUMNS:
+            columns[column] = pd.to_numeric(raw[column], errors='coerce').to_numpy(np.float32)
+        return cls(columns, codebook)
+
+    @classmethod
+    def load(cls, file_path, codebook=None):
+        """Load the fixture store (Parquet directory/file) or a CSV export"""
+        if os.path.isdir(file_path) or file_path.endswith('.parquet'):
+            raw = pd.read_parquet(file_path)
+        else:
+            raw = pd.read_csv(file_path)
+        return cls.from_frame(raw, codebook)
+
+    def __len__(self):
+        return len(self.columns['Date'])
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+    def results(self, home_win, draw, away_win):
+        """FT and HT result codes as int8 arrays (-1 when the score is missing)"""
+        results = []
+        for home, away in (('FTHG', 'FTAG'), ('HTHG', 'HTAG')):
+            home_goals, away_goals = self.columns[home], self.columns[away]
+            codes = np.select([home_goals > away_goals, home_goals == away_goals], [home_win, draw], away_win)
+            codes[(home_goals < 0) | (away_goals < 0)] = -1
+            results.append(codes.astype(np.int8))
+        return results
+
+    def to_frame(self, result_codes=None):
+        """
+        The table as a pandas frame in the feature schema, sharing the arrays (no copies):
+        coded columns become categoricals over the CodeBook names, goals and Week
+        nullable Int8/Int16. With result_codes (home win, draw, away win) FT_Result and
+        HT_Result are added.
+        """
+        frame = {}
+        for column in ('Season', 'League', 'Week', 'Date', 'Code', 'HomeTeam', 'AwayTeam'):
+            values = self.columns[column]
+            if column in CODED_COLUMNS:
+                names = self.codebook.decode(CODED_COLUMNS[column])
+                frame[column] = pd.Categorical.from_codes(values, categories=names, validate=False)
+            elif column == 'Week':
+                frame[column] = pd.arrays.IntegerArray(values, values < 0)
+            else:
+                frame[column] = values
+        for column in ODDS_COLUMNS:
+            frame[column] = self.columns[column]
+        for column in GOAL_COLUMNS:
+            frame[column] = pd.arrays.IntegerArray(self.columns[column], self.columns[column] < 0)
+        if result_codes is not None:
+            for column, codes in zip(('FT_Result', 'HT_Result'), self.results(*result_codes)):
+                frame[column] = pd.arrays.IntegerArray(codes, codes < 0)
+        return pd.DataFrame(frame, copy=False)
@@ -0,0 +1,38 @@
+"""
+Vectorized parsing of score strings ('2 - 1', '2-1', '-' for not played).
+
+parse_scores extracts both sides of a whole column with one str.extract over the
+distinct score strings and returns nullable Int64 goals; match_results derives the 1X2 result with np.select.
+Each caller passes its own result encoding (the data-prep and ML copies differ).
+"""
+import numpy as np
+import pandas as pd
+
+SCORE_PATTERN = r"^\s*(\d+)\s*-\s*(\d+)\s*(?:-.*)?$"
+
+
+def parse_scores(scores):
+    """
+    Split a score column into (home, away) nullable Int64 Series.
+    Unplayed ('-'), empty and malformed scores become <NA>.
+    """
+    scores = pd.Series(scores)
+    # A season has only a few dozen distinct scores: parse those once and scatter back
+    codes, uniques = pd.factorize(scores)
+    goals = pd.Series(uniques, dtype=object).astype("string").str.extract(SCORE_PATTERN)
+    sides = []
+    for column in (0, 1):
+        values = pd.to_numeric(goals[column], errors="coerce").astype("Int64").array
+        values = values.take(codes, allow_fill=True)
+        sides.append(pd.Series(values, index=scores.index))
+    return sides[0], sides[1]
+
+
+def match_results(home_goals, away_goals, home_win, draw, away_win):
+    """Result code per match (home_win / draw / away_win) as Int64; <NA> when a score is missing."""
+    home = pd.Series(home_goals).astype("Float64")
+    away = pd.Series(away_goals).astype("Float64")
+    missing = (home.isna() | away.isna()).to_numpy()
+    diff = (home - away).fillna(0).to_numpy(float)
+    codes = np.select([diff > 0, diff == 0], [home_win, draw], default=away_win)
+    return pd.Series(codes, index=home.index).astype("Int64").mask(missing)
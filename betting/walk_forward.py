@@ -0,0 +1,68 @@
+"""
+Expanding-window walk-forward splits for time-ordered match data.
+
+Matches are grouped into periods (seasons, or calendar periods of the match date);
+fold k trains on every period before T_k and tests on the periods from T_k on, so a
+model is never evaluated on matches older than its training data. The plan is built
+once and reused by every model; it also works as an sklearn cv splitter.
+
+    plan = WalkForwardPlan(df, period='Season')
+    for fold, (train, test) in enumerate(plan):
+        ...
+    cross_val_score(model, X, y, cv=plan)
+"""
+import numpy as np
+import pandas as pd
+
+
+class WalkForwardPlan:
+    """
+    Fold plan over the rows of df (positional indices).
+
+    period: 'Season' (the Season column, in label order) or a pandas period
+    frequency applied to Date ('W' for calendar weeks, 'M' for months).
+    min_train_periods: periods in the first fold's training window.
+    test_periods: periods per test block; the window then grows by that many.
+    Rows without a period (no season / no date) are left out of every fold.
+    """
+
+    def __init__(self, df, period='Season', min_train_periods=1, test_periods=1):
+        if period == 'Season':
+            labels = df['Season'].astype('string')
+        else:
+            labels = pd.to_datetime(df['Date']).dt.to_period(period)
+        self.period = period
+        self.codes, self.periods = pd.factorize(labels, sort=True)
+        self.folds = []
+        for start in range(min_train_periods, len(self.periods), test_periods):
+            train = np.flatnonzero((self.codes >= 0) & (self.codes < start))
+            test = np.flatnonzero((self.codes >= start) & (self.codes < start + test_periods))
+            self.folds.append((train, test))
+        if not self.folds:
+            raise ValueError(
+                f"Walk-forward needs more than {min_train_periods} {period} periods, found {len(self.periods)}"
+            )
+
+    def __len__(self):
+        return len(self.folds)
+
+    def __iter__(self):
+        return iter(self.folds)
+
+    def test_label(self, fold):
+        """Label of the first period a fold tests on"""
+        return str(self.periods[self.codes[self.folds[fold][1][0]]])
+
+    def split(self, X=None, y=None, groups=None):
+        """sklearn splitter interface"""
+        return iter(self.folds)
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return len(self.folds)
+
+    def describe(self):
+        """One line per fold: tested period, train and test sizes"""
+        return [
+            f"{self.test_label(fold)}: train {len(train)}, test {len(test)}"
+            for fold, (train, test) in enumerate(self.folds)
+        ]
@@ -0,0 +1,48 @@
+"""
+Shared fixtures: seeded random fixture frames in the parsed column schema.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Repository root, for the shared betting package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')))
+
+# FT_Result encoding of the reference loop implementations: 1=Home Win, 0=Draw, 2=Away Win
+HOME_WIN, DRAW, AWAY_WIN = 1, 0, 2
+
+
+def random_fixtures(seed, matches=400, leagues=3, teams=8):
+    """
+    Random matches over a few leagues with the awkward cases of the real data:
+    several matches of a team on one date, repeated fixtures, missing scores and
+    missing dates. Goals are floats and FT_Result is NaN for unplayed matches,
+    as the original loader produced them.
+    """
+    rng = np.random.default_rng(seed)
+    league = rng.integers(0, leagues, matches)
+    home = rng.integers(0, teams, matches)
+    away = (home + rng.integers(1, teams, matches)) % teams
+    dates = pd.Timestamp('2024-08-01') + pd.to_timedelta(rng.integers(0, 60, matches), unit='D')
+    df = pd.DataFrame({
+        'League': [f'League {code}' for code in league],
+        'Date': dates,
+        'HomeTeam': [f'Team {code}' for code in home],
+        'AwayTeam': [f'Team {code}' for code in away],
+        'FTHG': rng.integers(0, 5, matches).astype(float),
+        'FTAG': rng.integers(0, 4, matches).astype(float),
+    })
+    df.loc[rng.random(matches) < 0.05, ['FTHG', 'FTAG']] = np.nan
+    df.loc[rng.random(matches) < 0.02, 'Date'] = pd.NaT
+    df = pd.concat([df, df.sample(10, random_state=seed)], ignore_index=True)
+    result = np.select([df['FTHG'] > df['FTAG'], df['FTHG'] == df['FTAG']], [HOME_WIN, DRAW], AWAY_WIN)
+    df['FT_Result'] = np.where(df['FTHG'].isna(), np.nan, result)
+    return df
+
+
+@pytest.fixture(params=[0, 1, 2])
+def fixtures(request):
+    return random_fixtures(request.param)
@@ -0,0 +1,92 @@
+"""
+The vectorized team form features against the original per-team loop, kept here as
+the reference implementation.
+"""
+import numpy as np
+import pandas as pd
+
+from betting.features import generate_form_difference_features, generate_team_form_features
+from conftest import AWAY_WIN, DRAW, HOME_WIN
+
+FORM_COLUMNS = [
+    'Home_Avg_Goals_Scored_Last5', 'Home_Avg_Goals_Conceded_Last5',
+    'Home_Form_Points_Last5', 'Home_Win_Ratio_Last5',
+    'Away_Avg_Goals_Scored_Last5', 'Away_Avg_Goals_Conceded_Last5',
+    'Away_Form_Points_Last5', 'Away_Win_Ratio_Last5',
+    'Home_Form_Consistency_Last5', 'Home_Weighted_Form_Points_Last5',
+    'Home_Clean_Sheet_Ratio_Last5',
+    'Away_Form_Consistency_Last5', 'Away_Weighted_Form_Points_Last5',
+    'Away_Clean_Sheet_Ratio_Last5'
+]
+
+
+def reference_team_form_features(df, n_matches=5):
+    """The original loop: re-filters the frame for every team and match"""
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    
+    for col in FORM_COLUMNS:
+        df[col] = np.nan
+    
+    teams = pd.concat([df['HomeTeam'], df['AwayTeam']]).unique()
+    
+    for team in teams:
+        for side, matches in (('Home', df[df['HomeTeam'] == team]), ('Away', df[df['AwayTeam'] == team])):
+            for idx in matches.index:
+                # Get previous N matches for this team (both home and away)
+                prev_home = df[(df['HomeTeam'] == team) & (df.index < idx) & (df['League'] == df.loc[idx, 'League'])].tail(n_matches)
+                prev_away = df[(df['AwayTeam'] == team) & (df.index < idx) & (df['League'] == df.loc[idx, 'League'])].tail(n_matches)
+                
+                # Combine and get last N matches
+                all_prev = pd.concat([
+                    prev_home[['Date', 'FTHG', 'FTAG', 'FT_Result']].assign(Location='Home'),
+                    prev_away[['Date', 'FTHG', 'FTAG', 'FT_Result']].assign(Location='Away')
+                ]).sort_values('Date').tail(n_matches)
+                
+                if len(all_prev) > 0:
+                    goals_scored = []
+                    goals_conceded = []
+                    points = []
+                    wins = []
+                    
+                    for _, match in all_prev.iterrows():
+                        if match['Location'] == 'Home':
+                            goals_scored.append(match['FTHG'])
+                            goals_conceded.append(match['FTAG'])
+                            won = match['FT_Result'] == HOME_WIN
+                        else:
+                            goals_scored.append(match['FTAG'])
+                            goals_conceded.append(match['FTHG'])
+                            won = match['FT_Result'] == AWAY_WIN
+                        if won:
+                            points.append(3)
+                            wins.append(1)
+                        elif match['FT_Result'] == DRAW:
+                            points.append(1)
+                            wins.append(0)
+                        else:  # Loss
+                            points.append(0)
+                            wins.append(0)
+                    
+                    df.loc[idx, f'{side}_Avg_Goals_Scored_Last5'] = np.mean(goals_scored)
+                    df.loc[idx, f'{side}_Avg_Goals_Conceded_Last5'] = np.mean(goals_conceded)
+                    df.loc[idx, f'{side}_Form_Points_Last5'] = np.sum(points)
+                    df.loc[idx, f'{side}_Win_Ratio_Last5'] = np.mean(wins)
+                    df.loc[idx, f'{side}_Form_Consistency_Last5'] = np.std(points) if len(points) > 1 else 0
+                    weights = np.arange(1, len(points) + 1)
+                    df.loc[idx, f'{side}_Weighted_Form_Points_Last5'] = np.average(points, weights=weights)
+                    clean_sheets = sum(1 for g in goals_conceded if g == 0)
+                    df.loc[idx, f'{side}_Clean_Sheet_Ratio_Last5'] = clean_sheets / len(goals_conceded)
+    
+    # Form differences
+    df['Goal_Diff_Form'] = (df['Home_Avg_Goals_Scored_Last5'] - df['Home_Avg_Goals_Conceded_Last5']) - \
+                           (df['Away_Avg_Goals_Scored_Last5'] - df['Away_Avg_Goals_Conceded_Last5'])
+    df['Points_Diff_Form'] = df['Home_Form_Points_Last5'] - df['Away_Form_Points_Last5']
+    
+    return df
+
+
+def test_team_form_matches_reference_loop(fixtures):
+    expected = reference_team_form_features(fixtures.copy())
+    actual = generate_form_difference_features(generate_team_form_features(fixtures.copy()))
+    columns = FORM_COLUMNS + ['Goal_Diff_Form', 'Points_Diff_Form']
+    pd.testing.assert_frame_equal(actual[columns], expected[columns], check_exact=True)
@@ -0,0 +1,61 @@
+"""
+The pair-indexed head-to-head features against the original full-table scan, kept
+here as the reference implementation.
+"""
+import numpy as np
+import pandas as pd
+
+from betting.features import generate_h2h_features
+from conftest import AWAY_WIN, HOME_WIN
+
+
+def reference_h2h_features(df, n_matches=5):
+    """The original scan: a four-way mask over the whole frame for every match"""
+    df = df.sort_values(['League', 'Date']).reset_index(drop=True)
+    
+    df['H2H_Avg_Goal_Diff'] = np.nan
+    df['H2H_Recent_Win_Ratio'] = np.nan
+    
+    for idx in df.index:
+        home_team = df.loc[idx, 'HomeTeam']
+        away_team = df.loc[idx, 'AwayTeam']
+        league = df.loc[idx, 'League']
+        current_date = df.loc[idx, 'Date']
+        
+        # Get previous H2H matches in same league
+        h2h_matches = df[
+            (df['League'] == league) &
+            (df['Date'] < current_date) &
+            (
+                ((df['HomeTeam'] == home_team) & (df['AwayTeam'] == away_team)) |
+                ((df['HomeTeam'] == away_team) & (df['AwayTeam'] == home_team))
+            )
+        ].tail(n_matches)
+        
+        if len(h2h_matches) > 0:
+            goal_diffs = []
+            home_wins = []
+            
+            for _, match in h2h_matches.iterrows():
+                if match['HomeTeam'] == home_team:
+                    # Current home team was home in this H2H match
+                    goal_diff = match['FTHG'] - match['FTAG']
+                    home_wins.append(1 if match['FT_Result'] == HOME_WIN else 0)
+                else:
+                    # Current home team was away in this H2H match
+                    goal_diff = match['FTAG'] - match['FTHG']
+                    home_wins.append(1 if match['FT_Result'] == AWAY_WIN else 0)
+                
+                goal_diffs.append(goal_diff)
+            
+            df.loc[idx, 'H2H_Avg_Goal_Diff'] = np.mean(goal_diffs)
+            df.loc[idx, 'H2H_Recent_Win_Ratio'] = np.mean(home_wins)
+    
+    return df
+
+
+def test_h2h_matches_reference_scan(fixtures):
+    expected = reference_h2h_features(fixtures.copy())
+    actual = generate_h2h_features(fixtures.copy())
+    columns = ['H2H_Avg_Goal_Diff', 'H2H_Recent_Win_Ratio']
+    pd.testing.assert_frame_equal(actual[columns], expected[columns], check_exact=True)